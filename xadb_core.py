@@ -0,0 +1,2785 @@
+"""
+Tk-free core of Xtreme ADB: configuration, the action log, the task
+scheduler and the adb/fastboot backend. xadb_gui.py builds the GUI on top
+of this module; `python xadb.py --headless ...` (section 6) drives it
+directly. Nothing here may import tkinter, customtkinter or PIL.
+"""
+import time
+import subprocess
+import threading
+import os
+import re
+import json
+import datetime
+import sys
+import queue
+import shlex
+import posixpath
+import gzip
+import mmap
+import bisect
+import hashlib
+import heapq
+import itertools
+import codecs
+import shutil
+import signal
+import atexit
+import argparse
+import contextlib
+import concurrent.futures
+import csv
+import math
+from pathlib import Path
+from collections import deque
+from array import array
+
+# ==========================================
+# 1. CORE CONFIGURATION
+# ==========================================
+APP_NAME = "Xtreme ADB V2.2"
+LOG_FILE = None
+CURRENT_VERSION = "2.2"
+UPDATE_URL = "https://raw.githubusercontent.com/KPR-MAN/XtremeADB/main/version.json"
+
+DEFAULT_CONFIG = {
+    "theme": "Dark",
+    "last_ip": "",
+    "auto_refresh": True,
+    "refresh_interval": 3,
+    "check_updates": True,
+    "scrcpy_args": "--max-size 1024 --video-bit-rate 8M",
+    "use_su": False,
+    "app_sort": "a_z",
+    "file_sort": "a_z",
+    "suppress_multi_device_warn": False,
+    "device_poll_interval": 2,
+    "logcat_record": False,
+    "logcat_record_max_mb": 16,
+    "logcat_record_max_minutes": 30,
+    "logcat_record_keep": 100,
+    "logcat_record_compress": True,
+    "crash_watch": True,
+    "telemetry": False,
+    "telemetry_history": 720,
+    "profiler_interval": 2,
+    "process_interval": 2
+}
+
+if os.name == 'nt':
+    CONFIG_FILE = Path(os.getenv('APPDATA')) / "XtremeADB" / "xtreme_config.json"
+elif sys.platform == 'darwin':
+    CONFIG_FILE = Path.home() / "Library" / "Application Support" / "XtremeADB" / "xtreme_config.json"
+else:
+    CONFIG_FILE = Path.home() / ".config" / "XtremeADB" / "xtreme_config.json"
+
+CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+LOG_FILE = CONFIG_FILE.parent / "xtreme_actions.jsonl"
+LOGCAT_DIR = CONFIG_FILE.parent / "logcat"
+
+class ConfigStore(dict):
+    """
+    The one in-memory copy of the settings. Reads are plain dict lookups;
+    set() updates memory, notifies subscribers and marks the store dirty. A
+    background writer persists it once changes have been quiet for DEBOUNCE
+    seconds (temp file + rename, so a crash never leaves half a JSON file),
+    so dragging a slider costs one disk write instead of one per step.
+    """
+    DEBOUNCE = 0.5
+
+    def __init__(self, path, defaults):
+        super().__init__(json.loads(json.dumps(defaults)))
+        self.path = Path(path)
+        self._listeners = []  # (key or None, callback)
+        self._cond = threading.Condition()
+        self._dirty_at = None
+        self._writer = None
+        self._readonly = False  # an unreadable file we could not move aside is never overwritten
+        try:
+            with open(self.path, "r") as f:
+                self.update(json.load(f))
+        except FileNotFoundError:
+            self._write()
+        except (OSError, ValueError, TypeError) as e:
+            # Keep the user's file for inspection instead of silently replacing it with defaults
+            bad = self.path.with_name(self.path.name + ".bad")
+            try:
+                os.replace(self.path, bad)
+                msg = f"Unreadable config ({e}); moved to {bad.name}, using defaults"
+                self._write()
+            except OSError:
+                self._readonly = True
+                msg = f"Unreadable config ({e}); using defaults and leaving the file untouched"
+            print(f"[config] {msg}", file=sys.stderr)
+            log_action(msg, op="config", result="error")
+
+    def set(self, key, value):
+        with self._cond:
+            if key in self and self[key] == value:
+                return
+            self[key] = value
+            self._dirty_at = time.time()
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+            self._cond.notify()
+        for k, cb in list(self._listeners):
+            if k is None or k == key:
+                try:
+                    cb(key, value)
+                except Exception:
+                    pass
+
+    def subscribe(self, callback, key=None):
+        """Call callback(key, value) on every change (of `key` only, if given)."""
+        self._listeners.append((key, callback))
+
+    def flush(self):
+        """Write pending changes now (on exit)."""
+        with self._cond:
+            if self._dirty_at is None:
+                return
+            self._dirty_at = None
+            data = json.dumps(dict(self), indent=2)
+        self._write(data)
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while self._dirty_at is None:
+                    self._cond.wait()
+                quiet = self._dirty_at + self.DEBOUNCE - time.time()
+                if quiet > 0:
+                    self._cond.wait(quiet)
+                    continue
+                self._dirty_at = None
+                data = json.dumps(dict(self), indent=2)  # snapshot under the lock
+            self._write(data)
+
+    def _write(self, data=None):
+        if self._readonly:
+            return
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            if data is None:
+                data = json.dumps(dict(self), indent=2)
+            with open(tmp, "w") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+
+def load_config():
+    """The live config store (kept for older callers; there is nothing to re-read)."""
+    return CONF
+
+def save_config(key, value):
+    CONF.set(key, value)
+
+class ActionLog:
+    """
+    Structured operations log: one JSON object per line with ts, serial, op,
+    result and duration. Callers only enqueue; a background writer appends
+    whole batches, and once the file passes MAX_BYTES it is gzipped to
+    `<name>.1.gz` (older ones shift up, KEEP are kept). read() walks the
+    rotated files and the live one, oldest first.
+    """
+    MAX_BYTES = 2 * 1024 * 1024
+    KEEP = 5
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._queue = queue.Queue()
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def write(self, op, serial=None, result="ok", duration=None, **extra):
+        rec = {"ts": round(time.time(), 3), "serial": serial, "op": op, "result": result}
+        if duration is not None:
+            rec["duration"] = round(duration, 3)
+        rec.update(extra)
+        self._queue.put(rec)
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, daemon=True)
+                    self._writer.start()
+
+    @contextlib.contextmanager
+    def timed(self, op, serial=None, **extra):
+        """Log `op` with its duration when the block exits; set rec["result"] to override "ok"."""
+        rec = dict(extra, result="ok")
+        t0 = time.time()
+        try:
+            yield rec
+        except Exception as e:
+            rec.update(result="error", error=str(e))
+            raise
+        finally:
+            self.write(op, serial, duration=time.time() - t0, **rec)
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(r, default=str) + "\n" for r in batch)
+                    size = f.tell()
+                if size > self.MAX_BYTES:
+                    self._rotate()
+            except Exception:
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _rotated(self, n):
+        return self.path.with_name(f"{self.path.name}.{n}.gz")
+
+    def _rotate(self):
+        self._rotated(self.KEEP).unlink(missing_ok=True)
+        for n in range(self.KEEP - 1, 0, -1):
+            if self._rotated(n).exists():
+                os.replace(self._rotated(n), self._rotated(n + 1))
+        tmp = self.path.with_name(self.path.name + ".rotating")
+        os.replace(self.path, tmp)
+        with open(tmp, "rb") as src, gzip.open(self._rotated(1), "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        tmp.unlink()
+
+    def read(self, serial=None, op=None, since=None, until=None, limit=None):
+        """Records matching every given filter, oldest first (the newest `limit` if set)."""
+        self.flush()
+        files = [self._rotated(n) for n in range(self.KEEP, 0, -1)] + [self.path]
+        out = deque(maxlen=limit) if limit else []
+        for path in files:
+            if not path.exists():
+                continue
+            opener = gzip.open if path.suffix == ".gz" else open
+            try:
+                with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        try:
+                            rec = json.loads(line)
+                        except ValueError:
+                            continue
+                        if serial is not None and rec.get("serial") != serial:
+                            continue
+                        if op is not None and rec.get("op") != op:
+                            continue
+                        ts = rec.get("ts", 0)
+                        if (since is not None and ts < since) or (until is not None and ts > until):
+                            continue
+                        out.append(rec)
+            except OSError:
+                continue
+        return list(out)
+
+
+ACTION_LOG = ActionLog(LOG_FILE)
+atexit.register(ACTION_LOG.flush)
+
+
+def log_action(message=None, op="note", serial=None, result="ok", **extra):
+    """Queue one entry in the action log; never touches the disk on the caller's thread."""
+    if message is not None:
+        extra["message"] = message
+    ACTION_LOG.write(op, serial, result, **extra)
+
+class StartupTimeline:
+    """Per-phase startup timings, printed to stderr with --profile-startup; a no-op otherwise."""
+
+    def __init__(self, t0, enabled):
+        self.enabled = enabled
+        self._t0 = self._last = t0
+        self.phases = []
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last, now - self._t0))
+        self._last = now
+
+    def report(self, out=None):
+        if not self.enabled:
+            return
+        out = out or sys.stderr
+        print(f"{'Startup phase':<36}{'ms':>9}{'total':>10}", file=out)
+        for phase, dt, total in self.phases:
+            print(f"{phase:<36}{dt * 1000:9.1f}{total * 1000:10.1f}", file=out)
+        out.flush()
+
+CONF = ConfigStore(CONFIG_FILE, DEFAULT_CONFIG)
+atexit.register(CONF.flush)
+
+# --- UPDATE CHECKER FUNCTION ---
+def check_for_updates():
+    """Check for updates (standalone function)"""
+    try:
+        # Imported here: requests alone costs ~100 ms of startup for this one GET
+        import requests
+        from packaging import version
+        response = requests.get(UPDATE_URL, timeout=5)
+        data = response.json()
+        latest_version = data["version"]
+        download_url = data["download_url"]
+
+        if version.parse(latest_version) > version.parse(CURRENT_VERSION):
+            return True, latest_version, download_url
+        return False, None, None
+    except:
+        return False, None, None
+
+# ==========================================
+# 2. TOOL PATHS
+# ==========================================
+ADB_PATH = CONF.get("adb_path") or "adb"
+FASTBOOT_PATH = "fastboot"
+SCRCPY_PATH = "scrcpy"
+
+
+# ==========================================
+# 3c. TASK SCHEDULER
+# ==========================================
+class TaskFuture(concurrent.futures.Future):
+    """Future for one scheduled task. `stop` is set on cancel() or timeout so a running task can bail out."""
+
+    def __init__(self, fn, args, kwargs, name, priority, lane, timeout, dedicated=False):
+        super().__init__()
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.name = name
+        self.priority = priority
+        self.lane = lane
+        self.timeout = timeout
+        self.dedicated = dedicated
+        self.stop = threading.Event()
+
+    def cancel(self):
+        self.stop.set()
+        return super().cancel()
+
+    def _finish(self, result=None, exc=None):
+        try:
+            if exc is None:
+                self.set_result(result)
+            else:
+                self.set_exception(exc)
+        except concurrent.futures.InvalidStateError:
+            pass  # already timed out
+
+    def _expire(self):
+        if not self.done():
+            self.stop.set()
+            self._finish(exc=TimeoutError(f"{self.name} timed out after {self.timeout}s"))
+
+
+class TaskScheduler:
+    """
+    Bounded worker pool for the work the app does off the Tk thread. Tasks
+    carry a priority (interactive actions are picked before background
+    polling) and an optional lane: tasks sharing a lane, normally a device
+    serial, run one at a time, so thirty "Force Stop"s queue up against the
+    device instead of hitting it at once. submit() returns a TaskFuture that
+    can be awaited, cancelled or given a timeout; every() re-runs a task on
+    an interval. Stream readers that block for their whole life run through
+    service() on their own named thread rather than holding a pool worker,
+    and are listed by snapshot() along with the running and queued tasks.
+    Tasks with no bound on their run time (interactive shell commands,
+    transfers) are submitted as dedicated: they keep their lane and future
+    but get a thread of their own, so they can never starve the pool.
+    """
+    INTERACTIVE, NORMAL, BACKGROUND = 0, 1, 2
+
+    def __init__(self, workers=8):
+        self.workers = workers
+        self._cond = threading.Condition()
+        self._ready = []          # heap of (priority, seq, task) free to run
+        self._lanes = {}          # lane -> heap of tasks waiting for it
+        self._busy_lanes = set()  # lanes with a task queued in _ready or running
+        self._running = {}        # task -> start time
+        self._services = {}       # thread -> (name, start time)
+        self._timer_cond = threading.Condition()
+        self._timers = []         # heap of (due, seq, callable)
+        self._seq = itertools.count()
+        self._local = threading.local()
+        self._started = False
+
+    def _ensure_started(self):
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f"xadb-worker-{i}", daemon=True).start()
+        threading.Thread(target=self._timer_loop, name="xadb-timers", daemon=True).start()
+
+    # ── Public API ─────────────────────────────────────────────────────────
+    def submit(self, fn, *args, priority=NORMAL, lane=None, timeout=None, delay=0, name=None,
+               dedicated=False, **kwargs):
+        """Queue fn(*args, **kwargs); returns its TaskFuture."""
+        self._ensure_started()
+        task = TaskFuture(fn, args, kwargs, name or getattr(fn, "__name__", "task"),
+                          priority, lane, timeout, dedicated)
+        if delay > 0:
+            self._at(time.monotonic() + delay, lambda: self._enqueue(task))
+        else:
+            self._enqueue(task)
+        return task
+
+    def every(self, interval, fn, priority=BACKGROUND, lane=None, name=None):
+        """
+        Run fn now and again `interval` seconds (a number, or a callable
+        returning one) after each run ends. set() the returned Event to stop.
+        """
+        stopped = threading.Event()
+
+        def _run():
+            if stopped.is_set():  # stopped while this run waited out its delay
+                return
+            try:
+                fn()
+            finally:
+                if not stopped.is_set():
+                    wait = interval() if callable(interval) else interval
+                    self.submit(_run, priority=priority, lane=lane, delay=wait, name=name)
+
+        self.submit(_run, priority=priority, lane=lane, name=name or getattr(fn, "__name__", "task"))
+        return stopped
+
+    def service(self, target, *args, name=None):
+        """Start a long-lived blocking loop (e.g. a stream reader) on its own tracked thread."""
+        name = name or getattr(target, "__name__", "service")
+
+        def _run():
+            try:
+                target(*args)
+            finally:
+                with self._cond:
+                    self._services.pop(threading.current_thread(), None)
+
+        t = threading.Thread(target=_run, name=name, daemon=True)
+        with self._cond:
+            self._services[t] = (name, time.monotonic())
+        t.start()
+        return t
+
+    def current(self):
+        """The TaskFuture running on this thread (None outside the pool)."""
+        return getattr(self._local, "task", None)
+
+    def snapshot(self):
+        """What is running, queued and serving right now."""
+        now = time.monotonic()
+        with self._cond:
+            return {
+                "running": [(t.name, t.lane, now - t0) for t, t0 in self._running.items()],
+                "queued": len(self._ready) + sum(len(q) for q in self._lanes.values()),
+                "lanes": {lane: len(q) for lane, q in self._lanes.items() if q},
+                "services": [(n, now - t0) for n, t0 in self._services.values()],
+            }
+
+    # ── Internals ──────────────────────────────────────────────────────────
+    def _enqueue(self, task):
+        with self._cond:
+            if task.done():
+                return  # cancelled while it waited on a delay
+            entry = (task.priority, next(self._seq), task)
+            if task.lane is not None and task.lane in self._busy_lanes:
+                heapq.heappush(self._lanes.setdefault(task.lane, []), entry)
+                return
+            if task.lane is not None:
+                self._busy_lanes.add(task.lane)
+            self._make_ready(entry)
+
+    def _make_ready(self, entry):
+        """Hand a task whose lane is free to the pool, or to its own thread if dedicated. Holds _cond."""
+        task = entry[2]
+        if task.dedicated:
+            threading.Thread(target=self._execute, args=(task,), name=task.name, daemon=True).start()
+        else:
+            heapq.heappush(self._ready, entry)
+            self._cond.notify()
+
+    def _release(self, lane):
+        if lane is None:
+            return
+        with self._cond:
+            waiting = self._lanes.get(lane)
+            if waiting:
+                self._make_ready(heapq.heappop(waiting))
+            else:
+                self._lanes.pop(lane, None)
+                self._busy_lanes.discard(lane)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._ready:
+                    self._cond.wait()
+                _, _, task = heapq.heappop(self._ready)
+            self._execute(task)
+
+    def _execute(self, task):
+        if task.set_running_or_notify_cancel():
+            with self._cond:
+                self._running[task] = time.monotonic()
+            if task.timeout:
+                self._at(time.monotonic() + task.timeout, task._expire)
+            self._local.task = task
+            try:
+                task._finish(task.fn(*task.args, **task.kwargs))
+            except BaseException as e:
+                task._finish(exc=e)
+            finally:
+                self._local.task = None
+                with self._cond:
+                    self._running.pop(task, None)
+        self._release(task.lane)
+
+    def _at(self, due, fn):
+        with self._timer_cond:
+            heapq.heappush(self._timers, (due, next(self._seq), fn))
+            self._timer_cond.notify()
+
+    def _timer_loop(self):
+        while True:
+            with self._timer_cond:
+                while not self._timers:
+                    self._timer_cond.wait()
+                due = self._timers[0][0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._timer_cond.wait(wait)
+                    continue
+                _, _, fn = heapq.heappop(self._timers)
+            try:
+                fn()
+            except Exception:
+                pass
+
+
+SCHEDULER = TaskScheduler()
+
+# ==========================================
+# 4. BACKEND ENGINE
+# ==========================================
+class Backend:
+    _pid_caches = {}  # serial -> PidNameCache, shared by every view
+    _shell_sessions = {}  # (serial, root) -> ShellSession
+    _path_indexes = {}  # (serial, root) -> RemotePathIndex
+
+    @staticmethod
+    def _no_window_kwargs():
+        """Return kwargs that suppress terminal windows on all platforms."""
+        kwargs = {}
+        if os.name == "nt":
+            si = subprocess.STARTUPINFO()
+            si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            kwargs["startupinfo"] = si
+        else:
+            # On Linux/macOS with Nuitka: ensure no inherited terminal FDs
+            kwargs["close_fds"] = True
+        return kwargs
+
+    @staticmethod
+    def run(cmd, timeout=10):
+        if isinstance(cmd, str):
+            cmd = cmd.split()
+        try:
+            res = subprocess.run(
+                cmd, capture_output=True, text=True, encoding="utf-8", errors="replace",
+                timeout=timeout, **Backend._no_window_kwargs()
+            )
+            return res.stdout.strip() + res.stderr.strip()
+        except Exception as e:
+            return f"[ERROR] {str(e)}"
+
+    @staticmethod
+    def _tree_kwargs():
+        """Start the child as the leader of its own process group so kill_tree() can reach its children."""
+        if os.name == "nt":
+            return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        return {"start_new_session": True}
+
+    @staticmethod
+    def kill_tree(process, grace=2.0):
+        """Terminate a process started with _tree_kwargs() and everything it spawned."""
+        if process.poll() is not None:
+            return
+        try:
+            if os.name == "nt":
+                subprocess.run(["taskkill", "/T", "/F", "/PID", str(process.pid)],
+                               capture_output=True, **Backend._no_window_kwargs())
+            else:
+                os.killpg(process.pid, signal.SIGTERM)
+                try:
+                    process.wait(grace)
+                except subprocess.TimeoutExpired:
+                    os.killpg(process.pid, signal.SIGKILL)
+        except (OSError, subprocess.SubprocessError):
+            process.kill()
+
+    @staticmethod
+    def run_live(cmd, callback, cancel=None):
+        """
+        Run command and stream output to callback function. If `cancel` (an
+        Event, normally the running TaskFuture's stop) gets set, the command
+        and its children are killed. Returns the exit code, or None when it
+        was cancelled or could not be started.
+        """
+        if isinstance(cmd, str):
+            cmd = cmd.split()
+        kwargs = Backend._no_window_kwargs()
+        if cancel is not None:
+            kwargs.update(Backend._tree_kwargs())
+        try:
+            process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                text=True, encoding="utf-8", errors="replace",
+                **kwargs
+            )
+        except Exception as e:
+            callback(f"[ERROR] {str(e)}")
+            return None
+
+        if cancel is not None:
+            def _watch():
+                while not cancel.wait(0.2):
+                    if process.poll() is not None:
+                        return
+                Backend.kill_tree(process)
+            SCHEDULER.service(_watch, name=f"cancel {os.path.basename(cmd[0])}")
+
+        try:
+            for line in iter(process.stdout.readline, ''):
+                if line:
+                    callback(line.strip())
+        except Exception as e:
+            callback(f"[ERROR] {str(e)}")
+        finally:
+            process.stdout.close()
+            process.wait()
+        if cancel is not None and cancel.is_set():
+            return None
+        return process.returncode
+
+    def get_devices(self):
+        devices = []
+        problem_serials = set()
+        try:
+            out = self.run([ADB_PATH, "devices"], timeout=5)
+            for line in out.split("\n"):
+                line = line.strip()
+                if "\t" not in line:
+                    continue
+                serial, status = line.split("\t", 1)
+                status = status.strip()
+                if status == "device":
+                    devices.append(f"{serial} (ADB)")
+                elif status == "recovery":
+                    devices.append(f"{serial} (RECOVERY)")
+                elif status in ("unauthorized", "offline", "no permissions"):
+                    problem_serials.add(serial)
+            out_fb = self.run([FASTBOOT_PATH, "devices"], timeout=5)
+            for line in out_fb.split("\n"):
+                line = line.strip()
+                if "\t" in line:
+                    serial = line.split("\t")[0].strip()
+                    if serial:
+                        devices.append(f"{serial} (FASTBOOT)")
+        except:
+            pass
+        if problem_serials:
+            self._problem_serials = problem_serials
+        return devices
+
+    STATS_SEP = "@@XADB@@"
+    STATS_PROBE = (f"dumpsys battery; echo {STATS_SEP}; cat /proc/meminfo; echo {STATS_SEP}; "
+                   f"head -n 1 /proc/stat; echo {STATS_SEP}; cat /proc/net/dev")
+
+    def get_stats(self, device_id):
+        """
+        One batched `adb shell` round trip for the dashboard and telemetry:
+        battery level and temperature, RAM use, and the raw CPU jiffy and
+        network byte counters (TelemetryStore turns those into rates).
+        """
+        if "ADB" not in device_id: return {}
+        clean = device_id.split()[0]
+        out = self.run([ADB_PATH, "-s", clean, "shell", self.STATS_PROBE], timeout=4)
+        if out.startswith("[ERROR]"):
+            return {}
+        batt, mem, cpu, net = (out.split(self.STATS_SEP) + ["", "", "", ""])[:4]
+        stats = {}  # only readings that actually parsed; a failed probe must not read as 0%
+
+        for line in batt.split("\n"):
+            key, _, val = line.strip().partition(":")
+            try:
+                if key == "level":
+                    stats["batt"] = int(val)
+                elif key == "temperature":
+                    stats["temp"] = int(val) / 10  # tenths of a degree C
+            except ValueError:
+                pass
+
+        tot, av = 0, 0
+        for line in mem.split("\n"):
+            if line.startswith("MemTotal"): tot = int(re.search(r"\d+", line).group())
+            if line.startswith("MemAvailable"): av = int(re.search(r"\d+", line).group())
+        if tot > 0:
+            stats["ram"] = ((tot - av) / tot) * 100
+
+        fields = cpu.split()
+        if fields[:1] == ["cpu"]:
+            jiffies = [int(x) for x in fields[1:] if x.isdigit()]
+            if len(jiffies) >= 4:
+                stats["cpu_total"] = sum(jiffies)
+                stats["cpu_idle"] = jiffies[3] + (jiffies[4] if len(jiffies) > 4 else 0)  # idle + iowait
+
+        rx = tx = 0
+        for line in net.split("\n"):
+            iface, sep, counters = line.partition(":")
+            cols = counters.split()
+            if sep and iface.strip() != "lo" and len(cols) >= 9 and cols[0].isdigit():
+                rx += int(cols[0])
+                tx += int(cols[8])
+        if rx or tx:
+            stats["net_rx"], stats["net_tx"] = rx, tx
+
+        if "batt" not in stats and "ram" not in stats:
+            return {}  # adb answered with an error rather than the probe output
+        return stats
+
+    def get_device_info(self, device_id):
+        if "ADB" not in device_id: return "Unknown", "Unknown"
+        clean = device_id.split()[0]
+        model = self.run([ADB_PATH, "-s", clean, "shell", "getprop", "ro.product.model"])
+        android = self.run([ADB_PATH, "-s", clean, "shell", "getprop", "ro.build.version.release"])
+        return model.strip(), android.strip()
+
+    PACKAGE_UIDS_TTL = 300
+    _package_uids = {}  # serial -> (fetched_at, {app id: [packages]})
+
+    def package_uids(self, serial):
+        """App id (uid % 100000) -> packages from `pm list packages -U`, cached for a few minutes."""
+        cached = self._package_uids.get(serial)
+        if cached and time.monotonic() - cached[0] < self.PACKAGE_UIDS_TTL:
+            return cached[1]
+        out = self.run([ADB_PATH, "-s", serial, "shell", "pm", "list", "packages", "-U"], timeout=20)
+        uids = {}
+        for m in re.finditer(r"^package:(\S+)\s+uid:([\d,]+)", out, re.M):
+            for uid in m.group(2).split(","):
+                if uid:
+                    uids.setdefault(int(uid) % 100000, []).append(m.group(1))
+        if uids:
+            self._package_uids[serial] = (time.monotonic(), uids)
+        return uids
+
+    def pid_names(self, serial):
+        """Shared PID -> process name cache for a device."""
+        cache = self._pid_caches.get(serial)
+        if cache is None:
+            cache = self._pid_caches[serial] = PidNameCache(serial)
+            cache.start()
+        return cache
+
+    def shell_session(self, serial, root=False):
+        """Long-lived interactive shell for a device (started lazily, under `su` if root)."""
+        sess = self._shell_sessions.get((serial, root))
+        if sess is None:
+            sess = self._shell_sessions[(serial, root)] = ShellSession(serial, root=root)
+        return sess
+
+    def path_index(self, serial, root=False):
+        """
+        Cached remote paths and $PATH commands for Shell tab completion. The
+        index lists over a session of its own: a slow or timed-out `ls` must
+        not block, or reset the cwd/env/su state of, the user's shell.
+        """
+        idx = self._path_indexes.get((serial, root))
+        if idx is None:
+            idx = self._path_indexes[(serial, root)] = RemotePathIndex(ShellSession(serial, root=root))
+        return idx
+
+    def run_root(self, serial, args, on_output=None, timeout=60, wait=60):
+        """Run an argv list (or a shell string) as root over a pooled `su` shell; returns (output, exit_code)."""
+        return ROOT_POOL.run(serial, args, on_output=on_output, timeout=timeout, wait=wait)
+
+
+class ShellSession:
+    """
+    One persistent `adb shell` per device. Commands are written to its stdin
+    followed by a printf of a unique marker carrying the exit code, $PWD, the
+    effective uid and the shell's pid, so `cd`, variables, functions and `su`
+    persist and each command costs a pipe write instead of a process spawn.
+    Output is streamed to the caller as it arrives, including partial lines.
+    """
+    READ_CHUNK = 64 * 1024
+    OUTPUT_TAIL = 64 * 1024  # chars of output run() keeps when on_output already streams it
+
+    def __init__(self, serial, root=False):
+        self.serial = serial
+        self.root = root
+        self.cwd = "/"
+        self.uid = None
+        self.shell_pid = None  # innermost shell (changes inside `su`)
+        self._proc = None
+        self._current = None
+        self._seq = itertools.count(1)
+        self._token = os.urandom(4).hex()
+        self._run_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+
+    @property
+    def alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def _ensure(self):
+        if self.alive:
+            return
+        kwargs = Backend._no_window_kwargs()
+        # A root session pays the su manager's authorization once, at spawn
+        shell = ["shell", "su"] if self.root else ["shell"]
+        self._proc = subprocess.Popen([ADB_PATH, "-s", self.serial] + shell,
+                                      stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      stderr=subprocess.STDOUT, **kwargs)
+        SCHEDULER.service(self._read_loop, self._proc, name=f"shell {self.serial}")
+
+    def close(self):
+        proc, self._proc = self._proc, None
+        if proc:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+    def run(self, cmd, on_output=None, timeout=None, raw=False):
+        """
+        Run `cmd` in the session and return (output, exit_code). Output lines are
+        also passed to `on_output` as they arrive. With raw=True the command is
+        written as-is (needed for `su`/`exit`, which must read the session's
+        stdin); otherwise stdin is /dev/null and stderr is folded into stdout.
+        exit_code is None if the session died or timed out.
+        """
+        with self._run_lock:
+            fresh = not self.alive
+            try:
+                self._ensure()
+            except Exception as e:
+                return f"[error: {e}]\n", None
+            if fresh and self.cwd != "/":
+                cmd = f"cd {shlex.quote(self.cwd)} 2>/dev/null\n{cmd}"  # respawned shell: go back
+            marker = f"__XADB_{self._token}_{next(self._seq)}__"
+            cur = self._current = {"marker": marker.encode(), "out": deque(), "size": 0, "cb": on_output,
+                                   "done": threading.Event(), "code": None, "proc": self._proc,
+                                   "dec": codecs.getincrementaldecoder("utf-8")(errors="replace")}
+            # eval parses the command on its own, so an unclosed quote is a syntax error
+            # instead of a string that swallows the marker line; `command` keeps that
+            # error from exiting a non-interactive shell
+            body = cmd if raw else f"{{ command eval {shlex.quote(cmd)}\n}} </dev/null 2>&1"
+            frame = (f"{body}\nprintf '%s %s %s %s %s\\n' {marker} \"$?\" \"${{USER_ID:-$(id -u)}}\" \"$$\" \"$PWD\"\n")
+            try:
+                with self._io_lock:
+                    self._proc.stdin.write(frame.encode("utf-8"))
+                    self._proc.stdin.flush()
+            except Exception as e:
+                self.close()
+                return f"[error: {e}]\n", None
+            if not cur["done"].wait(timeout):
+                self.close()  # the only way to get a wedged shell back
+                cur["out"].append("[timeout]\n")
+            self._current = None
+            return "".join(cur["out"]), cur["code"]
+
+    def run_argv(self, args, on_output=None, timeout=None):
+        """run() for an argv list; every argument is quoted, spaces and all."""
+        return self.run(" ".join(shlex.quote(str(a)) for a in args),
+                        on_output=on_output, timeout=timeout)
+
+    def _read_loop(self, proc):
+        buf = b""
+        while True:
+            try:
+                data = proc.stdout.read1(self.READ_CHUNK)
+            except Exception:
+                data = b""
+            if not data:
+                break
+            buf += data
+            start = 0
+            while True:
+                nl = buf.find(b"\n", start)
+                if nl < 0:
+                    break
+                self._dispatch(buf[start:nl + 1])
+                start = nl + 1
+            buf = buf[start:]
+            # Pass on a partial line (progress output, prompts) up to where a marker could begin
+            cur = self._current
+            if cur and buf:
+                safe = self._safe_len(buf, cur["marker"])
+                if safe:
+                    self._emit(cur, buf[:safe])
+                    buf = buf[safe:]
+        cur = self._current
+        if cur and cur["proc"] is proc:  # session ended mid-command (e.g. `exit`)
+            if buf:
+                self._emit(cur, buf)
+            cur["done"].set()
+
+    def _dispatch(self, line):
+        cur = self._current
+        if cur is None:
+            return
+        i = line.find(cur["marker"])
+        if i < 0:
+            self._emit(cur, line)
+            return
+        if i:
+            self._emit(cur, line[:i])
+        fields = line[i + len(cur["marker"]):].decode("utf-8", "replace").strip().split(" ", 3)
+        try:
+            cur["code"] = int(fields[0])
+        except (ValueError, IndexError):
+            pass
+        if len(fields) > 1 and fields[1].isdigit():
+            self.uid = int(fields[1])
+        if len(fields) > 2 and fields[2].isdigit():
+            self.shell_pid = int(fields[2])
+        if len(fields) > 3 and fields[3].startswith("/"):
+            self.cwd = fields[3]
+        cur["done"].set()
+
+    @staticmethod
+    def _safe_len(buf, marker):
+        i = buf.find(marker)
+        if i >= 0:
+            return i
+        for k in range(min(len(marker) - 1, len(buf)), 0, -1):
+            if marker.startswith(buf[-k:]):
+                return len(buf) - k
+        return len(buf)
+
+    def interrupt(self, grace=1.0):
+        """
+        Signal whatever the session's shell is running (there is no tty to carry
+        ^C): SIGINT first, SIGTERM if it is still going after `grace` seconds.
+        The signal goes out over a separate adb connection so it isn't queued
+        behind the busy session. If nothing ends (the shell itself is waiting
+        for more input, e.g. an unclosed heredoc) the session is closed and
+        respawns on the next run(). Returns True if the command ended.
+        """
+        cur = self._current
+        if not cur:
+            return False
+        for sig in ("INT", "TERM") if self.shell_pid else ():
+            kill = f"pkill -{sig} -P {self.shell_pid}"
+            cmd = ["shell", "su", "-c", kill] if self.uid == 0 else ["shell", kill]
+            Backend.run([ADB_PATH, "-s", self.serial] + cmd, timeout=5)
+            if cur["done"].wait(grace):
+                return True
+        if cur["proc"] is self._proc:
+            self.close()  # the reader sees EOF and ends the command
+        return cur["done"].wait(grace)
+
+    @property
+    def busy(self):
+        return self._current is not None
+
+    @staticmethod
+    def _emit(cur, data):
+        text = cur["dec"].decode(data)
+        if not text:
+            return
+        out = cur["out"]
+        out.append(text)
+        if cur["cb"]:
+            # The callback has everything; keep only a tail so `logcat` or `top` can run for hours
+            cur["size"] += len(text)
+            while cur["size"] > ShellSession.OUTPUT_TAIL and len(out) > 1:
+                cur["size"] -= len(out.popleft())
+            try:
+                cur["cb"](text)
+            except Exception:
+                pass
+
+
+class RootShellPool:
+    """
+    Long-lived root shells per device that any view can borrow. Each is a
+    ShellSession spawned as `adb shell su`, so the root manager authorizes
+    (and logs) once per shell instead of once per command, and commands go
+    in as quoted argv frames. Up to MAX_PER_DEVICE run side by side; further
+    callers wait for one to come back.
+    """
+    MAX_PER_DEVICE = 3
+
+    def __init__(self):
+        self._idle = {}  # serial -> [ShellSession]
+        self._count = {}  # serial -> sessions handed out or idle
+        self._cond = threading.Condition()
+
+    def _acquire(self, serial, timeout):
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                idle = self._idle.get(serial)
+                if idle:
+                    return idle.pop()
+                if self._count.get(serial, 0) < self.MAX_PER_DEVICE:
+                    self._count[serial] = self._count.get(serial, 0) + 1
+                    return ShellSession(serial, root=True)
+                left = deadline - time.time()
+                if left <= 0:
+                    return None
+                self._cond.wait(left)
+
+    def _release(self, sess, keep):
+        with self._cond:
+            if keep:
+                self._idle.setdefault(sess.serial, []).append(sess)
+            else:
+                sess.close()
+                self._count[sess.serial] -= 1
+            self._cond.notify()
+
+    def run(self, serial, args, on_output=None, timeout=60, wait=60):
+        """
+        Run an argv list, or a string already in shell syntax, as root;
+        returns (output, exit_code), exit_code None on failure. `timeout`
+        bounds the command (None: no limit), `wait` the time spent waiting
+        for a free shell.
+        """
+        sess = self._acquire(serial, wait)
+        if sess is None:
+            return "[error: all root shells busy]\n", None
+        try:
+            if isinstance(args, str):
+                out, code = sess.run(args, on_output=on_output, timeout=timeout)
+            else:
+                out, code = sess.run_argv(args, on_output=on_output, timeout=timeout)
+        except Exception as e:
+            out, code = f"[error: {e}]\n", None
+        ok = code is not None and sess.alive and sess.uid in (0, None)
+        if code is not None and sess.uid not in (0, None):
+            # su handed back an unprivileged shell: never keep it in the root pool
+            out, code = out + "[error: su did not grant root]\n", None
+        elif code is None and not sess.alive and not out.strip():
+            out = "[error: su denied or unavailable]\n"
+        self._release(sess, ok)
+        return out, code
+
+    def close(self, serial=None):
+        with self._cond:
+            for s in list(self._idle) if serial is None else [serial]:
+                for sess in self._idle.pop(s, []):
+                    sess.close()
+                    self._count[s] -= 1
+
+
+ROOT_POOL = RootShellPool()
+# Don't keep idle root shells around once root is switched off
+CONF.subscribe(lambda key, on: on or ROOT_POOL.close(), "use_su")
+
+
+class RemotePathIndex:
+    """
+    Per-device cache behind Shell tab completion: directory listings fetched
+    lazily (one `ls` per directory) and the command names found on $PATH,
+    scanned once. Lookups are pure dict/bisect work; only a miss costs a round
+    trip, and commands that can change the filesystem drop the listings they
+    may have touched.
+    """
+    TTL = 60  # seconds a listing is trusted even without an invalidating command
+    BUILTINS = ("cd", "echo", "exit", "export", "alias", "unset", "set", "type",
+                "which", "read", "test", "true", "false", "pwd", "ulimit", "umask")
+    MUTATING = {"rm", "rmdir", "mv", "cp", "mkdir", "touch", "ln", "tar", "unzip",
+                "gzip", "gunzip", "chmod", "chown", "dd", "install", "pm", "am",
+                "screencap", "screenrecord", "cmd", "setprop", "restorecon", "mount",
+                "umount", "truncate", "sed", "patch"}
+
+    def __init__(self, session):
+        self.session = session
+        self._dirs = {}  # absolute dir -> (time, sorted names; dirs end in "/")
+        self._commands = None
+        self._lock = threading.Lock()
+
+    # ── Cache ──────────────────────────────────────────────────────────────
+    def listing(self, path):
+        """Cached entries of `path`, or None if it has to be fetched first."""
+        with self._lock:
+            hit = self._dirs.get(path)
+        if hit and time.time() - hit[0] < self.TTL:
+            return hit[1]
+        return None
+
+    def fetch(self, path):
+        """List `path` over the session (blocking) and cache it."""
+        q = shlex.quote(path)
+        out, code = self.session.run(f"ls -1Ap {q} 2>/dev/null || ls -a {q}", timeout=10)
+        names = [] if code is None else sorted(
+            n for n in out.splitlines() if n and n not in (".", "..", "./", "../"))
+        with self._lock:
+            self._dirs[path] = (time.time(), names)
+        return names
+
+    def commands(self):
+        return self._commands
+
+    def fetch_commands(self):
+        out, code = self.session.run(
+            '( IFS=:; for d in $PATH; do ls "$d"; done ) 2>/dev/null', timeout=15)
+        names = set(self.BUILTINS)
+        if code is not None:
+            names.update(n for n in out.split() if "/" not in n)
+        self._commands = sorted(names)
+        return self._commands
+
+    def note_command(self, cmd, cwd):
+        """Drop listings a just-run command may have changed."""
+        try:
+            words = shlex.split(cmd)
+        except ValueError:
+            words = cmd.split()
+        if not words:
+            return
+        if words[0] in ("su", "sh"):
+            words = words[2:] if len(words) > 2 and words[1] == "-c" else []
+        if not (">" in cmd or (words and words[0] in self.MUTATING)):
+            return
+        stale = {cwd}
+        for w in words[1:]:
+            if w.startswith("-"):
+                continue
+            p = posixpath.normpath(posixpath.join(cwd, w.lstrip(">")))
+            stale.update((p, posixpath.dirname(p)))
+        with self._lock:
+            if words and words[0] in ("pm", "am", "cmd"):
+                self._dirs.clear()  # installs/uninstalls touch paths we can't predict
+            else:
+                for p in stale:
+                    self._dirs.pop(p, None)
+
+    def clear(self):
+        with self._lock:
+            self._dirs.clear()
+        self._commands = None
+
+    # ── Completion ─────────────────────────────────────────────────────────
+    @staticmethod
+    def split_word(line):
+        """(index where the last word starts, the word, is it the command word)."""
+        i = len(line)
+        while i > 0 and not (line[i - 1] in " \t;|&<>" and (i < 2 or line[i - 2] != "\\")):
+            i -= 1
+        head = line[:i].rstrip()
+        first = not head or head[-1] in ";|&"
+        return i, line[i:].replace("\\ ", " "), first
+
+    def complete(self, line, cwd):
+        """
+        Complete the last word of `line`. Returns (start, candidates) where
+        candidates are full replacement words, or (start, None) with the
+        directory or "$PATH" that has to be fetched first.
+        """
+        start, word, first = self.split_word(line)
+        if first and "/" not in word:
+            names = self._commands
+            if names is None:
+                return start, "$PATH"
+            lo = bisect.bisect_left(names, word)
+            hi = bisect.bisect_left(names, word + "\uffff")
+            return start, [n + " " for n in names[lo:hi]]
+        base, _, prefix = word.rpartition("/")
+        if word.startswith("/"):
+            d = posixpath.normpath(base or "/")
+        else:
+            d = posixpath.normpath(posixpath.join(cwd, base)) if base else cwd
+        d = "/" + d.lstrip("/")
+        names = self.listing(d)
+        if names is None:
+            return start, d
+        lo = bisect.bisect_left(names, prefix)
+        hi = bisect.bisect_left(names, prefix + "\uffff")
+        stem = word[:len(word) - len(prefix)]
+        out = []
+        for n in names[lo:hi]:
+            if not prefix.startswith(".") and n.startswith("."):
+                continue
+            out.append((stem + n).replace(" ", "\\ ") + ("" if n.endswith("/") else " "))
+        return start, out
+
+
+class PidNameCache:
+    """
+    PID -> process name for one device. Seeded from a single `ps -A` snapshot;
+    PIDs missing from the map are collected and resolved together in one
+    `ps -p` call, so logcat lines are annotated with a dict lookup. A PID
+    found gone is only trusted for GONE_TTL seconds, since PIDs get reused.
+    """
+    BATCH_DELAY = 0.25
+    SNAPSHOT_MAX_AGE = 60
+    GONE_TTL = 10
+
+    def __init__(self, serial):
+        self.serial = serial
+        self.names = {}
+        self._gone = {}  # pid -> time.monotonic() when it resolved to nothing
+        self._unknown = set()
+        self._lock = threading.Lock()
+        self._busy = False
+        self._legacy = False  # toolbox ps (pre-Oreo) has no -A/-o/-p
+        self._snapshot_at = 0
+
+    def start(self):
+        with self._lock:
+            self._busy = True
+        SCHEDULER.submit(self._resolve_loop, True, priority=TaskScheduler.BACKGROUND)
+
+    def lookup(self, pid):
+        """Process name for `pid`, "" if it is gone, or None while it is being resolved."""
+        name = self.names.get(pid)
+        if name == "" and time.monotonic() - self._gone.get(pid, 0) > self.GONE_TTL:
+            name = None  # the PID may have been recycled since: look again
+        if name is None:
+            with self._lock:
+                self._unknown.add(pid)
+                if not self._busy:
+                    self._busy = True
+                    SCHEDULER.submit(self._resolve_loop, priority=TaskScheduler.BACKGROUND)
+        return name
+
+    def package_for(self, pid):
+        name = self.lookup(pid)
+        return name.split(":")[0] if name else name
+
+    def snapshot(self):
+        if not self._legacy:
+            out = Backend.run([ADB_PATH, "-s", self.serial, "shell", "ps", "-A", "-o", "PID,NAME"], timeout=10)
+            names = self._parse(out)
+            # toolbox ps ignores -o and takes -A as a name filter: a bare legacy header comes back.
+            # An error, a timeout or an empty reply says nothing about the device's ps.
+            if not names and out.split("\n", 1)[0].split()[:2] == ["USER", "PID"]:
+                self._legacy = True
+        if self._legacy:
+            names = self._parse(Backend.run([ADB_PATH, "-s", self.serial, "shell", "ps"], timeout=10))
+        if names:
+            self.names = names
+            self._gone = {}
+            self._snapshot_at = time.time()
+
+    def _resolve_loop(self, initial=False):
+        try:
+            if initial:
+                self.snapshot()
+            while True:
+                time.sleep(self.BATCH_DELAY)  # let a burst of new PIDs accumulate
+                with self._lock:
+                    pids, self._unknown = self._unknown, set()
+                    if not pids:
+                        self._busy = False
+                        return
+                if self._legacy or time.time() - self._snapshot_at > self.SNAPSHOT_MAX_AGE:
+                    self.snapshot()
+                    found = self.names
+                else:
+                    out = Backend.run([ADB_PATH, "-s", self.serial, "shell", "ps", "-o", "PID,NAME",
+                                       "-p", ",".join(sorted(pids))], timeout=5)
+                    found = self._parse(out)
+                now = time.monotonic()
+                for pid in pids:
+                    self.names[pid] = found.get(pid, "")  # "" marks a PID that already exited
+                    if not self.names[pid]:
+                        self._gone[pid] = now
+        except Exception:
+            with self._lock:
+                self._busy = False
+
+    def _parse(self, out):
+        names = {}
+        for line in out.splitlines()[1:]:
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            pid = parts[1] if self._legacy else parts[0]
+            if pid.isdigit():
+                names[pid] = parts[-1]
+        return names
+
+# ==========================================
+# 4b. LOGCAT RECORDER
+# ==========================================
+LEVEL_BITS = {b"V": 1, b"D": 2, b"I": 4, b"W": 8, b"E": 16, b"F": 32, b"A": 32}
+LOG_LEVELS = "VDIWEF"
+
+
+class LogcatIndex:
+    """
+    Sparse index for one recorded segment: time range, a sampled
+    time -> byte-offset table and a level bitmap per tag. Offsets refer to the
+    uncompressed stream, so they are valid for both .log and .log.gz files.
+    """
+    SPARSE_EVERY = 1024
+    LINE_RE = re.compile(rb"(\d\d-\d\d \d\d:\d\d:\d\d\.\d{3})\s+\d+\s+\d+\s+([VDIWEFA])\s+(.*?)\s*: ")
+
+    def __init__(self):
+        self.first = self.last = None
+        self.levels = 0
+        self.tags = {}
+        self.sparse = []
+        self._lines = 0
+        self._last_key = None
+
+    @staticmethod
+    def path_for(segment):
+        segment = Path(segment)
+        return segment.with_name(segment.name.split(".")[0] + ".idx")
+
+    @staticmethod
+    def to_epoch(key):
+        """Convert a threadtime stamp (no year) to epoch seconds, assuming the most recent such date."""
+        if isinstance(key, bytes):
+            key = key.decode()
+        mo, d, h, mi, sec, ms = (int(key[0:2]), int(key[3:5]), int(key[6:8]),
+                                 int(key[9:11]), int(key[12:14]), int(key[15:18]))
+        year = datetime.date.today().year
+        ts = time.mktime((year, mo, d, h, mi, sec, 0, 0, -1)) + ms / 1000
+        if ts > time.time() + 86400:
+            ts = time.mktime((year - 1, mo, d, h, mi, sec, 0, 0, -1)) + ms / 1000
+        return ts
+
+    @staticmethod
+    def to_key(ts):
+        return time.strftime("%m-%d %H:%M:%S", time.localtime(ts)).encode() + b".%03d" % int((ts % 1) * 1000)
+
+    def feed(self, chunk, offset):
+        match = self.LINE_RE.match
+        for line in chunk.splitlines(keepends=True):
+            m = match(line)
+            if m:
+                bit = LEVEL_BITS[m.group(2)]
+                self.levels |= bit
+                tag = m.group(3)
+                self.tags[tag] = self.tags.get(tag, 0) | bit
+                self._last_key = m.group(1)
+                if self._lines % self.SPARSE_EVERY == 0:
+                    ts = self.to_epoch(self._last_key)
+                    self.sparse.append((ts, offset))
+                    if self.first is None:
+                        self.first = ts
+                self._lines += 1
+            offset += len(line)
+
+    def finish(self):
+        if self._last_key:
+            self.last = self.to_epoch(self._last_key)
+        return self
+
+    def offset_for(self, since):
+        """Byte offset of the last sampled line at or before `since`."""
+        if not since or not self.sparse:
+            return 0
+        i = bisect.bisect_right([t for t, _ in self.sparse], since) - 1
+        return self.sparse[i][1] if i >= 0 else 0
+
+    def save(self, path):
+        self.finish()
+        data = {
+            "first": self.first, "last": self.last, "levels": self.levels,
+            "tags": {t.decode("utf-8", "replace"): b for t, b in self.tags.items()},
+            "sparse": self.sparse,
+        }
+        try:
+            with open(path, "w") as f:
+                json.dump(data, f)
+        except Exception:
+            pass
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            data = json.load(f)
+        idx = cls()
+        idx.first, idx.last, idx.levels = data["first"], data["last"], data["levels"]
+        idx.tags = {t.encode("utf-8"): b for t, b in data["tags"].items()}
+        idx.sparse = [tuple(x) for x in data["sparse"]]
+        return idx
+
+class LogcatRecorder:
+    """
+    Always-on logcat capture for one device, independent of the UI.
+
+    A reader thread pulls raw bytes from `adb logcat` and hands whole-line
+    chunks to a writer thread, which appends them to the current segment
+    through a large buffer and rotates by size or age. Closed segments are
+    gzip-compressed and the oldest ones pruned.
+    """
+    READ_CHUNK = 64 * 1024
+    WRITE_BUFFER = 1024 * 1024
+    RETRY_DELAY = 5
+    _TS_RE = re.compile(rb"\d\d-\d\d \d\d:\d\d:\d\d\.\d{3}")
+
+    def __init__(self, serial, root=None):
+        self.serial = serial
+        self.dir = Path(root or LOGCAT_DIR) / re.sub(r"[^\w.-]", "_", serial)
+        self.max_bytes = int(CONF.get("logcat_record_max_mb", 16)) * 1024 * 1024
+        self.max_age = int(CONF.get("logcat_record_max_minutes", 30)) * 60
+        self.keep = int(CONF.get("logcat_record_keep", 100))
+        self.compress = CONF.get("logcat_record_compress", True)
+        self.bytes_written = 0
+        self._queue = queue.Queue(maxsize=256)  # back-pressure instead of unbounded RAM
+        self._stop = threading.Event()
+        self._proc = None
+        self._last_ts = None  # resume point after adb drops the stream
+        self._index = None
+        self._reader = None
+        self._writer = None
+
+    @property
+    def running(self):
+        return bool(self._writer and self._writer.is_alive())
+
+    def start(self):
+        if self.running:
+            return
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._stop.clear()
+        self._writer = SCHEDULER.service(self._write_loop, name=f"logcat writer {self.serial}")
+        self._reader = SCHEDULER.service(self._read_loop, name=f"logcat recorder {self.serial}")
+
+    def stop(self, wait=True):
+        """Stop capturing; the writer flushes and closes the open segment."""
+        self._stop.set()
+        if self._proc:
+            try:
+                self._proc.kill()
+            except Exception:
+                pass
+        if wait and self._writer:
+            self._writer.join(timeout=10)
+
+    def segments(self):
+        """All segments of this device, oldest first."""
+        if not self.dir.exists():
+            return []
+        return sorted(p for p in self.dir.iterdir()
+                      if p.name.startswith("logcat_") and p.suffix in (".log", ".gz"))
+
+    # ── Reader ─────────────────────────────────────────────────────────────
+    def _read_loop(self):
+        while not self._stop.is_set():
+            cmd = [ADB_PATH, "-s", self.serial, "logcat", "-v", "threadtime"]
+            if self._last_ts:
+                cmd += ["-T", self._last_ts]
+            try:
+                kwargs = Backend._no_window_kwargs()
+                kwargs["stdin"] = subprocess.DEVNULL
+                self._proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                              stderr=subprocess.DEVNULL, **kwargs)
+            except Exception:
+                self._stop.wait(self.RETRY_DELAY)
+                continue
+
+            tail = b""
+            while not self._stop.is_set():
+                data = self._proc.stdout.read1(self.READ_CHUNK)
+                if not data:
+                    break
+                data = tail + data
+                cut = data.rfind(b"\n") + 1
+                tail = data[cut:]
+                if cut:
+                    self._remember_ts(data, cut)
+                    self._put(data[:cut])
+            if tail:
+                self._put(tail + b"\n")
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=2)
+            except Exception:
+                pass
+            # adb exits when the device drops; wait and resume from the last line
+            self._stop.wait(self.RETRY_DELAY)
+
+    def _remember_ts(self, data, cut):
+        start = data.rfind(b"\n", 0, cut - 1) + 1
+        m = self._TS_RE.match(data, start)
+        if m:
+            self._last_ts = m.group().decode()
+
+    def _put(self, chunk):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(chunk, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    # ── Writer ─────────────────────────────────────────────────────────────
+    def _write_loop(self):
+        fh, opened = None, 0
+        try:
+            while True:
+                try:
+                    chunk = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    chunk = b""
+                if fh and (fh.tell() >= self.max_bytes or time.time() - opened >= self.max_age):
+                    self._close_segment(fh)
+                    fh = None
+                if chunk:
+                    if fh is None:
+                        fh, opened = self._open_segment(), time.time()
+                        self._index = LogcatIndex()
+                    self._index.feed(chunk, fh.tell())
+                    fh.write(chunk)
+                    self.bytes_written += len(chunk)
+                elif self._stop.is_set() and self._queue.empty():
+                    break
+        except Exception as e:
+            log_action(op="logcat_record", serial=self.serial, result="error", error=str(e))
+        finally:
+            if fh:
+                self._close_segment(fh)
+
+    def _open_segment(self):
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        return open(self.dir / f"logcat_{stamp}.log", "wb", buffering=self.WRITE_BUFFER)
+
+    def _close_segment(self, fh):
+        path = Path(fh.name)
+        fh.close()
+        self._index.save(LogcatIndex.path_for(path))
+        if self.compress:
+            gz = Path(f"{path}.gz")
+            try:
+                with open(path, "rb") as src, gzip.open(gz, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, self.WRITE_BUFFER)
+                path.unlink()
+            except Exception as e:
+                gz.unlink(missing_ok=True)
+                log_action(op="logcat_compress", serial=self.serial, result="error",
+                           path=str(path), error=str(e))
+        segs = self.segments()
+        for old in segs[:max(0, len(segs) - self.keep)]:
+            try:
+                old.unlink()
+                LogcatIndex.path_for(old).unlink(missing_ok=True)
+            except Exception:
+                pass
+
+# ==========================================
+# 4c. LOGCAT ARCHIVE SEARCH
+# ==========================================
+class LogcatArchive:
+    """
+    Query recorded logcat segments. Each segment's index is checked first so
+    segments outside the time range, or without the wanted tag/level, are
+    never opened. Uncompressed segments are memory-mapped; gzip segments are
+    decompressed as a stream.
+    """
+    def __init__(self, root=None):
+        self.root = Path(root or LOGCAT_DIR)
+
+    def devices(self):
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def segments(self, device):
+        d = self.root / device
+        if not d.exists():
+            return []
+        return sorted(p for p in d.iterdir()
+                      if p.name.startswith("logcat_") and p.suffix in (".log", ".gz"))
+
+    def index_for(self, seg):
+        """Load the sidecar index, or build one by scanning (cached only for closed segments)."""
+        idx_path = LogcatIndex.path_for(seg)
+        if idx_path.exists():
+            try:
+                return LogcatIndex.load(idx_path)
+            except Exception:
+                pass
+        idx = LogcatIndex()
+        offset = 0
+        with self._open(seg) as f:
+            while True:
+                chunk = f.read(LogcatRecorder.WRITE_BUFFER)
+                if not chunk:
+                    break
+                if not chunk.endswith(b"\n"):
+                    chunk += f.readline()
+                idx.feed(chunk, offset)
+                offset += len(chunk)
+        if seg.suffix == ".gz":
+            idx.save(idx_path)
+        return idx.finish()
+
+    @staticmethod
+    def _open(seg):
+        return gzip.open(seg, "rb") if seg.suffix == ".gz" else open(seg, "rb")
+
+    def search(self, device, min_level="V", tag=None, text=None, since=None, until=None,
+               limit=10000, stats=None):
+        """Yield matching lines (str), oldest first. `stats` is filled with segment counters."""
+        stats = stats if stats is not None else {}
+        stats.update(segments=0, skipped=0, matches=0)
+        wanted = sum(LEVEL_BITS[c.encode()] for c in LOG_LEVELS[LOG_LEVELS.index(min_level):])
+        tag_b = tag.encode("utf-8") if tag else None
+        needle = text.lower().encode("utf-8") if text else None
+        since_key = LogcatIndex.to_key(since) if since else None
+        until_key = LogcatIndex.to_key(until) if until else None
+        match = LogcatIndex.LINE_RE.match
+
+        for seg in self.segments(device):
+            stats["segments"] += 1
+            try:
+                idx = self.index_for(seg)
+            except Exception:
+                continue
+            mask = idx.tags.get(tag_b, 0) if tag_b else idx.levels
+            if (not mask & wanted
+                    or (since and idx.last and idx.last < since)
+                    or (until and idx.first and idx.first > until)):
+                stats["skipped"] += 1
+                continue
+
+            for line in self._lines(seg, idx.offset_for(since)):
+                key = line[:18]
+                if since_key and key < since_key:
+                    continue
+                if until_key and key > until_key:
+                    break
+                m = match(line)
+                if not m or not LEVEL_BITS[m.group(2)] & wanted:
+                    continue
+                if tag_b and m.group(3) != tag_b:
+                    continue
+                if needle and needle not in line.lower():
+                    continue
+                stats["matches"] += 1
+                yield line.rstrip(b"\r\n").decode("utf-8", "replace")
+                if stats["matches"] >= limit:
+                    return
+
+    def _lines(self, seg, start):
+        if seg.suffix == ".gz":
+            with gzip.open(seg, "rb") as f:
+                f.seek(start)
+                yield from f
+            return
+        with open(seg, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mm.seek(start)
+                yield from iter(mm.readline, b"")
+
+# ==========================================
+# 4d. LOG RATE STATISTICS
+# ==========================================
+class LogRateStats:
+    """
+    Per-tag and per-PID line counts over sliding windows, fed from the logcat
+    reader thread. Each entry only bumps a counter for the current second;
+    when the second rolls over its counts are added to every window total and
+    seconds that fell out of a window are subtracted again.
+    """
+    WINDOWS = (1, 60, 600)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sec = None
+        self._cur = {}
+        self._totals = {w: {} for w in self.WINDOWS}
+        self._history = {w: deque() for w in self.WINDOWS}
+        self.total = 0
+
+    def add(self, tag, pid, now):
+        sec = int(now)
+        with self._lock:
+            if sec != self._sec:
+                self._roll(sec)
+            cur = self._cur
+            k = ("tag", tag)
+            cur[k] = cur.get(k, 0) + 1
+            k = ("pid", pid)
+            cur[k] = cur.get(k, 0) + 1
+            self.total += 1
+
+    def _roll(self, sec):
+        if self._cur:
+            for w in self.WINDOWS:
+                tot = self._totals[w]
+                for k, n in self._cur.items():
+                    tot[k] = tot.get(k, 0) + n
+                self._history[w].append((self._sec, self._cur))
+            self._cur = {}
+        self._sec = sec
+        for w in self.WINDOWS:
+            hist, tot = self._history[w], self._totals[w]
+            while hist and hist[0][0] < sec - w:
+                for k, n in hist.popleft()[1].items():
+                    left = tot[k] - n
+                    if left:
+                        tot[k] = left
+                    else:
+                        del tot[k]
+
+    def top(self, window, by="tag", n=25, now=None):
+        """[(key, count, lines per second)] for the last `window` completed seconds, busiest first."""
+        sec = int(now if now is not None else time.monotonic())
+        with self._lock:
+            if self._sec is None or sec > self._sec:
+                self._roll(sec)  # only a finished second is folded in; the live one stays in _cur
+            rows = [(k[1], c) for k, c in self._totals[window].items() if k[0] == by]
+        rows.sort(key=lambda r: r[1], reverse=True)
+        return [(k, c, c / window) for k, c in rows[:n]]
+
+# ==========================================
+# 4e. CRASH & ANR WATCHER
+# ==========================================
+class CrashWatcher:
+    """
+    Background watcher for Java crashes, native crashes and ANRs on every
+    device. Each device gets one `adb logcat` whose filter spec silences all
+    other tags on the device side, so idle devices produce no traffic.
+    Multi-line reports are grouped per (pid, tag) and deduplicated by a hash
+    of their stack.
+    """
+    LOGCAT_ARGS = ["logcat", "-v", "threadtime", "-b", "crash", "-b", "main", "-b", "system",
+                   "AndroidRuntime:E", "ActivityManager:E", "DEBUG:F", "*:S"]
+    LINE_RE = re.compile(r"(\d\d-\d\d \d\d:\d\d:\d\d\.\d{3})\s+(\d+)\s+\d+\s+[VDIWEFA]\s+(.*?)\s*: ?(.*)")
+    IDLE_FLUSH = 1.0
+    RETRY_DELAY = 5
+
+    def __init__(self, on_event=None):
+        self.events = {}  # (serial, stack hash) -> event dict, in first-seen order
+        self.on_event = on_event
+        self._watching = {}  # serial -> stop Event
+        self._procs = {}
+        self._pending = {}  # (serial, pid, tag) -> partial report
+        self._seen = set()  # occurrences already counted, survives stream restarts
+        self._lock = threading.Lock()
+        SCHEDULER.service(self._flush_loop, name="crash watcher flush")
+
+    def sync(self, serials):
+        """Watch exactly the given serials."""
+        for serial in set(self._watching) - set(serials):
+            self.stop(serial)
+        for serial in serials:
+            if serial not in self._watching:
+                stop = self._watching[serial] = threading.Event()
+                SCHEDULER.service(self._watch, serial, stop, name=f"crash watcher {serial}")
+
+    def stop(self, serial=None):
+        for s in ([serial] if serial else list(self._watching)):
+            ev = self._watching.pop(s, None)
+            if ev:
+                ev.set()
+            proc = self._procs.pop(s, None)
+            if proc:
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.events.values())
+
+    def _watch(self, serial, stop):
+        while not stop.is_set():
+            try:
+                kwargs = Backend._no_window_kwargs()
+                kwargs["stdin"] = subprocess.DEVNULL
+                proc = self._procs[serial] = subprocess.Popen(
+                    [ADB_PATH, "-s", serial] + self.LOGCAT_ARGS,
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    text=True, encoding="utf-8", errors="replace", **kwargs
+                )
+                if stop.is_set():
+                    proc.kill()
+                for line in proc.stdout:
+                    if stop.is_set():
+                        break
+                    self._feed(serial, line.rstrip("\r\n"))
+                proc.kill()
+            except Exception:
+                pass
+            stop.wait(self.RETRY_DELAY)
+
+    @staticmethod
+    def _start_kind(tag, msg):
+        if tag == "AndroidRuntime" and msg.startswith("FATAL EXCEPTION"):
+            return "crash"
+        if tag == "ActivityManager" and msg.startswith("ANR in "):
+            return "anr"
+        if tag == "DEBUG" and "*** *** ***" in msg:
+            return "native"
+        return None
+
+    def _feed(self, serial, line):
+        m = self.LINE_RE.match(line)
+        if not m:
+            return
+        ts, pid, tag, msg = m.groups()
+        key = (serial, pid, tag)
+        with self._lock:
+            kind = self._start_kind(tag, msg)
+            if kind:
+                if key in self._pending:
+                    self._finish(key)
+                self._pending[key] = {"kind": kind, "time": ts, "pid": pid, "lines": [msg],
+                                      "at": time.monotonic()}
+            elif key in self._pending:
+                pend = self._pending[key]
+                pend["lines"].append(msg)
+                pend["at"] = time.monotonic()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.IDLE_FLUSH / 2)
+            now = time.monotonic()
+            with self._lock:
+                for key in [k for k, p in self._pending.items() if now - p["at"] >= self.IDLE_FLUSH]:
+                    self._finish(key)
+
+    @staticmethod
+    def _signature(kind, lines):
+        if kind == "anr":
+            sig = [l for l in lines if l.startswith(("ANR in", "Reason:"))]
+        elif kind == "native":
+            sig = [l.strip() for l in lines if re.match(r"\s*#\d+ pc ", l)]
+        else:
+            sig = [l.strip() for l in lines[1:] if not l.startswith(("Process:", "PID:"))]
+        return hashlib.sha1("\n".join(sig).encode("utf-8")).hexdigest()[:12]
+
+    @staticmethod
+    def _package(kind, lines):
+        pattern = {"crash": r"Process: ([^,\s]+)", "anr": r"ANR in (\S+)", "native": r">>> (\S+) <<<"}[kind]
+        for l in lines:
+            m = re.search(pattern, l)
+            if m:
+                return m.group(1)
+        return "?"
+
+    def _finish(self, key):
+        """Turn a pending report into an event (caller holds the lock)."""
+        pend = self._pending.pop(key)
+        serial = key[0]
+        occurrence = (serial, pend["time"], pend["pid"], pend["kind"])
+        if occurrence in self._seen:
+            return
+        self._seen.add(occurrence)
+        stack = self._signature(pend["kind"], pend["lines"])
+        ev = self.events.get((serial, stack))
+        is_new = ev is None
+        if is_new:
+            ev = self.events[(serial, stack)] = {
+                "id": stack, "serial": serial, "kind": pend["kind"],
+                "package": self._package(pend["kind"], pend["lines"]),
+                "first": pend["time"], "last": pend["time"], "count": 0,
+                "trace": "\n".join(pend["lines"]),
+            }
+        ev["count"] += 1
+        ev["last"] = pend["time"]
+        if self.on_event:
+            try:
+                self.on_event(ev, is_new)
+            except Exception:
+                pass
+
+# ==========================================
+# 4f. MERGED MULTI-DEVICE LOGCAT
+# ==========================================
+class MergedLogcat:
+    """
+    Interleave logcat from several devices on one timeline. Each device's
+    clock offset is measured with `date +%s.%N` round trips; every reader
+    pushes entries stamped with host-corrected time into one shared, bounded
+    heap, and `drain()` pops them in order once they are older than a short
+    latency watermark (a streaming k-way merge). While a device is still
+    dumping its ring buffer, the last timestamp it produced is a low
+    watermark nothing may be popped past, even when the heap is full.
+    """
+    MAX_BUFFER = 50000
+    LATENCY = 0.5
+    WARMUP = 2.0  # counted from the last clock offset, not from start()
+    CATCHUP_IDLE = 1.0  # a reader quiet this long has finished its dump
+
+    def __init__(self, serials):
+        self.serials = list(serials)
+        self.offsets = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._procs = []
+        self._started = None
+        self._dumping = {s: (None, None) for s in self.serials}  # serial -> (last host ts, monotonic read time)
+
+    @staticmethod
+    def clock_offset(serial, samples=3):
+        """Device clock minus host clock in seconds, from the round trip with the lowest latency."""
+        best = None
+        for _ in range(samples):
+            t0 = time.time()
+            out = Backend.run([ADB_PATH, "-s", serial, "shell", "date", "+%s.%N"], timeout=5).strip()
+            t1 = time.time()
+            if not re.fullmatch(r"\d+(\.\d+)?", out):
+                out = out.split(".")[0]  # no %N support: whole seconds only
+            try:
+                dev = float(out)
+            except ValueError:
+                continue
+            if best is None or t1 - t0 < best[0]:
+                best = (t1 - t0, dev - (t0 + t1) / 2)
+        return best[1] if best else 0.0
+
+    def start(self):
+        for serial in self.serials:
+            SCHEDULER.service(self._read, serial, name=f"merged logcat {serial}")
+
+    def stop(self):
+        self._stop.set()
+        for proc in self._procs:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+        with self._cond:
+            self._cond.notify_all()
+
+    def _read(self, serial):
+        try:
+            self._follow(serial)
+        finally:
+            with self._cond:
+                self._dumping.pop(serial, None)  # a dead reader holds nothing back
+                self._cond.notify_all()
+
+    def _follow(self, serial):
+        offset = self.clock_offset(serial)
+        with self._cond:
+            self.offsets[serial] = offset
+            if len(self.offsets) == len(self.serials):
+                self._started = time.monotonic()  # every clock is known: the warmup starts now
+        if self._stop.is_set():
+            return
+        kwargs = Backend._no_window_kwargs()
+        kwargs["stdin"] = subprocess.DEVNULL
+        try:
+            proc = subprocess.Popen([ADB_PATH, "-s", serial, "logcat", "-v", "threadtime", "-v", "epoch"],
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    text=True, encoding="utf-8", errors="replace", **kwargs)
+        except Exception:
+            return
+        self._procs.append(proc)
+        if self._stop.is_set():  # stop() ran while Popen was starting and missed this process
+            proc.kill()
+            return
+        heap, cond, dumping = self._heap, self._cond, self._dumping
+        with cond:
+            if serial in dumping:
+                dumping[serial] = (None, time.monotonic())
+        for line in proc.stdout:
+            if self._stop.is_set():
+                break
+            head, rest = (line.rstrip().split(None, 1) + ["", ""])[:2]  # -v epoch right-pads the seconds
+            try:
+                ts = float(head)
+            except ValueError:
+                if not LogcatIndex.LINE_RE.match(line.encode("utf-8", "replace")):
+                    continue  # "--------- beginning of ..." markers
+                ts, rest = LogcatIndex.to_epoch(line[:18]), line[18:].rstrip()
+            ts -= offset
+            with cond:
+                if serial in dumping:
+                    dumping[serial] = (ts, time.monotonic())
+                # The reader holding the low watermark must keep pushing, or a full heap never drains
+                while (len(heap) >= self.MAX_BUFFER and not self._stop.is_set()
+                       and not self._holds_watermark(serial)):
+                    cond.wait(0.5)
+                heapq.heappush(heap, (ts, next(self._seq), serial, rest.lstrip()))
+        proc.kill()
+
+    def _low_watermark(self):
+        """Oldest timestamp a still-dumping reader may yet produce; drops readers that caught up. Under _cond."""
+        now, mono = time.time(), time.monotonic()
+        low = math.inf
+        for serial, (ts, read_at) in list(self._dumping.items()):
+            if read_at is not None and (mono - read_at > self.CATCHUP_IDLE
+                                        or ts is not None and ts >= now - self.LATENCY):
+                del self._dumping[serial]  # idle, or reading live lines: the latency watermark covers it
+                continue
+            low = min(low, -math.inf if ts is None else ts)
+        return low
+
+    def _holds_watermark(self, serial):
+        if serial not in self._dumping:
+            return False
+        ts = self._dumping[serial][0]
+        return ts is None or ts <= self._low_watermark()
+
+    def drain(self, limit=2000):
+        """Entries (host_ts, seq, serial, text) that are safe to show, oldest first."""
+        out = []
+        with self._cond:
+            heap = self._heap
+            full = len(heap) >= self.MAX_BUFFER
+            if not full and (self._started is None or time.monotonic() - self._started < self.WARMUP):
+                return out
+            low = self._low_watermark()
+            watermark = min(low, time.time() - self.LATENCY)
+            # A full heap may skip the latency wait, but never pops past a device still dumping
+            while heap and len(out) < limit and (heap[0][0] <= watermark or full and heap[0][0] <= low):
+                out.append(heapq.heappop(heap))
+            if out:
+                self._cond.notify_all()
+        return out
+
+# ==========================================
+# 4g. DEVICE TELEMETRY
+# ==========================================
+class TelemetryRing:
+    """
+    Fixed-capacity columnar ring buffer: one array('d') of timestamps plus
+    one per series, all sharing a write head, so memory per series is
+    constant however long the app runs. Missing readings are stored as NaN.
+    """
+
+    def __init__(self, names, capacity):
+        self.names = tuple(names)
+        self.capacity = capacity
+        self.times = array("d", [math.nan]) * capacity
+        self.columns = {name: array("d", [math.nan]) * capacity for name in self.names}
+        self._head = 0
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def append(self, t, values):
+        i = self._head
+        self.times[i] = t
+        for name, col in self.columns.items():
+            v = values.get(name)
+            col[i] = math.nan if v is None else v
+        self._head = (i + 1) % self.capacity
+        self._len = min(self._len + 1, self.capacity)
+
+    def _ordered(self, col):
+        if self._len < self.capacity:
+            return col[:self._len]
+        return col[self._head:] + col[:self._head]
+
+    def column(self, name):
+        """The series oldest first (an array copy)."""
+        return self._ordered(self.times if name == "time" else self.columns[name])
+
+    def latest(self, name):
+        if not self._len:
+            return None
+        v = self.columns[name][self._head - 1]
+        return None if math.isnan(v) else v
+
+    def downsample(self, name, points):
+        """At most `points` bucket means of the series, NaNs skipped, for sparklines."""
+        vals = [v for v in self.column(name) if not math.isnan(v)]
+        if len(vals) <= points:
+            return vals
+        size = len(vals) / points
+        return [sum(b) / len(b) for b in (vals[int(k * size):int((k + 1) * size)] for k in range(points)) if b]
+
+
+class TelemetryStore:
+    """
+    Per-device history of the dashboard probe (Backend.get_stats). CPU
+    utilisation and network throughput are derived from the deltas between
+    consecutive raw /proc counters. Series can be drawn as sparklines or
+    exported as CSV, a columnar .tcol file (JSON header line followed by
+    each column as raw little-endian float64, the same layout as the icon
+    atlas) or Parquet when pyarrow is installed.
+    """
+    SERIES = ("batt", "temp", "ram", "cpu", "net_rx", "net_tx")
+    UNITS = {"batt": "%", "temp": "°C", "ram": "%", "cpu": "%", "net_rx": " KB/s", "net_tx": " KB/s"}
+
+    def __init__(self, capacity=720):
+        self.capacity = capacity
+        self._rings = {}
+        self._prev = {}  # serial -> (t, stats) of the previous sample
+        self._lock = threading.Lock()
+
+    def record(self, serial, stats, t=None):
+        t = time.time() if t is None else t
+        values = {k: stats.get(k) for k in ("batt", "temp", "ram")}
+        with self._lock:
+            prev_t, prev = self._prev.get(serial, (None, {}))
+            self._prev[serial] = (t, stats)
+            if prev_t is not None and t > prev_t:
+                d_total = stats.get("cpu_total", 0) - prev.get("cpu_total", 0)
+                d_idle = stats.get("cpu_idle", 0) - prev.get("cpu_idle", 0)
+                if "cpu_total" in stats and "cpu_total" in prev and d_total > 0:
+                    values["cpu"] = max(0.0, min(100.0, 100 * (1 - d_idle / d_total)))
+                for key in ("net_rx", "net_tx"):
+                    delta = stats.get(key, -1) - prev.get(key, 0)
+                    if key in stats and key in prev and delta >= 0:  # counters reset on reboot
+                        values[key] = delta / 1024 / (t - prev_t)
+            ring = self._rings.get(serial)
+            if ring is None:
+                ring = self._rings[serial] = TelemetryRing(self.SERIES, self.capacity)
+            ring.append(t, values)
+
+    def latest(self, serial):
+        """Most recent value of every series (None where unknown)."""
+        with self._lock:
+            ring = self._rings.get(serial)
+            return {name: ring.latest(name) if ring else None for name in self.SERIES}
+
+    def sparkline(self, serial, name, points=60):
+        """(downsampled values, latest value) for one series."""
+        with self._lock:
+            ring = self._rings.get(serial)
+            if ring is None:
+                return [], None
+            return ring.downsample(name, points), ring.latest(name)
+
+    def export(self, serial, path):
+        """Write a device's history; the format follows the extension (.csv, .parquet, else .tcol)."""
+        with self._lock:
+            ring = self._rings.get(serial)
+            if ring is None:
+                raise KeyError(f"no telemetry for {serial}")
+            cols = {"time": ring.column("time")}
+            cols.update((name, ring.column(name)) for name in ring.names)
+        path = Path(path)
+        if path.suffix == ".csv":
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                w = csv.writer(f)
+                w.writerow(["time", "iso"] + list(self.SERIES))
+                for i, t in enumerate(cols["time"]):
+                    w.writerow([f"{t:.3f}", datetime.datetime.fromtimestamp(t).isoformat(timespec="seconds")] +
+                               ["" if math.isnan(cols[n][i]) else f"{cols[n][i]:.2f}" for n in self.SERIES])
+        elif path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            pq.write_table(pa.table({k: list(v) for k, v in cols.items()}), str(path))
+        else:
+            header = {"serial": serial, "rows": len(cols["time"]), "dtype": "<f8",
+                      "columns": list(cols), "units": self.UNITS}
+            with open(path, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                for col in cols.values():
+                    if sys.byteorder == "big":
+                        col = array("d", col)
+                        col.byteswap()
+                    f.write(col.tobytes())
+        return path
+
+    def clear(self, serial=None):
+        with self._lock:
+            for d in (self._rings, self._prev):
+                if serial is None:
+                    d.clear()
+                else:
+                    d.pop(serial, None)
+
+
+TELEMETRY = TelemetryStore(CONF.get("telemetry_history", 720))
+
+# ==========================================
+# 4h. PER-APP PROFILER
+# ==========================================
+class AppProfiler:
+    """
+    Samples memory (dumpsys meminfo PSS/RSS and the Java/native/graphics
+    split), CPU and thread count (/proc/<pid>/stat of the main process) for
+    a set of packages. Every sample of every package is one command on the
+    profiler's own persistent ShellSession, so it never queues behind the
+    Shell view and costs no process spawn. Results go into a TelemetryRing
+    per package; summary() gives peak, mean and growth slope per metric.
+    """
+    METRICS = ("pss", "rss", "java", "native", "graphics", "cpu", "threads")
+    UNITS = {"pss": " MB", "rss": " MB", "java": " MB", "native": " MB", "graphics": " MB",
+             "cpu": "%", "threads": ""}
+    SEP = "@@XADB_PKG@@"
+    CLK_TCK = 100  # USER_HZ on every Android kernel
+
+    def __init__(self, serial, packages, interval=2.0, capacity=1800, on_sample=None):
+        self.serial = serial
+        self.packages = list(packages)
+        self.interval = interval
+        self.on_sample = on_sample  # called with (pkg, values) after every sample
+        self.rings = {pkg: TelemetryRing(self.METRICS, capacity) for pkg in self.packages}
+        self._ticks = {}  # pkg -> (time, pid, utime + stime)
+        self._session = ShellSession(serial)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        SCHEDULER.service(self._loop, name=f"profiler {self.serial}")
+
+    def stop(self):
+        self._stop.set()
+        self._session.close()
+
+    @property
+    def running(self):
+        return not self._stop.is_set()
+
+    def _script(self):
+        parts = []
+        for pkg in self.packages:
+            q = shlex.quote(pkg)
+            parts.append(f"echo {self.SEP} {q}; pid=$(pidof -s {q}); echo \"pid $pid\"; "
+                         f"[ -n \"$pid\" ] && cat /proc/$pid/stat && dumpsys meminfo $pid")
+        return "; ".join(parts)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            t0 = time.monotonic()
+            out, code = self._session.run(self._script(), timeout=max(30, self.interval * 5))
+            if self._stop.is_set():
+                break
+            if code is not None:
+                self._ingest(out, time.time())
+            self._stop.wait(max(0.2, self.interval - (time.monotonic() - t0)))
+
+    def _ingest(self, out, t):
+        for block in out.split(self.SEP)[1:]:
+            pkg, _, body = block.strip().partition("\n")
+            if pkg not in self.rings:
+                continue
+            values = self.parse(body)
+            pid = values.pop("pid", None)
+            ticks = values.pop("ticks", None)
+            prev = self._ticks.get(pkg)
+            if ticks is not None:
+                if prev and prev[1] == pid and t > prev[0]:
+                    values["cpu"] = (ticks - prev[2]) / self.CLK_TCK / (t - prev[0]) * 100
+                self._ticks[pkg] = (t, pid, ticks)
+            else:
+                self._ticks.pop(pkg, None)  # not running
+            with self._lock:
+                self.rings[pkg].append(t, values)
+            if self.on_sample:
+                self.on_sample(pkg, values)
+
+    @staticmethod
+    def parse(body):
+        """One package's block: pid line, /proc/<pid>/stat, then dumpsys meminfo."""
+        values = {}
+        m = re.search(r"^pid (\d+)", body, re.M)
+        if not m:
+            return values
+        values["pid"] = int(m.group(1))
+        stat = re.search(r"^\d+ \(.*\) .*$", body, re.M)
+        if stat:
+            fields = stat.group(0)[stat.group(0).rfind(")") + 2:].split()
+            if len(fields) > 17:
+                values["ticks"] = int(fields[11]) + int(fields[12])  # utime + stime
+                values["threads"] = int(fields[17])
+        kb = {}
+        for key, pattern in (("pss", r"TOTAL PSS:\s+(\d+)"), ("rss", r"TOTAL RSS:\s+(\d+)"),
+                             ("java", r"Java Heap:\s+(\d+)"), ("native", r"Native Heap:\s+(\d+)"),
+                             ("graphics", r"Graphics:\s+(\d+)")):
+            m = re.search(pattern, body)
+            if m:
+                kb[key] = int(m.group(1))
+        if "pss" not in kb:
+            m = re.search(r"^\s*TOTAL\s+(\d+)", body, re.M)  # pre-Android 10 table
+            if m:
+                kb["pss"] = int(m.group(1))
+        values.update((k, v / 1024) for k, v in kb.items())
+        return values
+
+    def sparkline(self, pkg, metric, points=60):
+        with self._lock:
+            ring = self.rings[pkg]
+            return ring.downsample(metric, points), ring.latest(metric)
+
+    def summary(self, pkg):
+        """metric -> {"peak", "mean", "slope"} (slope per minute, least squares) over the samples so far."""
+        with self._lock:
+            ring = self.rings[pkg]
+            times = ring.column("time")
+            cols = {m: ring.column(m) for m in self.METRICS}
+        result = {}
+        for metric, col in cols.items():
+            pts = [(t, v) for t, v in zip(times, col) if not math.isnan(v)]
+            if not pts:
+                continue
+            n = len(pts)
+            mean_t = sum(t for t, _ in pts) / n
+            mean_v = sum(v for _, v in pts) / n
+            var = sum((t - mean_t) ** 2 for t, _ in pts)
+            slope = sum((t - mean_t) * (v - mean_v) for t, v in pts) / var * 60 if var else 0.0
+            result[metric] = {"peak": max(v for _, v in pts), "mean": mean_v, "slope": slope}
+        return result
+
+# ==========================================
+# 4i. BATTERY STATS
+# ==========================================
+class BatteryStats:
+    """
+    Streaming parser for `dumpsys batterystats --checkin`. feed() takes one
+    CSV-like line at a time ("9,<uid>,<section>,<record>,..."), keeps only
+    running per-uid totals for the chosen section ("l" since last charge,
+    "u" since unplugged) and never holds the dump itself, so multi-megabyte
+    reports parse in constant memory on a worker thread.
+    """
+    # Well-known system uids; everything else is resolved through the package list
+    SYSTEM_UIDS = {0: "root", 1000: "android (system)", 1001: "radio", 1002: "bluetooth",
+                   1010: "wifi", 1013: "media", 1041: "audioserver", 1047: "cameraserver",
+                   2000: "shell"}
+    COLUMNS = (  # key, heading, unit divisor, format
+        ("power_mah", "Power", 1, "{:.1f} mAh"),
+        ("cpu_ms", "CPU", 1000, "{:.0f} s"),
+        ("wakelock_ms", "Wakelocks", 1000, "{:.0f} s"),
+        ("net_bytes", "Network", 1024 * 1024, "{:.1f} MB"),
+        ("fg_ms", "Screen (fg)", 1000, "{:.0f} s"),
+    )
+
+    def __init__(self, section="l"):
+        self.section = section
+        self.uids = {}          # uid -> totals
+        self.uid_names = {}     # uid -> package, from the dump's own uid/apk records
+        self.power_items = {}   # non-app consumers (screen, cell, idle, ...) -> mAh
+        self.screen_on_ms = 0
+        self.battery_realtime_ms = 0
+        self.discharge = None   # (low %, high %)
+        self.lines = 0
+
+    def _uid(self, uid):
+        row = self.uids.get(uid)
+        if row is None:
+            row = self.uids[uid] = {"power_mah": 0.0, "cpu_ms": 0, "wakelock_ms": 0,
+                                    "wakelock_count": 0, "net_bytes": 0, "fg_ms": 0}
+        return row
+
+    def feed(self, line):
+        self.lines += 1
+        parts = line.rstrip().split(",")
+        if len(parts) < 5:
+            return
+        try:
+            uid = int(parts[1])
+        except ValueError:
+            return
+        section, rec = parts[2], parts[3]
+        try:
+            if section == "i":
+                if rec == "uid" and len(parts) > 5:
+                    self.uid_names.setdefault(int(parts[4]), parts[5])
+                return
+            if section != self.section:
+                return
+            if rec == "apk" and len(parts) > 5:
+                self.uid_names.setdefault(uid, parts[5])
+            elif rec == "wl" and "p" in parts[5:-1]:
+                # Each timer group is time,type,count[,current,max,duration] depending on the
+                # release, so locate the partial ("p") group by its marker, not by position
+                i = parts.index("p", 5)
+                row = self._uid(uid)
+                row["wakelock_ms"] += int(parts[i - 1])
+                row["wakelock_count"] += int(parts[i + 1])
+            elif rec == "cpu":
+                self._uid(uid)["cpu_ms"] += int(parts[4]) + int(parts[5])
+            elif rec == "nt" and len(parts) > 7:
+                self._uid(uid)["net_bytes"] += sum(int(x) for x in parts[4:8])
+            elif rec == "fg":
+                self._uid(uid)["fg_ms"] += int(parts[4])
+            elif rec == "pwi" and len(parts) > 5:
+                if parts[4] == "uid":
+                    self._uid(uid)["power_mah"] += float(parts[5])
+                else:
+                    self.power_items[parts[4]] = self.power_items.get(parts[4], 0.0) + float(parts[5])
+            elif rec == "m" and uid == 0:
+                self.screen_on_ms = int(parts[4])
+            elif rec == "bt" and uid == 0 and len(parts) > 5:
+                self.battery_realtime_ms = int(parts[5])
+            elif rec == "dc" and uid == 0 and len(parts) > 5:
+                self.discharge = (int(parts[4]), int(parts[5]))
+        except (ValueError, IndexError):
+            pass  # truncated or newer-format record
+
+    def name(self, uid, packages=None):
+        """Package (or system name) for a uid, preferring the device's package list."""
+        app_id = uid % 100000
+        pkgs = (packages or {}).get(app_id)
+        if pkgs:
+            return pkgs[0] if len(pkgs) == 1 else f"{pkgs[0]} (+{len(pkgs) - 1} shared)"
+        return self.uid_names.get(uid) or self.SYSTEM_UIDS.get(app_id) or f"uid {uid}"
+
+    def rank(self, key="power_mah", top=25, packages=None):
+        """[(name, uid, totals)] with the biggest `key` first."""
+        rows = sorted(self.uids.items(), key=lambda kv: kv[1][key], reverse=True)
+        return [(self.name(uid, packages), uid, row) for uid, row in rows[:top] if row[key] > 0]
+
+# ==========================================
+# 4j. PROCESS MONITOR
+# ==========================================
+class ProcessMonitor:
+    """
+    Live process table for one device, fed by a single long-running
+    `top` in batch mode. Output is parsed line by line as it streams in;
+    each header line closes the previous frame, which is passed to
+    on_frame as {pid: row}. Toybox top (Oreo+) is asked for exactly the
+    columns we need; older toolbox top is parsed from its own header.
+    """
+    COMMAND = "top -b -d {d} -o PID,USER,S,%CPU,RES,NAME 2>/dev/null || top -d {d}"
+    # header spellings across toybox/toolbox -> row key
+    HEADERS = {"PID": "pid", "USER": "user", "UID": "user", "S": "state", "%CPU": "cpu", "CPU%": "cpu",
+               "RES": "rss", "RSS": "rss", "NAME": "name", "Name": "name", "ARGS": "name", "CMD": "name"}
+
+    def __init__(self, serial, interval=2, on_frame=None):
+        self.serial = serial
+        self.interval = interval
+        self.on_frame = on_frame
+        self._cols = None
+        self._rows = {}
+        self._stop = threading.Event()
+        self._stop.set()
+
+    @property
+    def running(self):
+        return not self._stop.is_set()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop = threading.Event()
+        self._cols, self._rows = None, {}
+        SCHEDULER.service(self._run, self._stop, name=f"top {self.serial}")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, stop):
+        cmd = self.COMMAND.format(d=self.interval)
+        Backend.run_live([ADB_PATH, "-s", self.serial, "shell", cmd], self.feed, cancel=stop)
+
+    def feed(self, line):
+        tokens = line.replace("S[%CPU]", "S %CPU").split()
+        if "PID" in tokens and tokens[-1] in self.HEADERS and self.HEADERS[tokens[-1]] == "name":
+            self._flush()
+            self._cols = [self.HEADERS.get(t) for t in tokens]
+            return
+        if not self._cols or not tokens or not tokens[0].isdigit():
+            return
+        n = len(self._cols)
+        # The name is always last; toolbox leaves some columns (PCY) blank, so fewer tokens is fine
+        head, name = (tokens[:n - 1], " ".join(tokens[n - 1:])) if len(tokens) >= n else (tokens[:-1], tokens[-1])
+        row = {"name": name}
+        for key, val in zip(self._cols, head):
+            if key and key != "name":
+                row[key] = val
+        try:
+            row["pid"] = int(row["pid"])
+            row["cpu"] = float(row.get("cpu", "0").rstrip("%"))
+            row["rss"] = self.parse_kb(row.get("rss", "0"))
+        except (KeyError, ValueError):
+            return
+        row.setdefault("state", "?")
+        row.setdefault("user", "")
+        self._rows[row["pid"]] = row
+
+    def _flush(self):
+        rows, self._rows = self._rows, {}
+        if rows and self.on_frame:
+            self.on_frame(rows)
+
+    @staticmethod
+    def parse_kb(text):
+        """'12M', '1.5G', '880K' or plain kilobytes -> KB."""
+        text = text.strip().upper()
+        mult = {"K": 1, "M": 1024, "G": 1024 * 1024, "T": 1024 ** 3}.get(text[-1:], None)
+        return float(text[:-1]) * mult if mult else float(text)
+
+# ==========================================
+# 6. HEADLESS CLI
+# ==========================================
+class Headless:
+    """
+    `python xadb.py --headless <command>`: the GUI's backend calls without
+    the GUI, for CI and batch jobs. Device commands run on every matching
+    device in parallel unless -s narrows them down; output lines are
+    prefixed with the serial when more than one device is involved. The
+    exit code is 0 only if every device succeeded.
+    """
+
+    def __init__(self, out=None):
+        self.bk = Backend()
+        self.out = out or sys.stdout
+        self.stop = threading.Event()  # set by Ctrl+C or a logcat --duration
+        self._lock = threading.Lock()
+        self._prefix = False
+
+    def emit(self, serial, line):
+        with self._lock:
+            print(f"[{serial}] {line}" if self._prefix and serial else line, file=self.out, flush=True)
+
+    def targets(self, serials, mode="ADB"):
+        """Clean serials of the attached devices in `mode`, limited to `serials` when given."""
+        found = [d.split()[0] for d in self.bk.get_devices() if d.endswith(f"({mode})")]
+        if serials:
+            missing = [s for s in serials if s not in found]
+            for s in missing:
+                print(f"[ERROR] {s} is not attached in {mode} mode", file=sys.stderr)
+            found = [s for s in serials if s in found]
+        return found
+
+    def fan_out(self, serials, fn):
+        """
+        Run fn(serial, stop) -> bool for every serial at once. Each device
+        gets a service thread rather than a pool worker, since a logcat
+        stream can hold it indefinitely. Ctrl+C sets `stop` for all of them.
+        """
+        self._prefix = len(serials) > 1
+        results = {}
+
+        def _job(serial):
+            try:
+                results[serial] = bool(fn(serial, self.stop))
+            except Exception as e:
+                self.emit(serial, f"[ERROR] {e}")
+                results[serial] = False
+        threads = [SCHEDULER.service(_job, s, name=f"{fn.__name__} {s}") for s in serials]
+        try:
+            for t in threads:
+                while t.is_alive():
+                    t.join(0.5)  # short waits keep Ctrl+C responsive
+        except KeyboardInterrupt:
+            self.stop.set()
+            for t in threads:
+                t.join(5)  # let run_live reap the adb children
+            return 130
+        return 0 if all(results.get(s) for s in serials) else 1
+
+    def _adb(self, op, serial, stop, cmd, tool=None, **extra):
+        """Stream one adb (or fastboot) command, logging it like the GUI does; True on success."""
+        failed = [False]
+
+        def _line(l):
+            if l.startswith(("Failure", "adb: error", "[ERROR]", "FAILED")):
+                failed[0] = True
+            self.emit(serial, l)
+        with ACTION_LOG.timed(op, serial, **extra) as rec:
+            code = Backend.run_live([tool or ADB_PATH, "-s", serial] + cmd, _line, cancel=stop)
+            if code is None and stop.is_set():
+                rec["result"] = "cancelled"
+            elif code or failed[0]:
+                rec.update(result="error", code=code)
+        return rec["result"] == "ok"
+
+    # ── commands ──
+    def devices(self, a):
+        devices = self.bk.get_devices()
+        problems = sorted(getattr(self.bk, "_problem_serials", ()))
+        if a.json:
+            rows = [{"serial": d.split()[0], "mode": d.split()[-1].strip("()")} for d in devices]
+            rows += [{"serial": s, "mode": "UNAVAILABLE"} for s in problems]
+            print(json.dumps(rows, indent=2), file=self.out)
+        else:
+            for d in devices:
+                serial, mode = d.split()[0], d.split()[-1].strip("()")
+                print(f"{serial}\t{mode}", file=self.out)
+            for s in problems:
+                print(f"{s}\tUNAVAILABLE (unauthorized or offline)", file=self.out)
+        return 0
+
+    def stats(self, a):
+        serials = self.targets(a.serial)
+        if not serials:
+            return 2
+        # Two probes `interval` apart: CPU and network are rates over that window
+        store = TelemetryStore(capacity=2)
+        results = {}
+
+        def _sample(serial, stop):
+            first = self.bk.get_stats(f"{serial} (ADB)")
+            store.record(serial, first)
+            if stop.wait(a.interval):
+                return False
+            store.record(serial, self.bk.get_stats(f"{serial} (ADB)"))
+            model, android = self.bk.get_device_info(f"{serial} (ADB)")
+            results[serial] = dict(store.latest(serial), model=model, android=android)
+            return bool(first)
+
+        code = self.fan_out(serials, _sample)
+        if a.json:
+            print(json.dumps(results, indent=2), file=self.out)
+            return code
+        for serial, row in results.items():
+            vals = "  ".join(f"{k} {row[k]:.1f}{TelemetryStore.UNITS[k]}" for k in TelemetryStore.SERIES
+                             if row.get(k) is not None)
+            print(f"{serial}  {row['model']} (Android {row['android']})  {vals}", file=self.out)
+        return code
+
+    def install(self, a):
+        serials = self.targets(a.serial)
+        if not serials:
+            return 2
+        flags = ["-r"] if a.replace else []
+        flags += ["-g"] if a.grant else []
+
+        def install(serial, stop):
+            ok = True
+            for apk in a.apks:
+                if stop.is_set():
+                    return False
+                self.emit(serial, f"Installing {os.path.basename(apk)}")
+                ok = self._adb("install", serial, stop, ["install"] + flags + [apk], apk=apk) and ok
+            return ok
+        return self.fan_out(serials, install)
+
+    def uninstall(self, a):
+        serials = self.targets(a.serial)
+        if not serials:
+            return 2
+
+        def uninstall(serial, stop):
+            ok = True
+            for pkg in a.packages:
+                args = ["uninstall", "-k", pkg] if a.keep_data else ["uninstall", pkg]
+                ok = self._adb("uninstall", serial, stop, args, package=pkg) and ok
+            return ok
+        return self.fan_out(serials, uninstall)
+
+    def push(self, a):
+        serials = self.targets(a.serial)
+        if not serials:
+            return 2
+
+        def push(serial, stop):
+            return self._adb("push", serial, stop, ["push", a.local, a.remote], src=a.local, dest=a.remote)
+        return self.fan_out(serials, push)
+
+    def pull(self, a):
+        serials = self.targets(a.serial)
+        if not serials:
+            return 2
+
+        def pull(serial, stop):
+            # Several devices pulling into one place would clobber each other
+            dest = os.path.join(a.local, serial) if len(serials) > 1 else a.local
+            if len(serials) > 1:
+                os.makedirs(dest, exist_ok=True)
+            return self._adb("pull", serial, stop, ["pull", a.remote, dest], src=a.remote, dest=dest)
+        return self.fan_out(serials, pull)
+
+    def logcat(self, a):
+        serials = self.targets(a.serial)
+        if not serials:
+            return 2
+        if a.output:
+            os.makedirs(a.output, exist_ok=True)
+        args = ["logcat", "-v", "threadtime"] + (["-d"] if a.dump else []) + list(a.filters)
+        if a.duration:
+            SCHEDULER.submit(self.stop.set, delay=a.duration, name="logcat --duration")
+
+        def logcat(serial, stop):
+            if a.clear:
+                Backend.run([ADB_PATH, "-s", serial, "logcat", "-c"])
+            fh = None
+            if a.output:
+                name = re.sub(r"[^\w.-]", "_", serial) + datetime.datetime.now().strftime("_%Y%m%d_%H%M%S.log")
+                fh = open(os.path.join(a.output, name), "w", encoding="utf-8")
+            try:
+                with ACTION_LOG.timed("logcat", serial, dump=a.dump) as rec:
+                    code = Backend.run_live([ADB_PATH, "-s", serial] + args,
+                                            (lambda l: fh.write(l + "\n")) if fh else
+                                            (lambda l: self.emit(serial, l)),
+                                            cancel=stop)
+                    if code:
+                        rec.update(result="error", code=code)
+            finally:
+                if fh:
+                    fh.close()
+                    self.emit(serial, f"Saved {fh.name}")
+            # Running out the --duration clock is the normal way for a capture to end
+            return code == 0 or (code is None and stop.is_set())
+        return self.fan_out(serials, logcat)
+
+    def flash(self, a):
+        serials = self.targets(a.serial, mode="FASTBOOT")
+        if not serials:
+            return 2
+
+        def flash(serial, stop):
+            cmd = ["flash", a.partition, a.image]
+            ok = self._adb("fastboot", serial, stop, cmd, tool=FASTBOOT_PATH, args=cmd)
+            if ok and a.reboot:
+                ok = self._adb("fastboot", serial, stop, ["reboot"], tool=FASTBOOT_PATH, args=["reboot"])
+            return ok
+        return self.fan_out(serials, flash)
+
+
+def headless_main(argv=None):
+    """Parse `argv` (without --headless) and run one headless command; returns the exit code."""
+    global ADB_PATH, FASTBOOT_PATH
+    parser = argparse.ArgumentParser(prog="xadb.py --headless", description=f"{APP_NAME} without the GUI.")
+    parser.add_argument("--adb", help="adb executable (default: the GUI's setting, else adb on PATH)")
+    parser.add_argument("--fastboot", help="fastboot executable")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serial = argparse.ArgumentParser(add_help=False)
+    serial.add_argument("-s", "--serial", action="append",
+                        help="target device (repeatable); default: every attached device")
+
+    p = sub.add_parser("devices", help="list attached devices")
+    p.add_argument("--json", action="store_true")
+    p = sub.add_parser("stats", parents=[serial], help="battery, temperature, RAM, CPU and network")
+    p.add_argument("--interval", type=float, default=1.0, help="seconds between the two CPU/network probes")
+    p.add_argument("--json", action="store_true")
+    p = sub.add_parser("install", parents=[serial], help="install APKs on every target device")
+    p.add_argument("apks", nargs="+")
+    p.add_argument("-r", "--replace", action="store_true", help="reinstall, keeping data")
+    p.add_argument("-g", "--grant", action="store_true", help="grant all runtime permissions")
+    p = sub.add_parser("uninstall", parents=[serial], help="uninstall packages")
+    p.add_argument("packages", nargs="+")
+    p.add_argument("-k", "--keep-data", action="store_true")
+    p = sub.add_parser("push", parents=[serial], help="copy a local file or folder to the device")
+    p.add_argument("local")
+    p.add_argument("remote")
+    p = sub.add_parser("pull", parents=[serial], help="copy a device path to the computer")
+    p.add_argument("remote")
+    p.add_argument("local", nargs="?", default=".")
+    p = sub.add_parser("logcat", parents=[serial], help="capture logcat to stdout or files")
+    p.add_argument("filters", nargs="*", help="logcat filterspecs, e.g. ActivityManager:I *:S")
+    p.add_argument("-o", "--output", help="directory for one <serial>_<time>.log per device")
+    p.add_argument("-t", "--duration", type=float, help="stop after this many seconds")
+    p.add_argument("-d", "--dump", action="store_true", help="dump the current buffer and exit")
+    p.add_argument("-c", "--clear", action="store_true", help="clear the buffer first")
+    p = sub.add_parser("flash", parents=[serial], help="fastboot flash an image")
+    p.add_argument("partition")
+    p.add_argument("image")
+    p.add_argument("--reboot", action="store_true", help="reboot once flashed")
+
+    a = parser.parse_args(argv)
+    if a.adb:
+        ADB_PATH = a.adb
+    if a.fastboot:
+        FASTBOOT_PATH = a.fastboot
+    return getattr(Headless(), a.command)(a)
+
+
+if __name__ == "__main__":
+    sys.exit(headless_main())
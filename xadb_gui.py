@@ -0,0 +1,4539 @@
+import time
+_STARTUP_T0 = time.perf_counter()
+import sys
+import customtkinter as ctk
+import subprocess
+import threading
+import os
+import re
+import json
+import datetime
+import queue
+import shlex
+import posixpath
+import shutil
+import zlib
+import xadb_core
+from tkinter import filedialog, Canvas, TclError
+from PIL import Image
+from pathlib import Path
+from collections import deque
+from xadb_core import (APP_NAME, CONF, save_config, ACTION_LOG, log_action, StartupTimeline,
+                       check_for_updates, FASTBOOT_PATH, SCRCPY_PATH, TaskScheduler, SCHEDULER,
+                       Backend, ROOT_POOL, LOG_LEVELS, LogcatRecorder, LogcatArchive, LogRateStats,
+                       CrashWatcher, MergedLogcat, TelemetryStore, TELEMETRY, AppProfiler,
+                       BatteryStats, ProcessMonitor)
+
+
+# ==========================================
+# SPLASH SCREEN
+# ==========================================
+class SplashScreen:
+    def __init__(self):
+        self.bk = Backend()
+        self.root = ctk.CTk()
+        self.root.overrideredirect(True)
+        self.root.attributes("-topmost", True)
+
+        self.photo = ASSETS.image("splash.png")
+        w, h = self.photo.cget("size")
+
+        sw = self.root.winfo_screenwidth()
+        sh = self.root.winfo_screenheight()
+        x = (sw - w) // 2
+        y = (sh - h) // 2
+        self.root.geometry(f"{w}x{h}+{x}+{y}")
+
+        ctk.CTkLabel(self.root, image=self.photo, text="").pack()
+        self.root.update()
+
+    def close(self):
+        self.root.withdraw()
+
+STARTUP = StartupTimeline(_STARTUP_T0, "--profile-startup" in sys.argv)
+STARTUP.mark("imports")
+
+ctk.set_appearance_mode(CONF["theme"])
+ctk.set_default_color_theme("dark-blue")
+STARTUP.mark("config")
+
+# ==========================================
+# 2. PALETTE
+# ==========================================
+C = {
+    "bg_root": ("#F0F2F5", "#090909"),
+    "bg_sidebar": ("#FFFFFF", "#111111"),
+    "bg_surface": ("#FFFFFF", "#1C1C1C"),
+    "bg_hover": ("#E0E0E0", "#2D2D2D"),
+    "input_bg": ("#E8E8E8", "#252525"),
+    "primary": "#3B8ED0",
+    "success": "#00C853",
+    "warning": "#FFAB00",
+    "danger": "#D50000",
+    "text_main": ("#1A1A1A", "#FFFFFF"),
+    "text_sub": ("#555555", "#999999"),
+    "btn_active": ("#E0E0E0", "#252525"),
+    "term_bg": ("#FFFFFF", "#000000"),
+    "term_fg": ("#000000", "#00FF00"),
+}
+
+
+# Cross-platform font fallbacks
+if sys.platform == "darwin":
+    F_UI   = "Helvetica Neue"
+    F_MONO = "Menlo"
+elif os.name == "nt":
+    F_UI   = "Segoe UI"
+    F_MONO = "Consolas"
+else:  # Linux
+    F_UI   = "DejaVu Sans"
+    F_MONO = "DejaVu Sans Mono"
+
+RIGHT_CLICK = "<Button-2>" if sys.platform == "darwin" else "<Button-3>"
+
+# ==========================================
+# 2b. SHARED ASSETS
+# ==========================================
+APP_DIR = Path(__file__).resolve().parent
+
+
+class AssetCache:
+    """
+    Process-wide image cache. Assets resolve next to the program (falling
+    back to the CWD), each file is decoded once, and one CTkImage per
+    (name, size, dark variant) is shared by every widget that shows it.
+    If menu_icons/icons.atlas exists (see bake_atlas), icons are read from it
+    as raw RGBA instead of decoding each PNG.
+    """
+    ATLAS = "menu_icons/icons.atlas"
+
+    def __init__(self, root=APP_DIR):
+        self.root = Path(root)
+        self._decoded = {}  # name -> PIL image or None
+        self._images = {}   # (name, size, dark) -> CTkImage or None
+        self._atlas = None
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        p = self.root / name
+        return p if p.exists() or Path(name).is_absolute() else Path(name)
+
+    def pil(self, name):
+        """Decoded PIL image for an asset path such as "splash.png" (None if missing)."""
+        with self._lock:
+            if name in self._decoded:
+                return self._decoded[name]
+            img = self._from_atlas(name)
+            if img is None:
+                try:
+                    img = Image.open(self.path(name))
+                    img.load()
+                except Exception:
+                    img = None
+            self._decoded[name] = img
+            return img
+
+    def image(self, name, size=None, dark=None):
+        """Shared CTkImage for `name` (and an optional dark-mode asset), or None if missing."""
+        key = (name, size, dark)
+        if key in self._images:
+            return self._images[key]
+        light = self.pil(name)
+        img = None
+        if light is not None:
+            dark_img = self.pil(dark) if dark else None
+            img = ctk.CTkImage(light_image=light, dark_image=dark_img or light,
+                               size=size or light.size)
+        self._images[key] = img
+        return img
+
+    def icon(self, name, size):
+        return self.image(f"menu_icons/{name}.png", (size, size))
+
+    # ── Atlas ──────────────────────────────────────────────────────────────
+    def _from_atlas(self, name):
+        if self._atlas is None:
+            self._atlas = self._load_atlas()
+        entry = self._atlas[0].get(name)
+        if not entry:
+            return None
+        w, h, offset, mtime = entry
+        try:
+            if int(self.path(name).stat().st_mtime) != mtime:
+                return None  # PNG changed since the atlas was baked
+        except OSError:
+            pass
+        data = self._atlas[1][offset:offset + w * h * 4]
+        return Image.frombytes("RGBA", (w, h), data)
+
+    def _load_atlas(self):
+        try:
+            with open(self.root / self.ATLAS, "rb") as f:
+                header = json.loads(f.readline())
+                return header, f.read()
+        except Exception:
+            return {}, b""
+
+    def bake_atlas(self, names=None):
+        """Write every menu icon (or `names`) into one raw RGBA atlas; returns its path."""
+        if names is None:
+            names = sorted(f"menu_icons/{p.name}" for p in (self.root / "menu_icons").glob("*.png"))
+        header, blobs, offset = {}, [], 0
+        for name in names:
+            try:
+                img = Image.open(self.root / name).convert("RGBA")
+            except Exception:
+                continue
+            raw = img.tobytes()
+            header[name] = [img.width, img.height, offset, int((self.root / name).stat().st_mtime)]
+            blobs.append(raw)
+            offset += len(raw)
+        out = self.root / self.ATLAS
+        with open(out, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            f.writelines(blobs)
+        self._atlas = None
+        return out
+
+
+ASSETS = AssetCache()
+
+# ==========================================
+# 3. CUSTOM WIDGETS
+# ==========================================
+class FluentButton(ctk.CTkButton):
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.default_color = kwargs.get("fg_color", "transparent")
+        self.default_text_color = kwargs.get("text_color", C["text_sub"])
+
+
+    def set_active(self, is_active):
+        if is_active:
+            self.configure(fg_color=C["btn_active"], text_color=C["primary"])
+        else:
+            self.configure(fg_color=self.default_color, text_color=self.default_text_color)
+
+class RadialProgress(ctk.CTkFrame):
+    """
+    Ring gauge. The canvas items are created once and only moved or
+    recoloured afterwards; set() ignores changes smaller than EPSILON and,
+    with animate=True, eases toward the new value at up to FPS frames a
+    second. set() may be called from any thread.
+    """
+    EPSILON = 0.5  # percent
+    FPS = 30
+
+    def __init__(self, master, title="Usage", size=120, color=C["primary"], animate=True, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.size = size
+        self.color = color
+        self.animate = animate
+        self.percentage = 0
+        self._target = 0
+        self._anim_job = None
+        self._mode = None  # appearance mode the colours were last applied for
+        dark = ctk.get_appearance_mode() == "Dark"
+        initial_bg = "#1C1C1C" if dark else "#FFFFFF"
+        self.canvas = Canvas(self, width=size, height=size, highlightthickness=0, bg=initial_bg)
+        self.canvas.pack()
+        self.label = ctk.CTkLabel(self, text="0%", font=(F_UI, 18, "bold"), text_color=C["text_main"])
+        self.label.place(relx=0.5, rely=0.4, anchor="center")
+        self._label_text = "0%"
+        ctk.CTkLabel(self, text=title, font=(F_UI, 12), text_color=C["text_sub"]).pack(pady=5)
+        x, y, r = size / 2, size / 2, (size / 2) - 8
+        self._track = self.canvas.create_oval(x - r, y - r, x + r, y + r, width=8,
+                                              outline="#333333" if dark else "#E0E0E0")
+        self._arc = self.canvas.create_arc(x - r, y - r, x + r, y + r, start=90, extent=0, style="arc",
+                                           outline=self.color, width=8, state="hidden")
+        self.bind("<Configure>", self.update_bg)
+
+    def update_bg(self, event=None):
+        mode = ctk.get_appearance_mode()
+        if mode == self._mode:
+            return
+        self._mode = mode
+        bg = "#FFFFFF" if mode == "Light" else "#1C1C1C"
+        self.canvas.configure(bg=bg)
+        self.label.configure(bg_color=bg)
+        self.canvas.itemconfigure(self._track, outline="#333333" if mode == "Dark" else "#E0E0E0")
+
+    def draw(self):
+        """Bring the arc and label in line with self.percentage."""
+        if self.percentage > 0:
+            self.canvas.itemconfigure(self._arc, extent=-(360 * (self.percentage / 100)), state="normal")
+        else:
+            self.canvas.itemconfigure(self._arc, state="hidden")
+        text = f"{int(round(self.percentage))}%"
+        if text != self._label_text:
+            self._label_text = text
+            self.label.configure(text=text)
+
+    def set(self, val):
+        if threading.current_thread() is not threading.main_thread():
+            UI.post(self, self.set, val)
+            return
+        val = max(0, min(val, 100))
+        if abs(val - self._target) < self.EPSILON:
+            return
+        self._target = val
+        if not self.animate:
+            self.percentage = val
+            self.draw()
+        elif self._anim_job is None:
+            self._step()
+
+    def _step(self):
+        # Ease a third of the remaining distance per frame, snapping once it's close
+        gap = self._target - self.percentage
+        self.percentage = self._target if abs(gap) < self.EPSILON else self.percentage + gap / 3
+        self.draw()
+        self._anim_job = (self.after(1000 // self.FPS, self._step)
+                          if self.percentage != self._target else None)
+
+    def destroy(self):
+        if self._anim_job is not None:
+            self.after_cancel(self._anim_job)
+            self._anim_job = None
+        super().destroy()
+
+class Sparkline(ctk.CTkFrame):
+    """Small history line for one telemetry series. set() takes already-downsampled points."""
+    def __init__(self, master, title, unit="", color=C["primary"], width=200, height=40, points=60, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.unit = unit
+        self.points = points
+        self._w, self._h = width, height
+        self._values = None
+        head = ctk.CTkFrame(self, fg_color="transparent")
+        head.pack(fill="x")
+        ctk.CTkLabel(head, text=title, font=(F_UI, 11), text_color=C["text_sub"]).pack(side="left")
+        self.value_lbl = ctk.CTkLabel(head, text="–", font=(F_UI, 11, "bold"), text_color=C["text_main"])
+        self.value_lbl.pack(side="right")
+        self._mode = None
+        self.canvas = Canvas(self, width=width, height=height, highlightthickness=0,
+                             bg=C["bg_surface"][ctk.get_appearance_mode() == "Dark"])
+        self.canvas.pack(fill="x")
+        self._line = self.canvas.create_line(0, 0, 0, 0, fill=color, width=2, state="hidden")
+        self.bind("<Configure>", self.update_bg)
+
+    def update_bg(self, event=None):
+        mode = ctk.get_appearance_mode()
+        if mode != self._mode:
+            self._mode = mode
+            self.canvas.configure(bg=C["bg_surface"][mode == "Dark"])
+
+    def set(self, values, latest=None):
+        """Redraw with `values` (oldest first); `latest` is shown as the current reading."""
+        text = "–" if latest is None else f"{latest:.1f}{self.unit}"
+        if text != self.value_lbl.cget("text"):
+            self.value_lbl.configure(text=text)
+        if values == self._values:
+            return
+        self._values = values
+        if len(values) < 2:
+            self.canvas.itemconfigure(self._line, state="hidden")
+            return
+        lo, hi = min(values), max(values)
+        span = (hi - lo) or 1.0
+        w, h, pad = self.canvas.winfo_width() or self._w, self._h, 3
+        if w <= 1:
+            w = self._w
+        step = (w - 2 * pad) / (len(values) - 1)
+        coords = []
+        for i, v in enumerate(values):
+            coords += (pad + i * step, h - pad - (v - lo) / span * (h - 2 * pad))
+        self.canvas.coords(self._line, *coords)
+        self.canvas.itemconfigure(self._line, state="normal")
+
+class DeviceTile(ctk.CTkFrame):
+    """Compact live tile for one device in the Fleet grid. set() only reconfigures labels whose text changed."""
+    FIELDS = (("batt", "Batt", "%"), ("temp", "Temp", "°C"), ("ram", "RAM", "%"), ("cpu", "CPU", "%"))
+    STATE_COLORS = {"online": C["success"], "idle": C["text_sub"], "no response": C["danger"]}
+
+    def __init__(self, master, serial, command=None, **kwargs):
+        super().__init__(master, fg_color=C["bg_surface"], corner_radius=12, **kwargs)
+        self.serial = serial
+        head = ctk.CTkFrame(self, fg_color="transparent")
+        head.pack(fill="x", padx=12, pady=(10, 4))
+        self.title_lbl = ctk.CTkLabel(head, text=serial, font=(F_UI, 13, "bold"), text_color=C["text_main"])
+        self.title_lbl.pack(side="left")
+        self.state_lbl = ctk.CTkLabel(head, text="…", font=(F_UI, 11), text_color=C["text_sub"])
+        self.state_lbl.pack(side="right")
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="x", padx=12)
+        self.value_lbls = {}
+        for i, (key, name, _) in enumerate(self.FIELDS):
+            ctk.CTkLabel(body, text=name, font=(F_UI, 10), text_color=C["text_sub"]).grid(row=0, column=i, sticky="w")
+            lbl = ctk.CTkLabel(body, text="–", font=(F_MONO, 13, "bold"), text_color=C["text_main"])
+            lbl.grid(row=1, column=i, sticky="w")
+            body.grid_columnconfigure(i, weight=1)
+            self.value_lbls[key] = lbl
+        self.rate_lbl = ctk.CTkLabel(self, text="", font=(F_UI, 10), text_color=C["text_sub"])
+        self.rate_lbl.pack(anchor="w", padx=12, pady=(0, 8))
+        if command:
+            for w in (self, head, body, self.title_lbl, self.state_lbl, self.rate_lbl, *self.value_lbls.values()):
+                w.bind("<Button-1>", lambda e: command(serial))
+
+    @staticmethod
+    def _set_text(lbl, text, **kw):
+        if lbl.cget("text") != text:
+            lbl.configure(text=text, **kw)
+
+    def set(self, values=None, state=None, interval=None, title=None):
+        if title:
+            self._set_text(self.title_lbl, title)
+        if state:
+            self._set_text(self.state_lbl, state, text_color=self.STATE_COLORS.get(state, C["warning"]))
+        for key, _, unit in self.FIELDS:
+            v = (values or {}).get(key)
+            if values is not None:
+                self._set_text(self.value_lbls[key], "–" if v is None else f"{v:.0f}{unit}")
+        if interval:
+            self._set_text(self.rate_lbl, f"sampled every {interval:.0f}s")
+
+class LogConsole(ctk.CTkFrame):
+    """Read-only terminal box for displaying command output"""
+    def __init__(self, master, height=150, **kwargs):
+        super().__init__(master, fg_color=C["bg_surface"], corner_radius=10, **kwargs)
+        self.pack_propagate(False)
+        self.configure(height=height)
+
+        # Header
+        header = ctk.CTkFrame(self, height=25, fg_color="transparent")
+        header.pack(fill="x", padx=5, pady=2)
+        ctk.CTkLabel(header, text="> Terminal Output", font=(F_MONO, 11, "bold"), text_color=C["text_sub"]).pack(side="left")
+        ctk.CTkButton(header, text="Clear", width=50, height=20, fg_color=C["input_bg"], text_color=C["text_main"],
+                      font=(F_UI, 10), command=self.clear).pack(side="right")
+
+        # Text Area
+        self.text_area = ctk.CTkTextbox(
+            self,
+            font=(F_MONO, 12),
+            fg_color=C["term_bg"],
+            text_color=C["term_fg"],
+            activate_scrollbars=True
+        )
+        self.text_area.pack(fill="both", expand=True, padx=5, pady=(0, 5))
+        self.text_area.configure(state="disabled")
+        self._pending = []
+        self._pending_lock = threading.Lock()
+
+    def log(self, message):
+        """Append a timestamped line. Safe from any thread; lines are written in one batch per UI frame."""
+        ts = datetime.datetime.now().strftime("%H:%M:%S")
+        with self._pending_lock:
+            self._pending.append(f"[{ts}] {message}\n")
+        UI.post(self, self._flush_pending)
+
+    def _flush_pending(self):
+        with self._pending_lock:
+            text = "".join(self._pending)
+            self._pending.clear()
+        if not text:
+            return
+        self.text_area.configure(state="normal")
+        self.text_area.insert("end", text)
+        self.text_area.see("end")
+        self.text_area.configure(state="disabled")
+
+    def clear(self):
+        self.text_area.configure(state="normal")
+        self.text_area.delete("1.0", "end")
+        self.text_area.configure(state="disabled")
+
+# ==========================================
+# 3b. CUSTOM DIALOG (replaces CTkMessagebox)
+# ==========================================
+class CustomDialog:
+    """
+    Native CTk modal dialog — works reliably in compiled (Nuitka/PyInstaller) apps.
+
+    Usage:
+        # Info / alert (one button):
+        CustomDialog(parent, title="Done", message="All finished!", icon="info")
+
+        # Confirm (two buttons) — call .get() to get the chosen label:
+        dlg = CustomDialog(parent, title="Confirm", message="Delete?",
+                           icon="warning", option_1="Yes", option_2="Cancel")
+        if dlg.get() == "Yes":
+            ...
+    """
+    _ICON_COLORS = {
+        "info":    "#3B8ED0",
+        "check":   "#00C853",
+        "warning": "#FFAB00",
+        "cancel":  "#D50000",
+    }
+    _ICON_LABELS = {
+        "info":    "ℹ",
+        "check":   "✔",
+        "warning": "⚠",
+        "cancel":  "✖",
+    }
+
+    def __init__(self, parent, title="", message="", icon="info",
+                 option_1="Ok", option_2=None, option_3=None, width=420, height=None):
+        self._result = None
+
+        lines    = message.count("\n") + 1
+        approx_h = 140 + lines * 22 + (50 if any([option_2, option_3]) else 0)
+        height   = height or max(170, approx_h)
+
+        dlg = ctk.CTkToplevel(parent)
+        dlg.title(title)
+        dlg.resizable(False, False)
+        dlg.attributes("-topmost", True)
+        dlg.grab_set()
+        self._dlg = dlg
+
+        parent.update_idletasks()
+        px, py = parent.winfo_x(), parent.winfo_y()
+        pw, ph = parent.winfo_width(), parent.winfo_height()
+        x = px + (pw - width)  // 2
+        y = py + (ph - height) // 2
+        dlg.geometry(f"{width}x{height}+{x}+{y}")
+
+        accent = self._ICON_COLORS.get(icon, self._ICON_COLORS["info"])
+        symbol = self._ICON_LABELS.get(icon, "ℹ")
+
+        # Coloured accent strip at top
+        ctk.CTkFrame(dlg, fg_color=accent, height=6, corner_radius=0).pack(fill="x")
+
+        # Icon + title row
+        top_row = ctk.CTkFrame(dlg, fg_color="transparent")
+        top_row.pack(fill="x", padx=20, pady=(14, 0))
+        ctk.CTkLabel(top_row, text=symbol, font=(F_UI, 22, "bold"),
+                     text_color=accent).pack(side="left", padx=(0, 10))
+        ctk.CTkLabel(top_row, text=title, font=(F_UI, 15, "bold"),
+                     text_color=C["text_main"]).pack(side="left")
+
+        # Message body
+        ctk.CTkLabel(dlg, text=message, font=(F_UI, 13),
+                     text_color=C["text_main"],
+                     wraplength=width - 50, justify="left").pack(padx=24, pady=(10, 16))
+
+        # Buttons
+        btn_row = ctk.CTkFrame(dlg, fg_color="transparent")
+        btn_row.pack(fill="x", padx=20, pady=(0, 16))
+
+        def _pick(label):
+            self._result = label
+            dlg.grab_release()
+            dlg.destroy()
+
+        options = [o for o in [option_1, option_2, option_3] if o]
+        for i, opt in enumerate(options):
+            fg = accent if i == 0 else C["input_bg"]
+            tc = "white"  if i == 0 else C["text_main"]
+            ctk.CTkButton(btn_row, text=opt, fg_color=fg, text_color=tc,
+                          command=lambda o=opt: _pick(o)).pack(
+                              side="left", expand=True, padx=4)
+
+        # Block caller until dialog is closed (mirrors CTkMessagebox behaviour)
+        parent.wait_window(dlg)
+
+    def get(self):
+        return self._result
+
+
+
+# ==========================================
+# 3d. UI UPDATE BUS
+# ==========================================
+class UpdateBus:
+    """
+    Thread-safe hand-off from background code to Tk. post() keys each update
+    by what it targets (a progress bar, a label, a console) and keeps only the
+    latest one per key, so a transfer printing thousands of progress lines
+    costs one redraw per frame instead of thousands of queued after(0)
+    closures. The Tk thread drains the bus at most FPS times a second, in
+    the order the surviving updates were posted; key=None is never coalesced.
+    """
+    FPS = 30
+    IDLE_MS = 100  # poll interval while nothing has been posted for a frame
+
+    def __init__(self, fps=FPS):
+        self._frame_ms = max(1, 1000 // fps)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._root = None
+
+    def attach(self, root):
+        """Start draining on root's event loop. Call from the Tk thread."""
+        self._root = root
+        self._tick()
+
+    def post(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the Tk thread, replacing any update still pending under key."""
+        with self._lock:
+            if key is None:
+                key = object()
+            else:
+                self._pending.pop(key, None)  # re-posting moves it behind newer updates
+            self._pending[key] = (fn, args, kwargs)
+
+    def flush(self):
+        """Apply everything pending now. Tk thread only; returns how many updates ran."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for fn, args, kwargs in pending.values():
+            try:
+                fn(*args, **kwargs)
+            except TclError:
+                pass  # its widget was destroyed after the update was posted
+            except Exception as e:
+                print(f"[UI] {getattr(fn, '__qualname__', fn)} failed: {e}")
+        return len(pending)
+
+    def _tick(self):
+        ran = 0
+        try:
+            ran = self.flush()
+        finally:
+            self._root.after(self._frame_ms if ran else self.IDLE_MS, self._tick)
+
+
+UI = UpdateBus()
+
+
+# ==========================================
+# 5. MAIN APPLICATION
+# ==========================================
+class XtremeADB(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        self.withdraw()  # Hide main window during splash
+        UI.attach(self)
+
+        splash = ctk.CTkToplevel(self)
+        splash.overrideredirect(True)
+        splash.attributes("-topmost", True)
+
+        photo = ASSETS.image("splash.png")
+        w, h = photo.cget("size") if photo else (1, 1)
+        sw = self.winfo_screenwidth()
+        sh = self.winfo_screenheight()
+        x = (sw - w) // 2
+        y = (sh - h) // 2
+        splash.geometry(f"{w}x{h}+{x}+{y}")
+        ctk.CTkLabel(splash, image=photo, text="").pack()
+        splash.update()
+        STARTUP.mark("splash")
+
+        self.title(APP_NAME)
+        self.geometry("1400x900")
+        self.configure(fg_color=C["bg_root"])
+        self.minsize(1100, 700)
+
+        self.bk = Backend()
+        self.sel_dev = None
+        self.cur_path = "/sdcard/"
+        self.log_proc = None
+        self._logcat_suspended = False  # Logcat was streaming when its view was hidden
+        self._proc_mon = None
+        self.nav_buttons = {}
+        self.active_radials = []
+        self._dash_info_dev = None  # device whose model/Android labels are on the dashboard
+        self._device_models = {}  # serial -> tile title for the Fleet view
+        self.monitor_active = False
+        self.file_buttons = []
+        self.consoles = {}
+        self.ctrl_pressed = False
+        self._views = {}           # name -> retained view frame, built on first visit
+        self._view_devices = {}    # name -> device the view was last shown for
+        self._current_view = None  # name of currently active view
+        self._recorders = {}       # serial -> LogcatRecorder
+        self.crash_watch = CrashWatcher(on_event=self._on_crash_event)
+
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.init_ui()
+        STARTUP.mark("sidebar + dashboard")
+        splash.destroy()
+        self.deiconify()  # un-withdraw the main window — required on Linux/macOS
+        if os.name == "nt":
+            self.after(0, lambda: self.state('zoomed'))          # Windows
+        elif sys.platform == "darwin":
+            self.after(0, lambda: self.attributes('-zoomed', True))  # macOS
+        else:
+            self.after(0, lambda: self.attributes('-zoomed', True))  # Linux / WSL
+
+        # -------------------------------
+        # Set window icon cross-platform
+        # -------------------------------
+        try:
+            if os.name == "nt":
+                self.iconbitmap(str(ASSETS.path("xadb.ico")))  # Windows
+            else:
+                from PIL import ImageTk
+                icon_image = ASSETS.pil("xadb.png")
+                icon_photo = ImageTk.PhotoImage(icon_image)
+                self.iconphoto(True, icon_photo)  # Linux / macOS / WSL
+                self._icon_ref = icon_photo
+        except Exception as e:
+            print(f"Could not set icon: {e}")
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        STARTUP.mark("window shown")
+        # Polling starts once the first frame is drawn and the UI is taking input
+        self.after_idle(self._start_background)
+
+    def _start_background(self):
+        STARTUP.mark("first idle (interactive)")
+        self.dev_loop()
+        self.stats_loop()
+        STARTUP.mark("polling threads started")
+        STARTUP.report()
+
+        # Check for Updates
+        self.after(1000, self.check_updates_async)
+
+
+    def check_updates_async(self):
+        """Check for updates after UI is loaded — runs check in bg thread, shows dialog on main thread"""
+        if not CONF["check_updates"]:
+            return
+
+        def _check():
+            has_update, new_ver, url = check_for_updates()
+            if has_update:
+                self.after(0, lambda: self._show_update_dialog(new_ver, url))
+
+        self.run_bg(_check, lane=None, priority=TaskScheduler.BACKGROUND)
+
+    def _show_update_dialog(self, new_ver, url):
+        """Native CTk update dialog — avoids CTkMessagebox icon-loading issues under Nuitka"""
+        dlg = ctk.CTkToplevel(self)
+        dlg.title("Update Available")
+        dlg.geometry("420x200")
+        dlg.resizable(False, False)
+        dlg.attributes("-topmost", True)
+        dlg.grab_set()
+
+        # Centre over main window
+        self.update_idletasks()
+        x = self.winfo_x() + (self.winfo_width() - 420) // 2
+        y = self.winfo_y() + (self.winfo_height() - 200) // 2
+        dlg.geometry(f"420x200+{x}+{y}")
+
+        ctk.CTkLabel(dlg, text="Update Available",
+                     font=(F_UI, 16, "bold"), text_color=C["primary"]).pack(pady=(20, 5))
+        ctk.CTkLabel(dlg, text=f"Version v{new_ver} is available.\nWould you like to download it?",
+                     font=(F_UI, 13), text_color=C["text_main"]).pack(pady=(0, 20))
+
+        btn_row = ctk.CTkFrame(dlg, fg_color="transparent")
+        btn_row.pack(fill="x", padx=20, pady=(0, 20))
+
+        def _download():
+            import webbrowser
+            webbrowser.open(url)
+            dlg.destroy()
+
+        def _never():
+            save_config("check_updates", False)
+            dlg.destroy()
+
+        ctk.CTkButton(btn_row, text="Download", fg_color=C["success"],
+                      command=_download).pack(side="left", expand=True, padx=5)
+        ctk.CTkButton(btn_row, text="Later", fg_color=C["warning"],
+                      command=dlg.destroy).pack(side="left", expand=True, padx=5)
+        ctk.CTkButton(btn_row, text="Never", fg_color=C["danger"],
+                      command=_never).pack(side="left", expand=True, padx=5)
+
+
+
+    def run_bg(self, func, lane="device", priority=TaskScheduler.INTERACTIVE, **kwargs):
+        """
+        Queue func on the scheduler and return its TaskFuture. lane="device"
+        serializes it with other work on the selected device; "transfer" and
+        "shell" are that device's separate lanes for long pushes/pulls and
+        shell commands, which run as dedicated tasks so they never tie up a
+        pool worker; None runs it unserialized.
+        """
+        kwargs.setdefault("dedicated", lane in ("transfer", "shell"))
+        if lane in ("device", "transfer", "shell"):
+            serial = self.sel_dev.split()[0] if self.sel_dev else None
+            lane = serial if lane == "device" or serial is None else f"{serial}/{lane}"
+        return SCHEDULER.submit(func, priority=priority, lane=lane, **kwargs)
+
+    def _on_close(self):
+        """Flush background recorders before the daemon threads are torn down."""
+        self.crash_watch.stop()
+        for sess in Backend._shell_sessions.values():
+            sess.close()
+        for idx in Backend._path_indexes.values():
+            idx.session.close()
+        ROOT_POOL.close()
+        for rec in self._recorders.values():
+            rec.stop(wait=False)
+        for rec in self._recorders.values():
+            rec.stop()
+        self.destroy()
+
+    def _bind_scroll(self, widget):
+        """Bind mouse wheel scroll for Linux (Button-4/5), Windows/Mac (MouseWheel)."""
+        SCROLL_SPEED = 10
+
+        def _on_mousewheel(event):
+            if hasattr(widget, '_parent_canvas'):
+                canvas = widget._parent_canvas
+                if os.name == 'nt' or sys.platform == 'darwin':
+                    canvas.yview_scroll(int(-1 * (event.delta / 120)) * SCROLL_SPEED, "units")
+                else:
+                    if event.num == 4:
+                        canvas.yview_scroll(-SCROLL_SPEED, "units")
+                    elif event.num == 5:
+                        canvas.yview_scroll(SCROLL_SPEED, "units")
+
+        if sys.platform == 'linux':
+            widget.bind_all("<Button-4>", _on_mousewheel)
+            widget.bind_all("<Button-5>", _on_mousewheel)
+        else:
+            widget.bind_all("<MouseWheel>", _on_mousewheel)
+
+    def init_ui(self):
+        # Sidebar
+        self.sidebar = ctk.CTkFrame(self, width=90, corner_radius=0, fg_color=C["bg_sidebar"])
+        self.sidebar.grid(row=0, column=0, sticky="nsew")
+        self.sidebar.grid_propagate(False)
+
+        ctk.CTkLabel(self.sidebar, text="XA", font=(F_UI, 28, "bold"), text_color=C["primary"]).pack(pady=(30, 20))
+
+        self.nav_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
+        self.nav_frame.pack(fill="x", pady=10)
+
+        def _load_nav_icon(name, size=26):
+            return ASSETS.icon(name, size)
+
+        items = [
+            ("home",     "Dashboard", self.view_dash),
+            ("screen",   "Screen",    self.view_screen),
+            ("apps",     "Apps",      self.view_apps),
+            ("files",    "Files",     self.view_files),
+            ("shell",    "Shell",     self.view_shell),
+            ("logcat",   "Logcat",    self.view_logcat),
+            ("processes", "Processes", self.view_processes),
+            ("connect", "Connection",  self.view_connect),
+            ("fastboot", "Fastboot",  self.view_fastboot),
+            ("tweaks",   "Tweaks",    self.view_tweaks),
+            ("backup",   "Backup",    self.view_backup),
+            ("devices",  "Devices",   self.view_devices),
+            ("fleet",    "Fleet",     self.view_fleet),
+            ("settings", "Settings",  self.view_settings),
+        ]
+
+        for icon_name, name, cmd in items:
+            img = _load_nav_icon(icon_name)
+            btn = FluentButton(
+                self.nav_frame,
+                image=img if img else None,
+                text="" if img else icon_name[:2].upper(),
+                width=50, height=50, corner_radius=10,
+                font=(F_UI, 13, "bold"), command=cmd,
+                fg_color="transparent", text_color=C["text_sub"],
+                compound="top"
+            )
+            btn.pack(pady=5, padx=10)
+            self.nav_buttons[name] = btn
+
+        self.status_dot = ctk.CTkLabel(self.sidebar, text="●", font=(F_UI, 24), text_color=C["danger"])
+        self.status_dot.pack(side="bottom", pady=(0, 20))
+        self.status_lbl = ctk.CTkLabel(self.sidebar, text="None", font=(F_UI, 10), text_color="gray")
+        self.status_lbl.pack(side="bottom", pady=(0, 5))
+        self.crash_badge = ctk.CTkButton(self.sidebar, text="", width=50, height=26, corner_radius=8,
+                                         font=(F_UI, 11, "bold"), fg_color="transparent",
+                                         hover_color=C["bg_hover"], text_color=C["warning"],
+                                         command=self.open_crash_list)
+        self.crash_badge.pack(side="bottom", pady=(0, 5))
+
+        # Main content: one retained frame per view is packed in here; self.main
+        # always points at the current view's frame
+        self.content = ctk.CTkFrame(self, corner_radius=0, fg_color=C["bg_root"])
+        self.content.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
+        self.main = self.content
+        self.bind_all("<Control_L>", lambda e: setattr(self, 'ctrl_pressed', True))
+        self.bind_all("<KeyRelease-Control_L>", lambda e: setattr(self, 'ctrl_pressed', False))
+        self.bind_all("<Control_R>", lambda e: setattr(self, 'ctrl_pressed', True))
+        self.bind_all("<KeyRelease-Control_R>", lambda e: setattr(self, 'ctrl_pressed', False))
+        self.view_dash()
+
+    def highlight(self, name):
+        self.monitor_active = name == "Dashboard"
+        self._current_view = name
+        for k, btn in self.nav_buttons.items():
+            btn.set_active(k == name)
+
+    # ── Retained views ─────────────────────────────────────────────────────
+    # Views whose content belongs to one device: rebuilt when shown for another
+    DEVICE_VIEWS = ("Apps", "Files", "Shell", "Processes")
+
+    def _enter_view(self, name):
+        """
+        Switch to view `name`. Returns True if the caller has to build it (first
+        visit, or a device view shown for a different device); otherwise the
+        retained frame is just shown again and the caller returns.
+        """
+        prev = self._current_view
+        if prev and prev != name and prev in self._views:
+            self._suspend_view(prev)
+            self._views[prev].pack_forget()
+        self.highlight(name)
+        frame = self._views.get(name)
+        if frame is not None and name in self.DEVICE_VIEWS and self._view_devices.get(name) != self.sel_dev:
+            self._discard_view(name)
+            frame = None
+        self._view_devices[name] = self.sel_dev
+        if frame is not None:
+            self.main = frame
+            if prev != name:
+                frame.pack(fill="both", expand=True)
+                self._resume_view(name)
+            return False
+        frame = self._views[name] = ctk.CTkFrame(self.content, corner_radius=0, fg_color="transparent")
+        frame.pack(fill="both", expand=True)
+        self.main = frame
+        return True
+
+    def _suspend_view(self, name):
+        """Pause a view's background work while it is hidden."""
+        if name == "Logcat":
+            self._logcat_suspended = bool(self.log_proc)
+            if self.log_proc:
+                self.stop_logcat()
+        if name == "Processes" and self._proc_mon:
+            self._proc_mon.stop()
+
+    def _resume_view(self, name):
+        """Restart what _suspend_view paused when a retained view is shown again."""
+        if name == "Logcat" and self._logcat_suspended:
+            self._logcat_suspended = False
+            self.start_logcat()
+        if name == "Processes" and self._proc_mon:
+            self._proc_mon.start()
+
+    def _discard_view(self, name):
+        if name == "Shell" and getattr(self, "_shell_alive", False):
+            self._shell_stop()
+        if name == "Files":
+            self.file_buttons = []
+        if name == "Processes" and self._proc_mon:
+            self._proc_mon.stop()
+        frame = self._views.pop(name, None)
+        if frame is not None:
+            frame.destroy()
+
+    def rebuild_view(self, name, builder):
+        """Throw away a retained view and build it again."""
+        if self._current_view == name:
+            self._current_view = None
+        self._discard_view(name)
+        builder()
+
+    def get_console(self):
+        """Helper to get the current view's console if it exists"""
+        for w in self.main.winfo_children():
+            if isinstance(w, LogConsole):
+                return w
+        return None
+
+    def adb_cmd_console(self, args, msg="Executing..."):
+        """Run ADB command and stream to current console"""
+        console = self.get_console()
+        if not self.sel_dev:
+            if console: console.log("[ERROR] No device selected")
+            return
+
+        clean = self.sel_dev.split()[0]
+
+        if CONF.get("use_su", False) and args[0] == "shell" and len(args) > 1:
+            if console: console.log(f"Command (root): {' '.join(args[1:])}")
+
+            def _exec_root():
+                part = [""]
+
+                def _lines(chunk):
+                    *done, part[0] = (part[0] + chunk).split("\n")
+                    for l in done:
+                        if console: console.log(l.rstrip())
+                with ACTION_LOG.timed("adb", clean, args=args, root=True) as rec:
+                    # Joined like `adb shell` joins them, so callers' own shell quoting still applies
+                    _, code = self.bk.run_root(clean, " ".join(args[1:]), on_output=_lines, timeout=None)
+                    rec.update(code=code, result="ok" if code == 0 else "error")
+                if part[0].strip() and console: console.log(part[0].rstrip())
+                if console: console.log("[DONE]" if code is not None else "[FAILED]")
+
+            self.run_bg(_exec_root, dedicated=True)  # no timeout: may stream for as long as the user likes
+            return
+
+        if console: console.log(f"Command: {' '.join(args)}")
+
+        def _exec():
+            with ACTION_LOG.timed("adb", clean, args=args):
+                self.bk.run_live([xadb_core.ADB_PATH, "-s", clean] + args, lambda l: console.log(l) if console else None)
+            if console: console.log("[DONE]")
+
+        self.run_bg(_exec, dedicated=True)
+
+    def dev_loop(self):
+        """Poll the device list every device_poll_interval seconds on the scheduler."""
+        self._pause_dev_loop = False
+        self._last_device_list = []
+        self._warned_serials = set()
+        SCHEDULER.every(lambda: CONF.get("device_poll_interval", 2), self._dev_poll,
+                        priority=TaskScheduler.BACKGROUND, name="device poll")
+
+    def _dev_poll(self):
+        try:
+            if self._pause_dev_loop:
+                return
+            devices = self.bk.get_devices()
+            problem = getattr(self.bk, '_problem_serials', set())
+            self.bk._problem_serials = set()  # reset every cycle
+            new_problems = problem - self._warned_serials
+            if new_problems:
+                self._warned_serials.update(new_problems)
+                serials_str = ", ".join(new_problems)
+                self.after(0, lambda s=serials_str: CustomDialog(
+                    self,
+                    title="Unauthorized or Offline Device Detected",
+                    message=f"Device(s) [{s}] are not ready.\n\nMake sure your phone screen is unlocked and tap 'Allow' on the USB debugging authorization prompt. If you already did, try unplugging and replugging the cable.",
+                    icon="warning",
+                    option_1="Ok"
+                ))
+            # If a serial is no longer problem, remove from warned so it can warn again if replugged
+            self._warned_serials &= problem                    
+            self._sync_watchers(devices)
+            if devices:
+                if self.sel_dev not in devices:
+                    # Try to restore last used device by serial
+                    last_serial = CONF.get("last_device", "")
+                    restored = next((d for d in devices if d.split()[0] == last_serial), None)
+                    if restored:
+                        self.sel_dev = restored
+                    elif len(devices) == 1:
+                        self.sel_dev = devices[0]
+                    elif devices != self._last_device_list:
+                        self.after(0, lambda d=devices: self.prompt_device_select(d))
+                if devices != self._last_device_list:
+                    UI.post("device list", self._on_device_list_changed)
+
+                self._last_device_list = devices
+                sel = self.sel_dev
+                UI.post(self.status_dot, self.status_dot.configure, text_color=C["success"])
+
+                # --- NEW LOGIC PROPERLY INDENTED ---
+                if sel:
+                    name = self.bk.run([xadb_core.ADB_PATH, "-s", sel.split()[0], "shell", "settings", "get", "global", "device_name"]).strip()
+                    UI.post(self.status_lbl, self.status_lbl.configure, text=name)
+                else:
+                    UI.post(self.status_lbl, self.status_lbl.configure, text="Ready")
+                # -----------------------------------
+
+            else:
+                if self._last_device_list:
+                    UI.post("device list", self._on_device_list_changed)
+                self._last_device_list = []
+                if self.sel_dev is not None:
+                    self.sel_dev = None
+                    UI.post(self.status_dot, self.status_dot.configure, text_color=C["danger"])
+                    UI.post(self.status_lbl, self.status_lbl.configure, text="None")
+        except:
+            pass
+
+    def _sync_watchers(self, devices):
+        """Keep the per-device background watchers in line with the connected devices.
+        Logcat recorders ride out disconnects on their own, so they are never stopped here."""
+        online = {d.split()[0] for d in devices if "ADB" in d}
+        self.crash_watch.sync(online if CONF.get("crash_watch", True) else ())
+        if not CONF.get("logcat_record", False):
+            return
+        for serial in online:
+            rec = self._recorders.setdefault(serial, LogcatRecorder(serial))
+            if not rec.running:
+                rec.start()
+
+    def _on_crash_event(self, ev, is_new):
+        """Called from a watcher thread for every crash/ANR occurrence."""
+        if is_new:
+            log_action(op=ev["kind"], serial=ev["serial"], result="detected",
+                       package=ev["package"], id=ev["id"])
+        UI.post("crash badge", self._refresh_crash_badge)
+
+    def _refresh_crash_badge(self):
+        n = sum(ev["count"] for ev in self.crash_watch.snapshot())
+        self.crash_badge.configure(text=f"⚠ {n}" if n else "")
+
+    def open_crash_list(self):
+        """Window listing the crash/ANR events collected by the background watcher."""
+        import tkinter as tk
+        win = ctk.CTkToplevel(self)
+        win.title("Crashes & ANRs")
+        win.geometry("1100x650")
+        win.configure(fg_color=C["bg_root"])
+
+        bar = ctk.CTkFrame(win, fg_color="transparent")
+        bar.pack(fill="x", padx=10, pady=10)
+        summary = ctk.CTkLabel(bar, text="", text_color=C["text_sub"], font=(F_UI, 12))
+        summary.pack(side="left", padx=5)
+
+        split = ctk.CTkFrame(win, fg_color="transparent")
+        split.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        lst = ctk.CTkScrollableFrame(split, width=420, fg_color=C["bg_surface"], corner_radius=10)
+        lst.pack(side="left", fill="y", padx=(0, 10))
+        term = ctk.CTkFrame(split, fg_color="#000000", corner_radius=10)
+        term.pack(side="left", fill="both", expand=True)
+        trace = tk.Text(term, font=(F_MONO, 11), bg="#000000", fg="#EF5350", relief="flat",
+                        borderwidth=0, wrap="none", undo=False, state="disabled")
+        trace.pack(fill="both", expand=True, padx=6, pady=6)
+
+        def _show(ev):
+            trace.configure(state="normal")
+            trace.delete("1.0", "end")
+            trace.insert("end", f"{ev['kind'].upper()}  {ev['package']}  on {ev['serial']}\n"
+                                f"seen {ev['count']}x, first {ev['first']}, last {ev['last']}, "
+                                f"stack {ev['id']}\n\n{ev['trace']}\n")
+            trace.configure(state="disabled")
+
+        def _render():
+            for w in lst.winfo_children():
+                w.destroy()
+            events = sorted(self.crash_watch.snapshot(), key=lambda e: e["last"], reverse=True)
+            summary.configure(text=f"{len(events)} unique event(s), "
+                                   f"{sum(e['count'] for e in events)} occurrence(s)")
+            colors = {"crash": C["danger"], "native": C["danger"], "anr": C["warning"]}
+            for ev in events:
+                ctk.CTkButton(lst, text=f"{ev['kind'].upper():<6} {ev['package']}  ×{ev['count']}\n"
+                                        f"        {ev['last']}  [{ev['serial']}]",
+                              anchor="w", font=(F_MONO, 11), fg_color="transparent",
+                              hover_color=C["bg_hover"], text_color=colors[ev["kind"]],
+                              command=lambda e=ev: _show(e)).pack(fill="x", pady=1)
+
+        def _clear():
+            self.crash_watch.clear()
+            self._refresh_crash_badge()
+            _render()
+
+        ctk.CTkButton(bar, text="Clear", width=70, fg_color=C["input_bg"], text_color=C["text_main"],
+                      command=_clear).pack(side="right", padx=5)
+        ctk.CTkButton(bar, text="Refresh", width=70, fg_color=C["primary"],
+                      command=_render).pack(side="right", padx=5)
+        _render()
+
+    def prompt_device_select(self, devices):
+        if CONF.get("suppress_multi_device_warn", False):
+            self.sel_dev = devices[0]
+            return
+
+        dev = devices[0]
+        serial = dev.split()[0]
+        mode = dev.split("(")[1].replace(")", "") if "(" in dev else ""
+        if "ADB" in mode:
+            model = self.bk.run([xadb_core.ADB_PATH, "-s", serial, "shell", "getprop", "ro.product.model"]).strip()
+            friendly = f"{model or serial} [{serial}]"
+        else:
+            friendly = f"{serial} ({mode})"
+        self.sel_dev = dev
+
+        if hasattr(self, '_multi_dev_banner') and self._multi_dev_banner.winfo_exists():
+            self._multi_dev_banner.destroy()
+
+        banner = ctk.CTkFrame(self.main, fg_color="#4a3800", corner_radius=10,
+                              border_width=1, border_color=C["warning"])
+        banner.pack(fill="x", pady=(0, 10), before=self.main.winfo_children()[0])
+        self._multi_dev_banner = banner
+
+        msg = f"Multiple devices detected — Please select one in the Devices menu.\nCurrently active: {friendly}"
+        ctk.CTkLabel(banner, text=msg, text_color="#FFD966",
+                     font=(F_UI, 12), justify="left").pack(side="left", padx=15, pady=10)
+
+        btn_frame = ctk.CTkFrame(banner, fg_color="transparent")
+        btn_frame.pack(side="right", padx=10)
+
+        def dismiss():
+            banner.destroy()
+
+        def dont_warn():
+            save_config("suppress_multi_device_warn", True)
+            banner.destroy()
+
+        ctk.CTkButton(btn_frame, text="Don't warn me again", width=150, height=28,
+                      fg_color="#555", command=dont_warn).pack(side="left", padx=5)
+
+    # ── Device sampling ────────────────────────────────────────────────────
+    PROBE_BUDGET = 4   # adb probes per second across all devices
+    IDLE_BACKOFF = 4   # an idle device slows down to this multiple of its interval
+
+    def stats_loop(self):
+        """
+        Sample devices on the scheduler. Every online device is probed while
+        telemetry is on or the Fleet view is showing, otherwise just the
+        selected one while the Dashboard is. Each device has its own due
+        time: first probes are spread over an interval so they don't all
+        fire together, the interval never drops below what PROBE_BUDGET
+        allows for the device count (so adb load stops growing with the
+        fleet), and devices whose readings stay flat back off further.
+        """
+        self._stats_inflight = set()
+        self._probes = {}  # serial -> {"due", "interval", "last"}
+        SCHEDULER.every(1.0, self._stats_poll, priority=TaskScheduler.BACKGROUND, name="device sampling")
+
+    def _stats_poll(self):
+        sel = self.sel_dev if self.sel_dev and "ADB" in self.sel_dev else None
+        everyone = CONF.get("telemetry", False) or self._current_view == "Fleet"
+        devices = [d for d in self._last_device_list if "ADB" in d] if everyone else []
+        if sel and self.monitor_active and sel not in devices:
+            devices.append(sel)
+        serials = {d.split()[0] for d in devices}
+        for gone in set(self._probes) - serials:
+            del self._probes[gone]
+
+        now = time.monotonic()
+        floor = max(CONF.get("refresh_interval", 3), len(devices) / self.PROBE_BUDGET)
+        self._probe_floor = floor
+        for dev in devices:
+            serial = dev.split()[0]
+            probe = self._probes.get(serial)
+            if probe is None:
+                phase = zlib.crc32(serial.encode()) % 1000 / 1000  # stable stagger per device
+                probe = self._probes[serial] = {"due": now + phase * floor, "interval": floor, "last": None}
+            if serial in self._stats_inflight or probe["due"] > now + 1.0:
+                continue  # not due this tick, or its previous probe is still running
+            self._stats_inflight.add(serial)
+            SCHEDULER.submit(self._probe_stats, dev, priority=TaskScheduler.BACKGROUND,
+                             lane=serial, delay=max(0.0, probe["due"] - now), name=f"stats {serial}")
+
+    def _is_idle(self, latest, last):
+        """Readings flat since the previous probe: same battery, RAM within 1%, CPU and network quiet."""
+        if last is None or latest["batt"] is None:
+            return False
+        return (latest["batt"] == last["batt"]
+                and abs((latest["ram"] or 0) - (last["ram"] or 0)) < 1
+                and (latest["cpu"] or 0) < 10
+                and (latest["net_rx"] or 0) + (latest["net_tx"] or 0) < 1)
+
+    def _probe_stats(self, dev):
+        serial = dev.split()[0]
+        try:
+            stats = self.bk.get_stats(dev)
+            if stats:
+                TELEMETRY.record(serial, stats)
+            latest = TELEMETRY.latest(serial)
+            probe = self._probes.get(serial)
+            if probe is not None:
+                floor = getattr(self, "_probe_floor", CONF.get("refresh_interval", 3))
+                idle = self._is_idle(latest, probe["last"])
+                if idle and not (self.monitor_active and dev == self.sel_dev):
+                    probe["interval"] = min(floor * self.IDLE_BACKOFF, probe["interval"] * 1.5)
+                else:
+                    probe["interval"] = floor
+                probe["last"] = latest
+                probe["due"] = time.monotonic() + probe["interval"]
+                state = "no response" if not stats else "idle" if idle else "online"
+                UI.post(("tile", serial), self._update_tile, serial,
+                        latest if stats else None, state, probe["interval"])
+            if self.monitor_active and dev == self.sel_dev:
+                if stats and hasattr(self, 'rad_batt') and hasattr(self, 'rad_ram'):
+                    if "batt" in stats:
+                        UI.post(self.rad_batt, self.rad_batt.set, stats["batt"])
+                    if "ram" in stats:
+                        UI.post(self.rad_ram, self.rad_ram.set, stats["ram"])
+                if hasattr(self, 'lbl_model') and hasattr(self, 'lbl_android') \
+                        and self._dash_info_dev != self.sel_dev:
+                    # Model and Android version don't change, so fetch and draw them once per device
+                    m, a = self.bk.get_device_info(self.sel_dev)
+                    if "[ERROR]" not in m + a:
+                        self._dash_info_dev = self.sel_dev
+                    UI.post(self.lbl_model, self.lbl_model.configure, text=f"Model: {m}")
+                    UI.post(self.lbl_android, self.lbl_android.configure, text=f"Android: {a}")
+                for name, spark in getattr(self, "_sparks", {}).items():
+                    UI.post(spark, spark.set, *TELEMETRY.sparkline(serial, name, spark.points))
+        except:
+            pass
+        finally:
+            self._stats_inflight.discard(serial)
+
+    def _on_device_list_changed(self):
+        if hasattr(self, 'dev_list_frame') and self.dev_list_frame.winfo_exists():
+            self._refresh_device_list()
+        if "Fleet" in self._views:
+            self._refresh_fleet()
+
+    # --- FLEET ---
+    FLEET_COLUMNS = 4
+
+    def view_fleet(self):
+        if not self._enter_view("Fleet"):
+            return
+        top = ctk.CTkFrame(self.main, fg_color="transparent")
+        top.pack(fill="x", pady=(10, 20))
+        ctk.CTkLabel(top, text="Fleet", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(side="left")
+        self.fleet_summary = ctk.CTkLabel(top, text="", font=(F_UI, 12), text_color=C["text_sub"])
+        self.fleet_summary.pack(side="right", padx=10)
+        self.fleet_grid = ctk.CTkScrollableFrame(self.main, fg_color="transparent")
+        self.fleet_grid.pack(fill="both", expand=True)
+        self._bind_scroll(self.fleet_grid)
+        for col in range(self.FLEET_COLUMNS):
+            self.fleet_grid.grid_columnconfigure(col, weight=1, uniform="tile")
+        self._fleet_tiles = {}
+        self._refresh_fleet()
+
+    def _refresh_fleet(self):
+        """Add and remove tiles to match the connected devices, keeping existing tiles as they are."""
+        devices = {d.split()[0]: d for d in self._last_device_list}
+        for serial in set(self._fleet_tiles) - set(devices):
+            self._fleet_tiles.pop(serial).destroy()
+        for serial, dev in devices.items():
+            tile = self._fleet_tiles.get(serial)
+            if tile is None:
+                tile = self._fleet_tiles[serial] = DeviceTile(self.fleet_grid, serial, command=self._fleet_select)
+                mode = dev.split("(")[1].rstrip(")") if "(" in dev else ""
+                if "ADB" not in mode:
+                    tile.set(state=mode.lower() or "unknown")
+                self._fleet_model(serial)
+        for i, serial in enumerate(sorted(self._fleet_tiles)):
+            self._fleet_tiles[serial].grid(row=i // self.FLEET_COLUMNS, column=i % self.FLEET_COLUMNS,
+                                           sticky="nsew", padx=6, pady=6)
+        n = len(self._fleet_tiles)
+        rate = min(n / max(CONF.get("refresh_interval", 3), 1), self.PROBE_BUDGET)
+        self.fleet_summary.configure(text=f"{n} device(s) · at most {rate:.1f} probe(s)/s")
+
+    def _fleet_model(self, serial):
+        """Fill a tile's title with the device model, looked up once per device."""
+        models = self._device_models
+        if serial in models:
+            self._update_tile(serial, title=models[serial])
+            return
+
+        def _t():
+            model = self.bk.run([xadb_core.ADB_PATH, "-s", serial, "shell", "getprop", "ro.product.model"]).strip()
+            if model and "[ERROR]" not in model and "error:" not in model:
+                models[serial] = f"{model} · {serial}"
+                UI.post(("tile title", serial), self._update_tile, serial, title=models[serial])
+        SCHEDULER.submit(_t, priority=TaskScheduler.BACKGROUND, lane=serial, name=f"model {serial}")
+
+    def _update_tile(self, serial, values=None, state=None, interval=None, title=None):
+        tile = getattr(self, "_fleet_tiles", {}).get(serial)
+        if tile is not None:
+            tile.set(values, state, interval, title)
+
+    def _fleet_select(self, serial):
+        dev = next((d for d in self._last_device_list if d.split()[0] == serial), None)
+        if dev:
+            self._select_device(dev)
+            self.view_dash()
+
+    # ================= VIEWS =================
+
+    def view_dash(self):
+        if not self._enter_view("Dashboard"):
+            return
+
+        ctk.CTkLabel(self.main, text="Dashboard", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(10, 10))
+
+        # Info Row
+        info_frame = ctk.CTkFrame(self.main, fg_color="transparent")
+        info_frame.pack(fill="x", pady=(0, 20))
+        self._dash_info_dev = None
+        self.lbl_model = ctk.CTkLabel(info_frame, text="Model: ...", font=(F_UI, 14), text_color=C["text_sub"])
+        self.lbl_model.pack(side="left", padx=10)
+        self.lbl_android = ctk.CTkLabel(info_frame, text="Android: ...", font=(F_UI, 14), text_color=C["text_sub"])
+        self.lbl_android.pack(side="left", padx=10)
+
+        # Stats row
+        row = ctk.CTkFrame(self.main, fg_color="transparent")
+        row.pack(fill="x")
+        c1 = ctk.CTkFrame(row, fg_color=C["bg_surface"], corner_radius=15)
+        c1.pack(side="left", fill="both", expand=True, padx=(0, 10))
+        self.rad_ram = RadialProgress(c1, "RAM", color=C["warning"])
+        self.rad_ram.pack(pady=20)
+        self.active_radials.append(self.rad_ram)
+
+        c2 = ctk.CTkFrame(row, fg_color=C["bg_surface"], corner_radius=15)
+        c2.pack(side="left", fill="both", expand=True, padx=(10, 0))
+        self.rad_batt = RadialProgress(c2, "Battery", color=C["success"])
+        self.rad_batt.pack(pady=20)
+        self.active_radials.append(self.rad_batt)
+
+        # History
+        hist = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        hist.pack(fill="x", pady=(20, 0))
+        hist_top = ctk.CTkFrame(hist, fg_color="transparent")
+        hist_top.pack(fill="x", padx=20, pady=(12, 0))
+        ctk.CTkLabel(hist_top, text="History", font=(F_UI, 14, "bold"), text_color=C["text_main"]).pack(side="left")
+        ctk.CTkButton(hist_top, text="Battery Report...", width=120, height=26, fg_color=C["input_bg"],
+                      hover_color=C["bg_hover"], text_color=C["text_main"],
+                      command=self.open_battery_report).pack(side="right", padx=(5, 0))
+        ctk.CTkButton(hist_top, text="Export...", width=80, height=26, fg_color=C["input_bg"],
+                      hover_color=C["bg_hover"], text_color=C["text_main"],
+                      command=self.export_telemetry).pack(side="right")
+        grid = ctk.CTkFrame(hist, fg_color="transparent")
+        grid.pack(fill="x", padx=20, pady=(5, 12))
+        series = [("batt", "Battery", C["success"]), ("temp", "Temperature", C["danger"]),
+                  ("ram", "RAM", C["warning"]), ("cpu", "CPU", C["primary"]),
+                  ("net_rx", "Net ↓", C["primary"]), ("net_tx", "Net ↑", C["warning"])]
+        self._sparks = {}
+        for i, (name, title, color) in enumerate(series):
+            spark = Sparkline(grid, title, unit=TelemetryStore.UNITS[name], color=color)
+            spark.grid(row=i // 3, column=i % 3, sticky="ew", padx=8, pady=4)
+            grid.grid_columnconfigure(i % 3, weight=1)
+            self._sparks[name] = spark
+
+        # Power controls
+        ctk.CTkLabel(self.main, text="Power Controls", font=(F_UI, 18, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(30, 10))
+        pg = ctk.CTkFrame(self.main, fg_color="transparent")
+        pg.pack(fill="x")
+        btns = [("Reboot System", ["reboot"], C["primary"]), ("Recovery", ["reboot", "recovery"], C["warning"]),
+                ("Bootloader", ["reboot", "bootloader"], C["warning"]), ("Power Off", ["reboot", "-p"], C["danger"])]
+
+        button_text_color = "#000000" if ctk.get_appearance_mode() == "Light" else "#FFFFFF" ## Fix For Issue 1
+
+        for label, cmd, color in btns:
+            ctk.CTkButton(pg, text=label, text_color=button_text_color, fg_color=color, height=50, corner_radius=8, font=(F_UI, 14, "bold"),
+                          command=lambda x=cmd: self.adb_cmd_console(x)).pack(side="left", fill="x", expand=True, padx=5)
+
+        # Console
+        ctk.CTkLabel(self.main, text="Activity Log", font=(F_UI, 14, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(20, 5))
+        self.dash_console = LogConsole(self.main, height=200)
+        self.dash_console.pack(fill="x", pady=(0, 20))
+
+    def open_battery_report(self):
+        """Window ranking the apps that drained the battery, from batterystats --checkin."""
+        import tkinter as tk
+        if not self.sel_dev or "ADB" not in self.sel_dev:
+            self.dash_console.log("[ERROR] No device selected")
+            return
+        serial = self.sel_dev.split()[0]
+        win = ctk.CTkToplevel(self)
+        win.title(f"Battery Report — {serial}")
+        win.geometry("1000x600")
+        win.configure(fg_color=C["bg_root"])
+
+        bar = ctk.CTkFrame(win, fg_color="transparent")
+        bar.pack(fill="x", padx=10, pady=10)
+        status = ctk.CTkLabel(bar, text="", text_color=C["text_sub"], font=(F_UI, 12))
+        status.pack(side="left", padx=5)
+        sort_by = ctk.StringVar(value="Power")
+        headings = {h: key for key, h, _, _ in BatteryStats.COLUMNS}
+        ctk.CTkSegmentedButton(bar, values=list(headings), variable=sort_by,
+                               command=lambda _: _render()).pack(side="right", padx=5)
+
+        term = ctk.CTkFrame(win, fg_color=C["term_bg"], corner_radius=10)
+        term.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        table = tk.Text(term, font=(F_MONO, 11), bg="#000000", fg="#E0E0E0", relief="flat",
+                        borderwidth=0, wrap="none", undo=False, state="disabled")
+        table.pack(fill="both", expand=True, padx=6, pady=6)
+        state = {"stats": None, "packages": {}, "task": None}
+
+        def _render():
+            stats = state["stats"]
+            if stats is None or not table.winfo_exists():
+                return
+            lines = []
+            if stats.discharge:
+                hours = stats.battery_realtime_ms / 3600000
+                lines.append(f"Discharged {stats.discharge[0]}-{stats.discharge[1]}% over {hours:.1f} h on battery, "
+                             f"screen on {stats.screen_on_ms / 60000:.0f} min")
+            if stats.power_items:
+                top = sorted(stats.power_items.items(), key=lambda kv: kv[1], reverse=True)[:6]
+                lines.append("Hardware: " + ", ".join(f"{k} {v:.1f} mAh" for k, v in top))
+            lines.append("")
+            lines.append(f"{'#':>3}  {'Package':<48}" + "".join(f"{h:>14}" for _, h, _, _ in BatteryStats.COLUMNS))
+            ranked = stats.rank(headings[sort_by.get()], packages=state["packages"])
+            for i, (name, uid, row) in enumerate(ranked, 1):
+                cells = "".join(f"{fmt.format(row[key] / div):>14}" for key, _, div, fmt in BatteryStats.COLUMNS)
+                lines.append(f"{i:>3}  {name[:48]:<48}{cells}")
+            if not ranked:
+                lines.append("No usage recorded for this column.")
+            table.configure(state="normal")
+            table.delete("1.0", "end")
+            table.insert("end", "\n".join(lines) + "\n")
+            table.configure(state="disabled")
+
+        def _capture():
+            stats = BatteryStats()
+            stop = SCHEDULER.current().stop
+            UI.post(status, status.configure, text="Reading batterystats...")
+            with ACTION_LOG.timed("batterystats", serial) as rec:
+                code = self.bk.run_live([xadb_core.ADB_PATH, "-s", serial, "shell", "dumpsys", "batterystats", "--checkin"],
+                                        stats.feed, cancel=stop)
+                rec.update(lines=stats.lines, result="cancelled" if code is None and stop.is_set() else "ok")
+            if stop.is_set():
+                return
+            state["packages"] = self.bk.package_uids(serial)
+            state["stats"] = stats
+            UI.post(status, status.configure, text=f"{stats.lines} record(s), {len(stats.uids)} uid(s)")
+            UI.post(("battery report", id(win)), _render)
+
+        def _start():
+            if state["task"] and not state["task"].done():
+                return
+            state["task"] = self.run_bg(_capture, lane=serial, priority=TaskScheduler.NORMAL)
+
+        def _reset():
+            dlg = CustomDialog(win, title="Reset Battery Stats",
+                               message="Clear the device's battery statistics so the next report covers only "
+                                       "what happens from now on (e.g. a test run)?",
+                               icon="warning", option_1="Cancel", option_2="Reset")
+            if dlg.get() != "Reset":
+                return
+            state["stats"] = None
+
+            def _t():
+                out = self.bk.run([xadb_core.ADB_PATH, "-s", serial, "shell", "dumpsys", "batterystats", "--reset"])
+                log_action(op="batterystats reset", serial=serial, result="error" if "[ERROR]" in out else "ok")
+                UI.post(status, status.configure,
+                        text=out.strip().splitlines()[-1] if out.strip() else "Battery stats reset")
+            self.run_bg(_t, lane=serial)
+
+        ctk.CTkButton(bar, text="Refresh", width=80, fg_color=C["primary"], command=_start).pack(side="right", padx=5)
+        ctk.CTkButton(bar, text="Reset Stats", width=100, fg_color=C["warning"], command=_reset).pack(side="right", padx=5)
+
+        def _close():
+            if state["task"]:
+                state["task"].cancel()
+            win.destroy()
+
+        win.protocol("WM_DELETE_WINDOW", _close)
+        _start()
+
+    def export_telemetry(self):
+        if not self.sel_dev:
+            self.dash_console.log("[ERROR] No device selected")
+            return
+        serial = self.sel_dev.split()[0]
+        f = filedialog.asksaveasfilename(
+            defaultextension=".csv", initialfile=f"telemetry_{serial}",
+            filetypes=[("CSV", "*.csv"), ("Columnar", "*.tcol"), ("Parquet (needs pyarrow)", "*.parquet")])
+        if not f:
+            return
+        try:
+            path = TELEMETRY.export(serial, f)
+            self.dash_console.log(f"✓ Telemetry exported to {path}")
+        except KeyError:
+            self.dash_console.log("No telemetry recorded for this device yet.")
+        except Exception as e:
+            self.dash_console.log(f"[ERROR] Export failed: {e}")
+
+    # --- SCREEN TOOLS ---
+    def view_screen(self):
+        if not self._enter_view("Screen"):
+            return
+        ctk.CTkLabel(self.main, text="Screen Tools", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(10, 20))
+
+        grid = ctk.CTkFrame(self.main, fg_color="transparent")
+        grid.pack(fill="x", pady=10)
+
+        # Scrcpy
+        c1 = ctk.CTkFrame(grid, fg_color=C["bg_surface"], corner_radius=10)
+        c1.pack(side="left", fill="both", expand=True, padx=5, ipady=10)
+        ctk.CTkLabel(c1, text="Mirroring", font=(F_UI, 16, "bold")).pack(pady=10)
+        ctk.CTkButton(c1, text="Launch Scrcpy", fg_color=C["primary"], command=self.launch_scrcpy).pack(pady=10)
+
+        # Screenshot
+        c2 = ctk.CTkFrame(grid, fg_color=C["bg_surface"], corner_radius=10)
+        c2.pack(side="left", fill="both", expand=True, padx=5, ipady=10)
+        ctk.CTkLabel(c2, text="Capture", font=(F_UI, 16, "bold")).pack(pady=10)
+        ctk.CTkButton(c2, text="Take Screenshot", fg_color=C["success"], command=self.take_screenshot).pack(pady=10)
+
+        # Record
+        c3 = ctk.CTkFrame(grid, fg_color=C["bg_surface"], corner_radius=10)
+        c3.pack(side="left", fill="both", expand=True, padx=5, ipady=10)
+        ctk.CTkLabel(c3, text="Recording", font=(F_UI, 16, "bold")).pack(pady=10)
+        self.rec_btn = ctk.CTkButton(c3, text="Start Record (10s)", fg_color=C["danger"], command=self.record_screen)
+        self.rec_btn.pack(pady=10)
+
+        self.screen_console = LogConsole(self.main, height=300)
+        self.screen_console.pack(fill="both", expand=True, pady=20)
+
+    def launch_scrcpy(self):
+        if not self.sel_dev: return
+        self.screen_console.log("Launching Scrcpy...")
+        clean = self.sel_dev.split()[0]
+        def _run():
+            try:
+                kwargs = Backend._no_window_kwargs()
+                kwargs["stdin"] = subprocess.DEVNULL
+                subprocess.Popen([SCRCPY_PATH, "-s", clean] + CONF["scrcpy_args"].split(), **kwargs)
+                self.screen_console.log("Scrcpy will start.")
+            except Exception:
+                self.screen_console.log("[ERROR] Scrcpy not found in PATH.")
+        self.run_bg(_run)
+
+    def take_screenshot(self):
+        if not self.sel_dev: return
+        ts = int(time.time())
+        remote = f"/sdcard/screen_{ts}.png"
+        local = f"screen_{ts}.png"
+        clean = self.sel_dev.split()[0]
+
+        def _capture():
+            self.screen_console.log("Capturing screenshot...")
+            result = self.bk.run([xadb_core.ADB_PATH, "-s", clean, "shell", "screencap", "-p", remote])
+
+            if "[ERROR]" in result:
+                self.screen_console.log("[ERROR] Screenshot failed")
+                return
+
+            time.sleep(0.5)
+            self.screen_console.log(f"Downloading to {local}...")
+            self.bk.run_live(
+                [xadb_core.ADB_PATH, "-s", clean, "pull", remote, local],
+                lambda l: self.screen_console.log(l)
+            )
+
+            self.bk.run([xadb_core.ADB_PATH, "-s", clean, "shell", "rm", remote])
+            self.screen_console.log(f"✓ Saved to {local}")
+
+        self.run_bg(_capture)
+
+    def record_screen(self):
+        if not self.sel_dev: return
+        ts = int(time.time())
+        remote = f"/sdcard/rec_{ts}.mp4"
+        local = f"rec_{ts}.mp4"
+        clean = self.sel_dev.split()[0]
+        pframe, bar, lbl = self._show_progress("Recording for 10 seconds...", self.screen_console)
+
+        def _record():
+            stop = SCHEDULER.current().stop
+            existed = os.path.exists(local)
+            self.screen_console.log("Recording for 10 seconds...")
+
+            with ACTION_LOG.timed("screenrecord", clean, remote=remote, local=local) as rec:
+                output = []
+                code = self.bk.run_live(
+                    [xadb_core.ADB_PATH, "-s", clean, "shell", "screenrecord", "--time-limit", "10", remote],
+                    output.append, cancel=stop
+                )
+                if stop.is_set():
+                    # Killing the local adb doesn't always reach screenrecord on older adbd
+                    self.bk.run([xadb_core.ADB_PATH, "-s", clean, "shell", f"pkill -f '{remote}'"])
+                elif code is None or any("[ERROR]" in l for l in output):
+                    rec["result"] = "error"
+                    self.screen_console.log("[ERROR] Recording failed")
+                    UI.post(bar, self._update_progress, bar, lbl, 0, 1, "✗ Recording failed")
+                    UI.post(pframe, self.after, 3000, pframe.destroy)
+                    return
+
+                if not stop.is_set():
+                    self.screen_console.log(f"Recording complete. Downloading to {local}...")
+                    UI.post(bar, self._update_progress, bar, lbl, 1, 2, f"Downloading to {local}...")
+                    self.bk.run_live(
+                        [xadb_core.ADB_PATH, "-s", clean, "pull", remote, local],
+                        lambda l: self.screen_console.log(l), cancel=stop
+                    )
+
+                self.bk.run([xadb_core.ADB_PATH, "-s", clean, "shell", "rm", "-f", remote])
+                if stop.is_set():
+                    rec["result"] = "cancelled"
+                    self._discard_partial(local, existed)
+                    self._progress_cancelled(pframe, bar, lbl, self.screen_console, "✗ Recording cancelled")
+                    return
+            self.screen_console.log(f"✓ Saved to {local}")
+            UI.post(bar, self._update_progress, bar, lbl, 1, 1, f"✓ Saved to {local}")
+            UI.post(pframe, self.after, 3000, pframe.destroy)
+
+        pframe.task = self.run_bg(_record, lane="transfer")  # 10 s record plus a pull: keep it off the pool
+        return pframe.task
+
+
+    # --- APPS ---
+    def view_apps(self):
+        if not self._enter_view("Apps"):
+            return
+        self.sel_pkgs = []
+        ctk.CTkLabel(self.main, text="App Manager", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(
+            anchor="w", pady=(10, 20))
+
+        bar = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=10)
+        bar.pack(fill="x", pady=(0, 5), ipady=5)
+        self.app_search = ctk.CTkEntry(bar, placeholder_text="Search apps...", border_width=0, fg_color=C["input_bg"],
+                                       height=40, text_color=C["text_main"])
+        self.app_search.pack(side="left", fill="x", expand=True, padx=10, pady=10)
+        self.app_search.bind("<KeyRelease>",
+                             lambda e: self.filter_apps() if e.keysym not in ("Control_L", "Control_R") else None)
+        ctk.CTkButton(bar, text="Refresh", fg_color=C["primary"], command=self.load_apps).pack(side="left", padx=5)
+        ctk.CTkButton(bar, text="Install APK", fg_color=C["success"], command=self.install_apk).pack(side="left",
+                                                                                                     padx=10)
+
+        # Sort bar
+        sort_bar = ctk.CTkFrame(self.main, fg_color="transparent")
+        sort_bar.pack(fill="x", pady=(0, 5))
+        ctk.CTkLabel(sort_bar, text="Sort:", font=(F_UI, 11), text_color=C["text_sub"]).pack(side="left",
+                                                                                                   padx=(5, 8))
+        self._app_sort = ctk.StringVar(value=CONF.get("app_sort", "a_z"))
+        for label, val in [("A→Z", "a_z"), ("Z→A", "z_a")]:
+            ctk.CTkRadioButton(sort_bar, text=label, variable=self._app_sort, value=val,
+                               font=(F_UI, 11), text_color=C["text_sub"],
+                               command=self._on_app_sort_change).pack(side="left", padx=6)
+
+        split = ctk.CTkFrame(self.main, fg_color="transparent")
+        split.pack(fill="both", expand=True)
+        self.app_list = ctk.CTkScrollableFrame(split, fg_color=C["bg_surface"], corner_radius=15)
+        self.app_list.pack(side="left", fill="both", expand=True, padx=(0, 10))
+        self._bind_scroll(self.app_list)
+
+        act = ctk.CTkFrame(split, width=250, fg_color=C["bg_surface"], corner_radius=15)
+        act.pack(side="right", fill="y")
+        ctk.CTkLabel(act, text="Actions", font=(F_UI, 14, "bold"), text_color=C["text_main"]).pack(pady=(20, 5))
+        self.lbl_pkg = ctk.CTkLabel(act, text="None selected", text_color="gray", wraplength=200, font=(F_UI, 11))
+        self.lbl_pkg.pack(pady=(0, 15))
+
+        ctk.CTkButton(act, text="Uninstall Selected", fg_color=C["danger"], command=self.do_uninst).pack(fill="x",
+                                                                                                         padx=20,
+                                                                                                         pady=5)
+        ctk.CTkButton(act, text="Force Uninstall", fg_color="#8B0000",
+                      command=self.do_force_uninst).pack(fill="x", padx=20, pady=5)
+        ctk.CTkButton(act, text="Force Stop", fg_color=C["warning"], command=self.do_force).pack(fill="x", padx=20,
+                                                                                                 pady=5)
+        ctk.CTkButton(act, text="Clear Data", fg_color="#555", command=self.do_clear).pack(fill="x", padx=20, pady=5)
+        ctk.CTkButton(act, text="Extract APK", fg_color=C["primary"], command=self.do_extract).pack(fill="x", padx=20,
+                                                                                                    pady=5)
+        ctk.CTkButton(act, text="Profile Selected", fg_color=C["primary"], command=self.open_profiler).pack(fill="x", padx=20,
+                                                                                                         pady=5)
+        ctk.CTkButton(act, text="Deselect All", fg_color=C["input_bg"], text_color=C["text_main"],
+                      command=self.deselect_all_apps).pack(fill="x", padx=20, pady=(15, 5))
+
+        self.app_console = LogConsole(self.main, height=150)
+        self.app_console.pack(fill="x", pady=(10, 0))
+
+        self.all_apps = []
+        self.sel_pkgs = []
+        self.load_apps()
+
+    def load_apps(self):
+        if not self.sel_dev: return
+        cln = self.sel_dev.split()[0]
+        for w in self.app_list.winfo_children(): w.destroy()
+        self._app_buttons = {}
+        self.app_console.log("Loading packages...")
+        def _t():
+            raw = self.bk.run([xadb_core.ADB_PATH, "-s", cln, "shell", "pm", "list", "packages", "-3"], timeout=15)
+            if not raw or not raw.strip():
+                self.app_console.log("[WARNING] No packages found")
+                self.all_apps = []
+            else:
+                self.all_apps = sorted(
+                    [x.replace("package:", "").strip() for x in raw.split("\n") if x.strip()],
+                    key=str.lower
+                )
+            self.after(0, lambda: self.filter_apps())
+        self.run_bg(_t)
+        
+    def filter_apps(self):
+        search = self.app_search.get().lower()
+        filtered = [p for p in self.all_apps if search in p.lower()]
+        sort = self._app_sort.get() if hasattr(self, '_app_sort') else CONF.get("app_sort", "a_z")
+        if sort == "z_a":
+            filtered = list(reversed(filtered))
+        self.after(0, lambda: self._populate_app_list(filtered, len(self.all_apps)))
+
+    def _on_app_sort_change(self):
+        save_config("app_sort", self._app_sort.get())
+        self.filter_apps()
+
+    def _populate_app_list(self, pkgs, total):
+        for w in self.app_list.winfo_children():
+            w.destroy()
+        self._app_buttons = {}
+        CHUNK = 30  # render 30 buttons per frame to keep UI responsive
+
+        def _render_chunk(idx):
+            chunk = pkgs[idx:idx + CHUNK]
+            for p in chunk:
+                btn = ctk.CTkButton(
+                    self.app_list,
+                    text=p,
+                    anchor="w",
+                    fg_color="transparent",
+                    hover_color=C["bg_hover"],
+                    text_color=C["text_main"],
+                    command=lambda x=p: self.toggle_app_select(x)
+                )
+                btn.pack(fill="x")
+                self._app_buttons[p] = btn
+            if idx + CHUNK < len(pkgs):
+                self.after(5, lambda: _render_chunk(idx + CHUNK))
+            else:
+                self.app_console.log(f"Loaded {total} apps (showing {len(pkgs)}).")
+
+        if pkgs:
+            _render_chunk(0)
+        else:
+            self.app_console.log(f"Loaded {total} apps (showing 0).")
+        # Re-apply selection highlights for restored state
+        def _restore_selection():
+            for pkg in list(self.sel_pkgs):
+                if pkg in self._app_buttons:
+                    self._app_buttons[pkg].configure(fg_color=C["bg_hover"])
+            count = len(self.sel_pkgs)
+            if count == 1:
+                self.lbl_pkg.configure(text=self.sel_pkgs[0])
+            elif count > 1:
+                self.lbl_pkg.configure(text=f"{count} packages selected")
+        self.after(200, _restore_selection)
+
+    def toggle_app_select(self, p):
+        if p in self.sel_pkgs:
+            # always allow deselect with normal click
+            self.sel_pkgs.remove(p)
+            self._app_buttons[p].configure(fg_color="transparent")
+        else:
+            if not self.ctrl_pressed and len(self.sel_pkgs) > 0:
+                # no ctrl = clear previous selection first
+                for prev in self.sel_pkgs:
+                    if prev in self._app_buttons:
+                        self._app_buttons[prev].configure(fg_color="transparent")
+                self.sel_pkgs = []
+            self.sel_pkgs.append(p)
+            self._app_buttons[p].configure(fg_color=C["bg_hover"])
+
+        count = len(self.sel_pkgs)
+        if count == 0:
+            self.lbl_pkg.configure(text="None selected")
+        elif count == 1:
+            self.lbl_pkg.configure(text=self.sel_pkgs[0])
+        else:
+            self.lbl_pkg.configure(text=f"{count} packages selected")
+
+    def deselect_all_apps(self):
+        for p in self.sel_pkgs:
+            if p in self._app_buttons:
+                self._app_buttons[p].configure(fg_color="transparent")
+        self.sel_pkgs = []
+        self.lbl_pkg.configure(text="None selected")
+
+    def install_apk(self):
+        files = filedialog.askopenfilenames(filetypes=[("APK", "*.apk")])  # Note: askopenfileNAMES (plural)
+        if files:
+            self.app_console.log(f"Installing {len(files)} APK(s)...")
+            for i, f in enumerate(files, 1):
+                self.app_console.log(f"[{i}/{len(files)}] Installing {os.path.basename(f)}...")
+                self.adb_cmd_console(["install", f], f"Installing {os.path.basename(f)}")
+            self.app_console.log("All installations queued!")
+
+    def do_uninst(self):
+        if not self.sel_pkgs:
+            self.app_console.log("[ERROR] No packages selected.")
+            return
+        pkgs = self.sel_pkgs.copy()
+
+        def _run():
+            for pkg in pkgs:
+                self.app_console.log(f"Uninstalling {pkg}...")
+                self.bk.run_live([xadb_core.ADB_PATH, "-s", self.sel_dev.split()[0], "uninstall", pkg],
+                                 lambda l: self.app_console.log(l))
+            UI.post("apps reload", self.after, 500, self.load_apps)
+            UI.post("apps deselect", self.after, 500, self.deselect_all_apps)
+
+        self.run_bg(_run)
+
+    def do_force_uninst(self):
+        if not self.sel_pkgs:
+            self.app_console.log("[ERROR] No packages selected.")
+            return
+        pkgs = self.sel_pkgs.copy()
+        msg = CustomDialog(
+            self,
+            title="Force Uninstall",
+            message=f"Force uninstall {len(pkgs)} package(s)?\nThis uses -k --user 0 and works on system apps.",
+            icon="warning",
+            option_1="Yes",
+            option_2="Cancel"
+        )
+        if msg.get() != "Yes":
+            return
+
+        def _run():
+            for pkg in pkgs:
+                self.app_console.log(f"Force uninstalling {pkg}...")
+                self.bk.run_live(
+                    [xadb_core.ADB_PATH, "-s", self.sel_dev.split()[0], "shell", "pm", "uninstall", "-k", "--user", "0", pkg],
+                    lambda l: self.app_console.log(l))
+            UI.post("apps reload", self.after, 500, self.load_apps)
+            UI.post("apps deselect", self.after, 500, self.deselect_all_apps)
+
+        self.run_bg(_run)
+
+    def do_force(self):
+        if not self.sel_pkgs:
+            self.app_console.log("[ERROR] No packages selected.")
+            return
+        for pkg in self.sel_pkgs:
+            self.adb_cmd_console(["shell", "am", "force-stop", pkg])
+
+    def open_profiler(self):
+        """Window with live memory/CPU/thread charts and a leak summary for the selected packages."""
+        if not self.sel_pkgs:
+            self.app_console.log("[ERROR] No packages selected.")
+            return
+        if not self.sel_dev:
+            return
+        serial = self.sel_dev.split()[0]
+        pkgs = list(self.sel_pkgs)
+        win = ctk.CTkToplevel(self)
+        win.title(f"Profiler — {serial}")
+        win.geometry("1000x650")
+        win.configure(fg_color=C["bg_root"])
+
+        bar = ctk.CTkFrame(win, fg_color="transparent")
+        bar.pack(fill="x", padx=10, pady=10)
+        ctk.CTkLabel(bar, text="Sample every", text_color=C["text_sub"], font=(F_UI, 12)).pack(side="left", padx=5)
+        interval = CONF.get("profiler_interval", 2)
+        rate_lbl = ctk.CTkLabel(bar, text=f"{interval}s", text_color=C["primary"], font=(F_UI, 12, "bold"))
+        rate_lbl.pack(side="left", padx=(0, 10))
+        status = ctk.CTkLabel(bar, text="Starting...", text_color=C["text_sub"], font=(F_UI, 12))
+        status.pack(side="right", padx=5)
+
+        cards = ctk.CTkScrollableFrame(win, fg_color="transparent")
+        cards.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self._bind_scroll(cards)
+        charts = {}
+        shown = ("pss", "java", "native", "cpu", "threads")
+        colors = {"pss": C["warning"], "java": C["primary"], "native": C["success"],
+                  "cpu": C["danger"], "threads": C["text_sub"]}
+        for pkg in pkgs:
+            card = ctk.CTkFrame(cards, fg_color=C["bg_surface"], corner_radius=12)
+            card.pack(fill="x", pady=5)
+            ctk.CTkLabel(card, text=pkg, font=(F_UI, 14, "bold"), text_color=C["text_main"]).pack(anchor="w", padx=15, pady=(10, 0))
+            row = ctk.CTkFrame(card, fg_color="transparent")
+            row.pack(fill="x", padx=15, pady=5)
+            sparks = {}
+            for i, metric in enumerate(shown):
+                sp = Sparkline(row, metric.upper() if metric == "pss" else metric.capitalize(),
+                               unit=AppProfiler.UNITS[metric], color=colors[metric], width=160)
+                sp.grid(row=0, column=i, sticky="ew", padx=6)
+                row.grid_columnconfigure(i, weight=1)
+                sparks[metric] = sp
+            summary = ctk.CTkLabel(card, text="", font=(F_MONO, 11), text_color=C["text_sub"], justify="left")
+            summary.pack(anchor="w", padx=15, pady=(0, 10))
+            charts[pkg] = (sparks, summary)
+
+        def _render(pkg):
+            sparks, summary = charts[pkg]
+            if not summary.winfo_exists():
+                return
+            for metric, sp in sparks.items():
+                sp.set(*prof.sparkline(pkg, metric, sp.points))
+            lines = []
+            for metric, st in prof.summary(pkg).items():
+                if metric in ("pss", "java", "native", "cpu", "threads"):
+                    unit = AppProfiler.UNITS[metric]
+                    lines.append(f"{metric:<8} peak {st['peak']:8.1f}{unit:<4} mean {st['mean']:8.1f}{unit:<4} "
+                                 f"slope {st['slope']:+8.2f}{unit}/min")
+            summary.configure(text="\n".join(lines) or "Not running")
+            status.configure(text=f"{len(prof.rings[pkg])} sample(s)")
+
+        prof = AppProfiler(serial, pkgs, interval=interval,
+                           on_sample=lambda pkg, values: UI.post(("profiler", id(prof), pkg), _render, pkg))
+
+        def _set_rate(value):
+            prof.interval = int(value)
+            rate_lbl.configure(text=f"{int(value)}s")
+            save_config("profiler_interval", int(value))
+
+        slider = ctk.CTkSlider(bar, from_=1, to=10, number_of_steps=9, width=160, command=_set_rate,
+                               fg_color="#555555", progress_color=C["primary"], button_color=C["primary"])
+        slider.set(interval)
+        slider.pack(side="left")
+
+        def _close():
+            prof.stop()
+            log_action(op="profile", serial=serial, packages=pkgs,
+                       summary={pkg: prof.summary(pkg) for pkg in pkgs})
+            win.destroy()
+
+        win.protocol("WM_DELETE_WINDOW", _close)
+        prof.start()
+
+    def do_clear(self):
+        if not self.sel_pkgs:
+            self.app_console.log("[ERROR] No packages selected.")
+            return
+        for pkg in self.sel_pkgs:
+            self.adb_cmd_console(["shell", "pm", "clear", pkg])
+
+    def do_extract(self):
+        pkgs = self.sel_pkgs.copy()
+        cln = self.sel_dev.split()[0]
+        d = os.path.join(os.path.dirname(os.path.dirname(__file__)), "extracted")
+        os.makedirs(d, exist_ok=True)
+        pframe, bar, lbl = self._show_progress(f"Extracting 0/{len(pkgs)}...", self.app_console)
+        def _t():
+            stop = SCHEDULER.current().stop
+            for i, pkg in enumerate(pkgs):
+                if stop.is_set():
+                    break
+                UI.post(bar, self._update_progress, bar, lbl, i, len(pkgs),
+                        f"Extracting {pkg} ({i+1}/{len(pkgs)})...")
+                path_out = self.bk.run([xadb_core.ADB_PATH, "-s", cln, "shell", "pm", "path", pkg])
+                apk_paths = [line.replace("package:", "").strip() for line in path_out.split("\n") if
+                "package:" in line]
+                if not apk_paths:
+                    self.app_console.log(f"[ERROR] Could not find APK path for {pkg}")
+                    continue
+                pkg_dir = os.path.join(d, pkg)
+                os.makedirs(pkg_dir, exist_ok=True)
+                for apk_path in apk_paths:
+                    filename = os.path.basename(apk_path)
+                    local_path = os.path.join(pkg_dir, filename)
+                    existed = os.path.exists(local_path)
+                    self.app_console.log(f"Pulling {filename}...")
+                    with ACTION_LOG.timed("pull", cln, src=apk_path, dest=local_path, package=pkg) as rec:
+                        self.bk.run_live(
+                            [xadb_core.ADB_PATH, "-s", cln, "pull", apk_path, local_path],
+                            lambda l: self.app_console.log(l), cancel=stop
+                        )
+                        if stop.is_set():
+                            rec["result"] = "cancelled"
+                    if stop.is_set():
+                        self._discard_partial(local_path, existed)
+                        break
+                    self.app_console.log(f"Extracted {pkg} to {pkg_dir}")
+            if stop.is_set():
+                self._progress_cancelled(pframe, bar, lbl, self.app_console, "✗ Extraction cancelled")
+                return
+            self.app_console.log("Extraction complete.")
+            UI.post(bar, self._update_progress, bar, lbl, 1, 1, "✓ Extraction complete")
+            UI.post(pframe, self.after, 3000, pframe.destroy)
+        pframe.task = self.run_bg(_t, lane="transfer")
+        return pframe.task
+
+    # --- FILES ---
+    def view_files(self):
+        if not self._enter_view("Files"):
+            return
+        ctk.CTkLabel(self.main, text="File Explorer", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(10, 20))
+
+        nav = ctk.CTkFrame(self.main, fg_color=C["bg_surface"])
+        nav.pack(fill="x", pady=10)
+        ctk.CTkButton(nav, text="⬆", width=40, command=self.fm_up, fg_color="#333").pack(side="left", padx=10, pady=10)
+        self.fm_ent = ctk.CTkEntry(nav, border_width=0, fg_color=C["input_bg"], height=35, text_color=C["text_main"])
+        self.fm_ent.pack(side="left", fill="x", expand=True)
+        self.fm_ent.bind("<Return>", lambda e: self.fm_load())
+        ctk.CTkButton(nav, text="Go", width=60, command=self.fm_load, fg_color=C["primary"]).pack(side="left", padx=10)
+
+        bar = ctk.CTkFrame(self.main, fg_color="transparent")
+        bar.pack(fill="x", pady=10)
+        ops = [("New Folder", self.fm_mkdir), ("Delete", self.fm_del), ("Rename", self.fm_ren), ("Upload", self.fm_upload), ("Download", self.fm_download_single)]
+        for label, cmd in ops:
+            ctk.CTkButton(bar, text=label, width=80, fg_color=C["input_bg"], hover_color=C["bg_hover"], text_color=C["text_main"], command=cmd).pack(side="left", padx=5)
+
+        # Sort bar
+        fsort_bar = ctk.CTkFrame(self.main, fg_color="transparent")
+        fsort_bar.pack(fill="x", pady=(0, 5))
+        ctk.CTkLabel(fsort_bar, text="Sort:", font=(F_UI, 11), text_color=C["text_sub"]).pack(side="left", padx=(5, 8))
+        self._file_sort = ctk.StringVar(value=CONF.get("file_sort", "a_z"))
+        for label, val in [("A→Z", "a_z"), ("Z→A", "z_a"), ("Folders first", "folders_first"), ("Files first", "files_first")]:
+            ctk.CTkRadioButton(fsort_bar, text=label, variable=self._file_sort, value=val, font=(F_UI, 11), text_color=C["text_sub"], command=self._on_file_sort_change).pack(side="left", padx=6)
+
+        self.fm_list = ctk.CTkScrollableFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        self.fm_list.pack(fill="both", expand=True)
+        self._bind_scroll(self.fm_list)
+        self.fm_sel = None
+        self.fm_selected = []
+        self.ctrl_pressed = False
+        self.fm_ent.insert(0, self.cur_path)
+
+        self.fm_console = LogConsole(self.main, height=120)
+        self.fm_console.pack(fill="x", pady=(10, 0))
+        self.fm_load()
+
+
+    def fm_load(self):
+        if not self.sel_dev: return
+        cln = self.sel_dev.split()[0]
+        path = self.fm_ent.get()
+        self.cur_path = path
+
+        # Increment generation so any in-flight render knows it's stale
+        self._fm_gen = getattr(self, '_fm_gen', 0) + 1
+        my_gen = self._fm_gen
+
+        for w in self.fm_list.winfo_children():
+            w.destroy()
+        self.file_buttons = []
+
+        self.fm_console.log(f"Listing {path}...")
+
+        def _t():
+            out = self.bk.run([xadb_core.ADB_PATH, "-s", cln, "shell", f"ls -p '{path}'"], timeout=10)
+            if "[ERROR]" in out or "No such file" in out or "Permission denied" in out:
+                self.fm_console.log("Error reading directory.")
+                return
+            items = [x.strip() for x in out.split("\n") if x.strip()]
+            if not items:
+                self.fm_console.log("Directory is empty.")
+                return
+            folder_count = sum(1 for i in items if i.endswith("/"))
+            file_count = len(items) - folder_count
+            self.after(0, lambda i=items, g=my_gen: self._populate_file_list(i, g))
+            self.fm_console.log(f"Listed: {file_count} file(s), {folder_count} folder(s)")
+
+        self.run_bg(_t)
+
+
+    def _populate_file_list(self, items, gen):
+        # Bail out if a newer fm_load has already started
+        if gen != getattr(self, '_fm_gen', 0):
+            return
+
+        sort = self._file_sort.get() if hasattr(self, '_file_sort') else CONF.get("file_sort", "a_z")
+        dirs = sorted([i for i in items if i.endswith("/")])
+        files = sorted([i for i in items if not i.endswith("/")])
+
+        if sort == "z_a":
+            dirs = list(reversed(dirs))
+            files = list(reversed(files))
+            sorted_items = dirs + files
+        elif sort == "files_first":
+            sorted_items = files + dirs
+        else:  # a_z and folders_first both put dirs first
+            sorted_items = dirs + files
+
+        CHUNK = 40
+
+        def _render_chunk(idx, g):
+            if g != getattr(self, '_fm_gen', 0):
+                return
+
+            if not hasattr(self, '_fm_icons'):
+                def _load_icon(name, size=18):
+                    return ASSETS.icon(name, size)
+
+                self._fm_icons = {
+                    'dir':        _load_icon("directory"),
+                    # images
+                    'png':        _load_icon("img"),
+                    'jpg':        _load_icon("img"),
+                    'jpeg':       _load_icon("img"),
+                    'gif':        _load_icon("img"),
+                    'webp':       _load_icon("img"),
+                    'bmp':        _load_icon("img"),
+                    'ico':        _load_icon("img"),
+                    'svg':        _load_icon("img"),
+                    'heic':       _load_icon("img"),
+                    # video
+                    'mp4':        _load_icon("video"),
+                    'mkv':        _load_icon("video"),
+                    'avi':        _load_icon("video"),
+                    'mov':        _load_icon("video"),
+                    'wmv':        _load_icon("video"),
+                    'flv':        _load_icon("video"),
+                    'webm':       _load_icon("video"),
+                    '3gp':        _load_icon("video"),
+                    'm4v':        _load_icon("video"),
+                    # audio
+                    'mp3':        _load_icon("audio"),
+                    'wav':        _load_icon("audio"),
+                    'aac':        _load_icon("audio"),
+                    'flac':       _load_icon("audio"),
+                    'ogg':        _load_icon("audio"),
+                    'm4a':        _load_icon("audio"),
+                    'opus':       _load_icon("audio"),
+                    # compressed
+                    'zip':        _load_icon("compressed"),
+                    'rar':        _load_icon("compressed"),
+                    '7z':         _load_icon("compressed"),
+                    'tar':        _load_icon("compressed"),
+                    'gz':         _load_icon("compressed"),
+                    'bz2':        _load_icon("compressed"),
+                    'xz':         _load_icon("compressed"),
+                    'zst':        _load_icon("compressed"),
+                    # text
+                    'txt':        _load_icon("text"),
+                    'log':        _load_icon("text"),
+                    'csv':        _load_icon("text"),
+                    'json':       _load_icon("text"),
+                    'xml':        _load_icon("text"),
+                    'yaml':       _load_icon("text"),
+                    'yml':        _load_icon("text"),
+                    'ini':        _load_icon("text"),
+                    'cfg':        _load_icon("text"),
+                    'conf':       _load_icon("text"),
+                    'sh':         _load_icon("text"),
+                    'py':         _load_icon("text"),
+                    'js':         _load_icon("text"),
+                    'html':       _load_icon("text"),
+                    'css':        _load_icon("text"),
+                    'md':         _load_icon("text"),
+                    # documents
+                    'pdf':        _load_icon("document"),
+                    'doc':        _load_icon("document"),
+                    'docx':       _load_icon("document"),
+                    'xls':        _load_icon("document"),
+                    'xlsx':       _load_icon("document"),
+                    'ppt':        _load_icon("document"),
+                    'pptx':       _load_icon("document"),
+                    'odt':        _load_icon("document"),
+                    'ods':        _load_icon("document"),
+                    # apk
+                    'apk':        _load_icon("apk"),
+                    # fallbacks
+                    'none':       _load_icon("none"),
+                    'file':       _load_icon("files"),
+                }
+
+            chunk = sorted_items[idx:idx + CHUNK]
+            for item in chunk:
+                is_dir = item.endswith("/")
+                col = C["primary"] if is_dir else C["text_main"]
+                if is_dir:
+                    icon_image = self._fm_icons['dir']
+                else:
+                    ext = item.rsplit(".", 1)[-1].lower() if "." in item else ""
+                    if not ext:
+                        icon_image = self._fm_icons['none']
+                    else:
+                        icon_image = self._fm_icons.get(ext) or self._fm_icons['file']
+
+                btn = ctk.CTkButton(
+                    self.fm_list,
+                    text=f"  {item}",
+                    image=icon_image,
+                    compound="left",
+                    anchor="w",
+                    fg_color="transparent",
+                    hover_color=C["bg_hover"],
+                    text_color=col,
+                    command=lambda n=item: self.fm_click_item(n)
+                )
+                btn.pack(fill="x")
+                if is_dir:
+                    btn.bind("<Double-Button-1>", lambda e, x=item: self.fm_ent_dir(x))
+                btn.bind(RIGHT_CLICK, lambda e, name=item: self.show_file_context_menu(e, name))
+                self.file_buttons.append((btn, item))
+
+            # Force the scrollable frame's canvas to update its scroll region
+            self.fm_list.update_idletasks()
+            if hasattr(self.fm_list, '_parent_canvas'):
+                self.fm_list._parent_canvas.configure(
+                    scrollregion=self.fm_list._parent_canvas.bbox("all")
+                )
+
+            if idx + CHUNK < len(sorted_items):
+                self.after(5, lambda i=idx + CHUNK, g=g: _render_chunk(i, g))
+
+        if sorted_items:
+            _render_chunk(0, gen)
+
+
+    def _on_file_sort_change(self):
+        save_config("file_sort", self._file_sort.get())
+        self.fm_load()
+
+
+    # ==================== FILE SELECTION & NAVIGATION ====================
+
+    def fm_click_item(self, name):
+        if self.ctrl_pressed:
+            # Ctrl+Click = Toggle selection
+            if name in self.fm_selected:
+                self.fm_selected.remove(name)
+            else:
+                self.fm_selected.append(name)
+        else:
+            # Normal click = Single selection
+            self.fm_selected = [name]
+
+        self.fm_sel = name
+
+        # Update highlights
+        for btn, item_name in self.file_buttons:
+            if item_name in self.fm_selected:
+                btn.configure(fg_color=C["bg_hover"])
+            else:
+                btn.configure(fg_color="transparent")
+
+        if len(self.fm_selected) > 0:
+            self.fm_console.log(f"{len(self.fm_selected)} item(s) selected")
+
+
+    def show_file_context_menu(self, event, name):
+        import tkinter as tk
+        
+        menu = tk.Menu(self, tearoff=0)
+
+        if len(self.fm_selected) > 1:
+            # Multi-select menu
+            menu.add_command(label=f"Delete {len(self.fm_selected)} items", command=self.fm_del_multiple)
+            menu.add_command(label=f"Download (Receive){len(self.fm_selected)} items", command=self.fm_download_multiple)
+        else:
+            # Single item menu - works for BOTH files AND folders now
+            menu.add_command(label="Download (Receive)", command=lambda: self.fm_download_single(name))
+
+            if name.endswith("/"):
+                menu.add_separator()
+                menu.add_command(label="Upload (Send)", command=lambda: self.fm_upload_to(name))
+
+            menu.add_separator()
+            menu.add_command(label="Delete", command=lambda: self.fm_del_single(name))
+
+        menu.post(event.x_root, event.y_root)
+
+
+    def fm_ent_dir(self, x):
+        self.cur_path = (self.cur_path.rstrip("/") + "/" + x).replace("\\", "/")
+        self.fm_ent.delete(0, "end")
+        self.fm_ent.insert(0, self.cur_path)
+        self.fm_load()
+
+
+    def fm_up(self):
+        parts = self.cur_path.rstrip("/").split("/")
+        if len(parts) > 1:
+            self.cur_path = "/".join(parts[:-1]) + "/"
+        self.fm_ent.delete(0, "end")
+        self.fm_ent.insert(0, self.cur_path)
+        self.fm_load()
+
+
+    # ==================== FOLDER OPERATIONS ====================
+
+    def fm_mkdir(self):
+        dlg = ctk.CTkInputDialog(text="Folder name:", title="New Folder")
+        name = dlg.get_input()
+        if name:
+            # Validate folder name (no spaces or special chars)
+            if " " in name or any(c in name for c in '<>:"/\\|?*'):
+                self.fm_console.log("Invalid folder name. Use alphanumeric and underscore only.")
+                return
+            
+            cmd = ["shell", "mkdir", "-p", f'"{self.cur_path.rstrip("/")}/{name}"']
+            out = self.adb_cmd_console(cmd)
+            
+            if "[ERROR]" in out or "No such file" in out:
+                self.fm_console.log(f"Failed to create folder '{name}'")
+                return
+            
+            self.after(500, self.fm_load)
+
+
+    def fm_del(self):
+        if not self.fm_sel: 
+            self.fm_console.log("No item selected.")
+            return
+        
+        msg = CustomDialog(self, title="Confirm", message=f"Delete {self.fm_sel}?", icon="warning", option_1="Yes", option_2="Cancel")
+        if msg.get() == "Yes":
+            cmd = ["shell", "rm", "-rf", f'"{self.cur_path.rstrip("/")}/{self.fm_sel}"']
+            out = self.adb_cmd_console(cmd)
+            
+            if "[ERROR]" in out or "No such file" in out:
+                self.fm_console.log(f"Failed to delete '{self.fm_sel}'")
+                return
+            
+            self.after(500, self.fm_load)
+
+
+    def fm_del_multiple(self):
+        if not self.fm_selected:
+            self.fm_console.log("Nothing selected.")
+            return
+        
+        msg = CustomDialog(self, title="Confirm", message=f"Delete {len(self.fm_selected)} items?", icon="warning", option_1="Yes", option_2="Cancel")
+        if msg.get() == "Yes":
+            if not self.sel_dev: 
+                self.fm_console.log("No device connected!")
+                return
+                
+            cln = self.sel_dev.split()[0]
+            
+            def _del():
+                for name in self.fm_selected:
+                    path = f"{self.cur_path.rstrip('/')}/{name.rstrip('/')}"
+                    cmd = [xadb_core.ADB_PATH, "-s", cln, "shell", "rm", "-rf", f'"{path}"']
+                    out = self.bk.run(cmd)
+                    
+                    if "[ERROR]" in out:
+                        self.fm_console.log(f"✗ Failed to delete {name}")
+                
+                self.fm_selected = []
+                UI.post("fm reload", self.after, 500, self.fm_load)
+            
+            self.run_bg(_del)
+
+
+    def fm_ren(self):
+        if not self.fm_sel: 
+            self.fm_console.log("No item selected.")
+            return
+        
+        dlg = ctk.CTkInputDialog(text="New name:", title="Rename")
+        new_name = dlg.get_input()
+        
+        if not new_name or " " in new_name:
+            self.fm_console.log("Invalid folder name. Use alphanumeric and underscore only.")
+            return
+            
+        old = f'"{self.cur_path.rstrip("/")}/{self.fm_sel}"'
+        new = f'"{self.cur_path.rstrip("/")}/{new_name}"'
+        
+        cmd = ["shell", "mv", old, new]
+        out = self.adb_cmd_console(cmd)
+        
+        if "[ERROR]" in out or "No such file" in out:
+            self.fm_console.log(f"Failed to rename '{self.fm_sel}'")
+            return
+        
+        self.after(500, self.fm_load)
+
+
+    def fm_upload(self):
+        """Upload multiple local files to device with real progress"""
+        if not self.sel_dev:
+            CustomDialog(self, title="Error", message="No device connected!", icon="cancel", option_1="Ok")
+            return
+        cln = self.sel_dev.split()[0]
+
+        files = self._select_files()
+        files = [f for f in files if f] if files else []
+        
+        if not files:
+            return
+        dest_path = self.cur_path.rstrip("/") + "/"
+        total_files = len(files)
+        pframe, bar, lbl = self._show_progress(f"Uploading 0/{total_files}...")
+        def _upload():
+            stop = SCHEDULER.current().stop
+            done = 0
+            # Remember which names are already on the device: a cancel must never delete those
+            targets = " ".join(shlex.quote(dest_path + os.path.basename(f)) for f in files)
+            existing = set(self.bk.run([xadb_core.ADB_PATH, "-s", cln, "shell",
+                                        f'for f in {targets}; do [ -e "$f" ] && echo "$f"; done']).splitlines())
+            for i, f in enumerate(files):
+                if stop.is_set():
+                    break
+                fname = os.path.basename(f)
+                fsize = os.path.getsize(f) if os.path.exists(f) else 0
+                
+                UI.post(bar, self._update_progress, bar, lbl, i, total_files,
+                        f"Uploading {fname} ({i+1}/{total_files})... {self._fmt(fsize)}")
+                
+                self.fm_console.log(f"Uploading {fname}... ({self._fmt(fsize)})")
+                failed = False
+                last_line = ""
+                
+                def _cb(line, n=fname):
+                    nonlocal failed, last_line
+                    last_line = line
+                    if "[ERROR]" in line or "error:" in line.lower():
+                        failed = True
+                    cur, tot = self._parse_adb_line(line)
+                    if cur is not None and tot not in (None, 100):
+                        use_tot = fsize if fsize > 0 else tot
+                        UI.post(bar, self._update_progress, bar, lbl, cur, use_tot,
+                                f"Uploading {n}... {self._fmt(cur)} / {self._fmt(use_tot)}")
+                with ACTION_LOG.timed("push", cln, src=f, dest=dest_path) as rec:
+                    code = self.bk.run_live([xadb_core.ADB_PATH, "-s", cln, "push", f, dest_path], _cb, cancel=stop)
+                    if code is None and stop.is_set():
+                        rec["result"] = "cancelled"
+                    elif failed:
+                        rec["result"] = "error"
+                if stop.is_set():
+                    # adbd drops an interrupted file itself; remove it in case this one didn't
+                    if dest_path + fname not in existing:
+                        self.bk.run([xadb_core.ADB_PATH, "-s", cln, "shell", f"rm -f {shlex.quote(dest_path + fname)}"])
+                    break
+                if failed:
+                    self.fm_console.log(f"✗ Failed: {fname} — {last_line}")
+                else:
+                    done += 1
+                    self.fm_console.log(f"✓ Uploaded {fname}")
+            if stop.is_set():
+                self._progress_cancelled(pframe, bar, lbl, self.fm_console,
+                                         f"✗ Upload cancelled ({done}/{total_files} file(s) uploaded).")
+                UI.post("fm reload", self.after, 500, self.fm_load)
+                return
+            msg = f"✓ Done: {done}/{total_files} file(s) uploaded."
+            UI.post(bar, self._update_progress, bar, lbl, 1, 1, msg)
+            self.fm_console.log(msg)
+            UI.post("fm reload", self.after, 500, self.fm_load)
+            UI.post(pframe, self.after, 3000, pframe.destroy)
+        pframe.task = self.run_bg(_upload, lane="transfer")
+        return pframe.task
+    def fm_upload_to(self, dest_folder=None):
+        """Upload a local folder to device"""
+        if not self.sel_dev:
+            CustomDialog(self, title="Error", message="No device connected!", icon="cancel", option_1="Ok")
+            return
+        cln = self.sel_dev.split()[0]
+
+        # ← DYNAMIC FOLDER DIALOG SELECTION BASED ON PLATFORM
+        src_folder = self._select_folder()
+        
+        if not src_folder:
+            return
+        if dest_folder:
+            dest_path = f"{self.cur_path.rstrip('/')}/{dest_folder.rstrip('/')}/{os.path.basename(src_folder)}"
+        else:
+            dest_path = f"{self.cur_path.rstrip('/')}/{os.path.basename(src_folder)}"
+        total_files = sum(len(fs) for _, _, fs in os.walk(src_folder))
+        pframe, bar, lbl = self._show_progress(f"Uploading folder '{os.path.basename(src_folder)}'...")
+        def _upload():
+            stop = SCHEDULER.current().stop
+            self.fm_console.log(f"Uploading folder '{os.path.basename(src_folder)}' ({total_files} files)...")
+            existed = "1" in self.bk.run([xadb_core.ADB_PATH, "-s", cln, "shell", f"[ -e {shlex.quote(dest_path)} ] && echo 1"])
+            failed = False
+            
+            def _cb(line):
+                nonlocal failed
+                if "[ERROR]" in line or "error:" in line.lower():
+                    failed = True
+                cur, tot = self._parse_adb_line(line)
+                if cur is not None and tot == 100:
+                    UI.post(bar, self._update_progress, bar, lbl, cur, 100, f"Uploading... {cur}%")
+            with ACTION_LOG.timed("push", cln, src=src_folder, dest=dest_path) as rec:
+                code = self.bk.run_live([xadb_core.ADB_PATH, "-s", cln, "push", src_folder, dest_path], _cb, cancel=stop)
+                if code is None and stop.is_set():
+                    rec["result"] = "cancelled"
+                elif failed:
+                    rec["result"] = "error"
+            if stop.is_set():
+                if not existed:
+                    self.bk.run([xadb_core.ADB_PATH, "-s", cln, "shell", f"rm -rf {shlex.quote(dest_path)}"])
+                self._progress_cancelled(pframe, bar, lbl, self.fm_console,
+                                         f"✗ Upload of '{os.path.basename(src_folder)}' cancelled.")
+            elif failed:
+                self.fm_console.log(f"✗ Failed to upload folder '{os.path.basename(src_folder)}'")
+                UI.post(bar, self._update_progress, bar, lbl, 0, 1, "✗ Upload failed")
+            else:
+                msg = f"✓ Uploaded {total_files} file(s) successfully."
+                UI.post(bar, self._update_progress, bar, lbl, 1, 1, msg)
+                self.fm_console.log(msg)
+                UI.post(pframe, self.after, 3000, pframe.destroy)
+            UI.post("fm reload", self.after, 500, self.fm_load)
+        pframe.task = self.run_bg(_upload, lane="transfer")
+        return pframe.task
+    # ==================== HELPER FUNCTIONS ====================
+    def _select_save_dir(self, title="Save to"):
+        """Select save directory using crossfiledialog on Linux, tkinter elsewhere."""
+        if sys.platform != 'nt':
+            try:
+                import crossfiledialog
+                d = crossfiledialog.choose_folder(title=title)
+                if d and os.path.isdir(d):
+                    return d
+            except Exception as e:
+                print(f"crossfiledialog failed ({e}), falling back to tkinter")
+        from tkinter import filedialog
+        return filedialog.askdirectory(title=title) or None
+
+    def _select_files(self):
+        """Select files using platform-appropriate dialog"""
+        
+        # Try crossfiledialog first on non-Windows systems
+        if sys.platform != 'nt':  # Not Windows - could be Linux/Mac
+            try:
+                import crossfiledialog
+                
+                filter_dict = {
+                    "All Files": ["*.*"],
+                }
+                files = crossfiledialog.open_multiple(
+                    title="Select Files to Upload",
+                    start_dir=self.cur_path,
+                    filter=filter_dict
+                )
+                
+                # ← FIXED: Check for None AND empty list from cancel
+                if files is not None and len(files) > 0:
+                    return files
+                
+            except Exception as e:
+                print(f"crossfiledialog failed ({e}), falling back to tkinter")
+        
+        # ← FALLBACK TO ORIGINAL TKTINER (WORKS ON WINDOWS & LINUX!)
+        from tkinter import filedialog
+        
+        try:
+            files = filedialog.askopenfilenames(
+                parent=self.master,
+                title="Select Files to Upload",
+                initialdir=self.cur_path
+            )
+            
+            # ← FIXED: Convert tuple to list and check properly
+            if not files or len(files) == 0:
+                return []
+                
+            return list(files)
+        except Exception as e:
+            CustomDialog(self, title="Error", message=f"File dialog failed: {e}", icon="cancel", option_1="Ok")
+            return []
+            
+    def _select_folder(self):
+        """Select folder using platform-appropriate dialog"""
+        
+        # Try crossfiledialog first on non-Windows systems
+        if sys.platform != 'nt':  # Not Windows - could be Linux/Mac
+            try:
+                import crossfiledialog
+                src_folder = crossfiledialog.choose_folder(
+                    title="Select Folder to Upload",
+                    start_dir=self.cur_path
+                )
+                
+                if src_folder and os.path.isdir(src_folder):
+                    return src_folder
+                    
+            except Exception as e:
+                print(f"crossfiledialog failed ({e}), falling back to tkinter")
+        
+        # ← FALLBACK TO ORIGINAL TKTINER (WORKS ON WINDOWS & LINUX!)
+        from tkinter import filedialog
+        
+        try:
+            src_folder = filedialog.askdirectory(
+                parent=self.master,
+                title="Select Folder to Upload",
+                initialdir=self.cur_path
+            )
+            
+            if not src_folder:
+                return None
+                
+            return src_folder
+        except Exception as e:
+            CustomDialog(self, title="Error", message=f"Folder dialog failed: {e}", icon="cancel", option_1="Ok")
+            return None
+
+    # ==================== PROGRESS BAR ====================
+
+    def _show_progress(self, label="Transferring...", anchor_widget=None):
+        """
+        Create and pack a progress bar + label above the given console. Returns
+        (frame, bar, lbl). Set frame.task to the operation's TaskFuture so the
+        frame's Cancel button can stop it.
+        """
+        if anchor_widget is None:
+            # Auto-detect: prefer fm_console, then fb_console
+            anchor_widget = getattr(self, 'fm_console', None) or getattr(self, 'fb_console', None)
+        frame = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=10)
+        if anchor_widget and anchor_widget.winfo_exists():
+            frame.pack(fill="x", pady=(5, 0), before=anchor_widget)
+        else:
+            frame.pack(fill="x", pady=(5, 0))
+        top = ctk.CTkFrame(frame, fg_color="transparent")
+        top.pack(fill="x", padx=12, pady=(8, 2))
+        lbl = ctk.CTkLabel(top, text=label, font=(F_UI, 12), text_color=C["text_main"])
+        lbl.pack(side="left")
+        frame.task = None
+        frame.lbl = lbl
+        frame.cancel_btn = ctk.CTkButton(top, text="Cancel", width=70, height=22, font=(F_UI, 11),
+                                         fg_color=C["input_bg"], hover_color=C["danger"],
+                                         text_color=C["text_main"],
+                                         command=lambda: self._cancel_progress(frame))
+        frame.cancel_btn.pack(side="right")
+        bar = ctk.CTkProgressBar(frame, height=14, corner_radius=7,
+                                  fg_color=C["input_bg"], progress_color=C["primary"])
+        bar.set(0)
+        bar.pack(fill="x", padx=12, pady=(0, 8))
+        return frame, bar, lbl
+
+    def _cancel_progress(self, frame):
+        """Cancel button: stop the task bound to this progress frame."""
+        task = frame.task
+        if task is None or task.done():
+            return
+        task.cancel()
+        frame.cancel_btn.configure(state="disabled", text="Cancelling...")
+        if task.cancelled():  # still queued, so the task itself will never report it
+            frame.lbl.configure(text="✗ Cancelled")
+            self.after(3000, frame.destroy)
+
+    def _progress_cancelled(self, pframe, bar, lbl, console, message):
+        """Report a cancelled operation on its progress frame and console (from the worker)."""
+        UI.post(bar, self._update_progress, bar, lbl, 0, 1, "✗ Cancelled")
+        console.log(message)
+        UI.post(pframe, self.after, 3000, pframe.destroy)
+
+    @staticmethod
+    def _discard_partial(path, existed):
+        """Remove what a cancelled pull left at `path`; anything that was already there is kept."""
+        if existed or not os.path.exists(path):
+            return
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError:
+            pass
+
+    def _update_progress(self, bar, lbl, current, total, label=""):
+        if total > 0:
+            bar.set(min(current / total, 1.0))
+        if label:
+            lbl.configure(text=label)
+
+    def _parse_adb_line(self, line):
+        """
+        Parse ADB push/pull progress lines.
+        ADB prints lines like:
+          /sdcard/file.rar: 1 file pulled, 0 skipped. 18.3 MB/s (524288000 bytes in 27.338s)
+          [ 23%] /sdcard/file.rar
+        Returns (current_bytes, total_bytes) or (None, None) if not a progress line.
+        """
+        # Final summary line: "(524288000 bytes in 27.338s)"
+        m = re.search(r'\((\d+)\s+bytes\s+in\s+[\d.]+s\)', line)
+        if m:
+            b = int(m.group(1))
+            return b, b  # 100% complete
+
+        # Percentage line: "[ 23%] ..."  — ADB only prints this for multi-file pulls
+        m = re.search(r'\[\s*(\d+)%\]', line)
+        if m:
+            pct = int(m.group(1))
+            return pct, 100  # treat as percentage units
+
+        return None, None
+
+    # ==================== DOWNLOAD (PULL) OPERATIONS ====================
+
+    def _get_android_file_size(self, cln, path):
+        """Get Android device file size using stat command"""
+        try:
+            out = self.bk.run([xadb_core.ADB_PATH, "-s", cln, "shell", f"stat -c %s '{path}'"])
+            return int(out.strip())
+        except Exception:
+            return 0
+
+    def _fmt(self, b):
+        for u in ['B','KB','MB','GB']:
+            if b < 1024: return f"{b:.1f} {u}"
+            b /= 1024
+        return f"{b:.1f} TB"
+
+    def fm_download_single(self, name=None):
+        """Download single file from device with real progress bar"""
+        if not self.sel_dev:
+            CustomDialog(self, title="Error", message="No device connected!", icon="cancel", option_1="Ok")
+            return
+
+        if name is None:
+            name = self.fm_sel
+
+        if not name:
+            self.fm_console.log("No item selected.")
+            return
+
+        if name.endswith("/"):
+            self.fm_console.log("Cannot download a folder. Right-click a file instead.")
+            return
+
+        cln = self.sel_dev.split()[0]
+        d = self._select_save_dir("Save to")
+        if not d:
+            return
+
+        src_path = f"{self.cur_path.rstrip('/')}/{name}"
+
+        # Build progress bar on main thread before starting bg thread
+        pframe, bar, lbl = self._show_progress(f"Downloading {name}...")
+
+        def _download():
+            stop = SCHEDULER.current().stop
+            local_path = os.path.join(d, name)
+            existed = os.path.exists(local_path)
+            total = self._get_android_file_size(cln, src_path)
+            self.fm_console.log(f"Downloading {name}... ({self._fmt(total)})")
+
+            failed = False
+            last_line = ""
+
+            def _cb(line):
+                nonlocal failed, last_line
+                last_line = line
+                if "[ERROR]" in line or "error:" in line.lower():
+                    failed = True
+                cur, tot = self._parse_adb_line(line)
+                if cur is not None:
+                    if tot == 100:  # percentage mode
+                        UI.post(bar, self._update_progress, bar, lbl,
+                                cur, tot, f"Downloading {name}... {cur}%")
+                    else:  # bytes mode
+                        use_total = total if total > 0 else tot
+                        UI.post(bar, self._update_progress, bar, lbl,
+                                cur, use_total, f"Downloading {name}... {self._fmt(cur)} / {self._fmt(use_total)}")
+
+            with ACTION_LOG.timed("pull", cln, src=src_path, dest=d) as rec:
+                code = self.bk.run_live([xadb_core.ADB_PATH, "-s", cln, "pull", src_path, d], _cb, cancel=stop)
+                if code is None and stop.is_set():
+                    rec["result"] = "cancelled"
+                elif failed:
+                    rec["result"] = "error"
+
+            if stop.is_set():
+                self._discard_partial(local_path, existed)
+                self._progress_cancelled(pframe, bar, lbl, self.fm_console, f"✗ Cancelled: {name}")
+            elif failed:
+                self.fm_console.log(f"✗ Failed: {name} — {last_line}")
+                UI.post(bar, self._update_progress, bar, lbl, 0, 1, f"✗ Failed: {name}")
+            else:
+                UI.post(bar, self._update_progress, bar, lbl, 1, 1, f"✓ Done: {name} ({self._fmt(total)})")
+                self.fm_console.log(f"✓ Done: {name} ({self._fmt(total)})")
+                UI.post(pframe, self.after, 3000, pframe.destroy)  # auto-hide after 3s
+
+        pframe.task = self.run_bg(_download, lane="transfer")
+        return pframe.task
+
+
+    def fm_download_multiple(self):
+        """Download multiple selected files with progress"""
+        if not self.fm_selected:
+            CustomDialog(self, title="Error", message="No items selected!", icon="cancel", option_1="Ok")
+            return
+
+        if not self.sel_dev:
+            CustomDialog(self, title="Error", message="No device connected!", icon="cancel", option_1="Ok")
+            return
+
+        cln = self.sel_dev.split()[0]
+        d = self._select_save_dir("Save to")
+        if not d:
+            return
+
+        selected = list(self.fm_selected)
+        total_files = len(selected)
+        pframe, bar, lbl = self._show_progress(f"Downloading 0/{total_files}...")
+
+        def _download():
+            stop = SCHEDULER.current().stop
+            done = 0
+            for i, name in enumerate(selected):
+                if stop.is_set():
+                    break
+                src_path = f"{self.cur_path.rstrip('/')}/{name.rstrip('/')}"
+                local_path = os.path.join(d, name.rstrip('/'))
+                existed = os.path.exists(local_path)
+                UI.post(bar, self._update_progress, bar, lbl, i, total_files,
+                        f"Downloading {name} ({i+1}/{total_files})...")
+                self.fm_console.log(f"Downloading {name}...")
+
+                failed = False
+                def _cb(line, n=name):
+                    nonlocal failed
+                    if "[ERROR]" in line or "error:" in line.lower():
+                        failed = True
+
+                with ACTION_LOG.timed("pull", cln, src=src_path, dest=d) as rec:
+                    code = self.bk.run_live([xadb_core.ADB_PATH, "-s", cln, "pull", src_path, d], _cb, cancel=stop)
+                    if code is None and stop.is_set():
+                        rec["result"] = "cancelled"
+                    elif failed:
+                        rec["result"] = "error"
+
+                if stop.is_set():
+                    self._discard_partial(local_path, existed)
+                    break
+                if failed:
+                    self.fm_console.log(f"✗ Failed: {name}")
+                else:
+                    done += 1
+
+            if stop.is_set():
+                self._progress_cancelled(pframe, bar, lbl, self.fm_console,
+                                         f"✗ Download cancelled ({done}/{total_files} file(s) downloaded).")
+                return
+
+            failed_count = total_files - done
+            msg = f"✓ Downloaded {done}/{total_files} file(s)."
+            if failed_count:
+                msg += f" ({failed_count} failed)"
+            UI.post(bar, self._update_progress, bar, lbl, 1, 1, msg)
+            self.fm_console.log(msg)
+            UI.post(pframe, self.after, 3000, pframe.destroy)
+
+        pframe.task = self.run_bg(_download, lane="transfer")
+        return pframe.task
+
+
+    # --- SHELL ---
+    def view_shell(self):
+        if not self._enter_view("Shell"):
+            return
+        import tkinter as tk
+
+        self._shell_su = False
+        self._shell_cwd = "/"
+        self._shell_device_name = self.sel_dev.split()[0] if self.sel_dev else "device"
+        self._shell_input_buf = ""
+        self._shell_input_start = "input_start"  # Text mark, so trimming scrollback doesn't shift it
+        self._shell_history = getattr(self, "_shell_history", [])  # kept across devices
+        self._shell_history_idx = -1
+        self._shell_alive = True
+        self._shell_busy = False
+        self._shell_interrupting = False
+        self._shell_pending = []
+        self._shell_pending_lock = threading.Lock()
+        self._shell_tab_pending = False
+
+        # Title bar
+        title_row = ctk.CTkFrame(self.main, fg_color="transparent")
+        title_row.pack(fill="x", pady=(10, 6))
+        ctk.CTkLabel(title_row, text="ADB Shell Terminal",
+                     font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(side="left")
+        ctk.CTkButton(title_row, text="Clear", width=70, height=30,
+                      fg_color=C["input_bg"], text_color=C["text_main"],
+                      font=(F_UI, 11), command=self._shell_clear).pack(side="right", padx=4)
+
+        # Single full black terminal - no separate input box at all
+        term_frame = ctk.CTkFrame(self.main, fg_color="#000000", corner_radius=10)
+        term_frame.pack(fill="both", expand=True)
+
+        self._shell_text = tk.Text(
+            term_frame,
+            font=(F_MONO, 12),
+            bg="#000000", fg="#00FF00",
+            insertbackground="#00FF00",
+            selectbackground="#1a4a1a",
+            selectforeground="#00FF00",
+            relief="flat", borderwidth=0,
+            wrap="char", undo=False,
+            state="normal",
+        )
+        vsb = tk.Scrollbar(term_frame, command=self._shell_text.yview,
+                           bg="#111111", troughcolor="#000000",
+                           activebackground="#333333", relief="flat", width=10)
+        self._shell_text.configure(yscrollcommand=vsb.set)
+        vsb.pack(side="right", fill="y")
+        self._shell_text.pack(side="left", fill="both", expand=True, padx=6, pady=6)
+
+        self._shell_text.tag_configure("err",    foreground="#FF4444")
+        self._shell_text.tag_configure("warn",   foreground="#FFD700")
+        self._shell_text.tag_configure("ok",     foreground="#00FF00")
+        self._shell_text.tag_configure("dim",    foreground="#888888")
+        self._shell_text.tag_configure("prompt", foreground="#00FF00")
+        self._shell_text.mark_set("input_start", "1.0")
+        self._shell_text.mark_gravity("input_start", "left")
+
+        # Bind keys - block all default behaviour, handle everything manually
+        self._shell_text.bind("<Key>",            self._shell_key)
+        self._shell_text.bind("<Return>",         self._shell_on_enter)
+        self._shell_text.bind("<BackSpace>",      self._shell_backspace)
+        self._shell_text.bind("<Delete>",         lambda e: "break")
+        self._shell_text.bind("<Up>",             self._shell_history_up)
+        self._shell_text.bind("<Down>",           self._shell_history_down)
+        self._shell_text.bind("<Home>",           self._shell_home)
+        self._shell_text.bind("<End>",            lambda e: (self._shell_text.mark_set("insert","end"), "break")[1])
+        self._shell_text.bind("<Left>",           self._shell_left)
+        self._shell_text.bind("<Right>",          self._shell_right)
+        self._shell_text.bind("<Control-c>",      self._shell_ctrl_c)
+        self._shell_text.bind("<Control-l>",      lambda e: (self._shell_clear(), self._shell_show_prompt(), "break")[2])
+        self._shell_text.bind("<Control-a>",      self._shell_select_input)
+        self._shell_text.bind("<Control-u>",      self._shell_kill_line)
+        self._shell_text.bind("<Tab>",            self._shell_tab)
+        self._shell_text.bind("<Button-1>",       lambda e: self._shell_text.after(1, self._shell_clamp_cursor))
+        self._shell_text.bind("<<Paste>>",        self._shell_paste)
+        self._shell_text.bind("<Control-v>",      self._shell_paste)
+        self._shell_text.bind(RIGHT_CLICK,        self._shell_right_click)
+        self._shell_text.focus_set()
+
+        if not self.sel_dev:
+            self._shell_raw_write("[No device connected]\n", "err")
+        else:
+            def _init():
+                result = self._shell_run_cmd("getprop ro.product.device").strip()
+                if result and not result.startswith(("[error", "[timeout")):
+                    self._shell_device_name = result
+                self.after(0, self._shell_show_prompt)
+            self.run_bg(_init, lane="shell")
+
+    def _shell_make_prompt(self):
+        symbol = "#" if CONF.get("use_su", False) or self._shell_su else "$"
+        name = getattr(self, "_shell_device_name", "device")
+        return f"{name}:{self._shell_cwd} {symbol} "
+
+    def _shell_show_prompt(self):
+        """Write a new prompt line and position cursor after it."""
+        p = self._shell_make_prompt()
+        self._shell_text.insert("end", p, "prompt")
+        self._shell_text.see("end")
+        self._shell_text.mark_set("input_start", "end-1c")
+        self._shell_input_buf = ""
+        self._shell_history_idx = -1
+        self._shell_text.mark_set("insert", "end")
+
+    def _shell_raw_write(self, text, tag="ok"):
+        """Insert text directly into terminal (never disables the widget)."""
+        try:
+            self._shell_text.insert("end", text, tag)
+            self._shell_text.see("end")
+        except Exception:
+            pass
+
+    def _shell_clamp_cursor(self):
+        """Keep cursor inside the current input area."""
+        try:
+            if self._shell_text.compare("insert", "<", self._shell_input_start):
+                self._shell_text.mark_set("insert", "end")
+        except Exception:
+            pass
+
+    def _shell_right_click(self, event):
+        """Right-click: copy selected text if any, else paste clipboard."""
+        try:
+            sel = self._shell_text.get("sel.first", "sel.last")
+            if sel:
+                # Has selection — copy it
+                self.clipboard_clear()
+                self.clipboard_append(sel)
+            else:
+                # Nothing selected — paste
+                self._shell_paste(event)
+        except Exception:
+            # No selection tag present — paste
+            self._shell_paste(event)
+        return "break"
+
+    # ── Input position helpers ─────────────────────────────────────────────
+    def _shell_cursor_offset(self):
+        """How many chars into _shell_input_buf is the cursor."""
+        try:
+            cur = self._shell_text.index("insert")
+            start = self._shell_input_start
+            # count chars between start and cursor
+            text = self._shell_text.get(start, cur)
+            return len(text)
+        except Exception:
+            return len(self._shell_input_buf)
+
+    def _shell_left(self, event):
+        try:
+            if self._shell_text.compare("insert", ">", self._shell_input_start):
+                self._shell_text.mark_set("insert", "insert-1c")
+        except Exception:
+            pass
+        return "break"
+
+    def _shell_right(self, event):
+        self._shell_text.mark_set("insert", "insert+1c")
+        return "break"
+
+    def _shell_home(self, event):
+        self._shell_text.mark_set("insert", self._shell_input_start)
+        return "break"
+
+    def _shell_select_input(self, event):
+        """Ctrl+A: move cursor to start of input."""
+        self._shell_text.mark_set("insert", self._shell_input_start)
+        return "break"
+
+    def _shell_kill_line(self, event):
+        """Ctrl+U: clear current input."""
+        try:
+            self._shell_text.delete(self._shell_input_start, "end-1c")
+            self._shell_input_buf = ""
+        except Exception:
+            pass
+        return "break"
+
+    def _shell_ctrl_c(self, event):
+        """Ctrl+C: signal the running command, or cancel current input and show new prompt."""
+        if self._shell_busy:
+            sess = self._shell_session() if self.sel_dev else None
+            if not sess:
+                return "break"
+            self._shell_raw_write("^C\n", "err")
+            if self._shell_interrupting:
+                # Second ^C while the first is still pending: drop the session
+                self._shell_raw_write("[session reset]\n", "warn")
+                sess.close()
+            else:
+                self._shell_interrupting = True
+                def _int():
+                    sess.interrupt()
+                    self._shell_interrupting = False
+                self.run_bg(_int, lane=None)
+            return "break"
+        self._shell_raw_write("^C\n", "err")
+        self._shell_input_buf = ""
+        self._shell_show_prompt()
+        return "break"
+
+    # ── Keystroke handlers ─────────────────────────────────────────────────
+    def _shell_key(self, event):
+        """Handle printable keystrokes."""
+        if event.state & 0x4:  # Ctrl held - let bound shortcuts handle it
+            return
+        if self._shell_busy:  # the command's stdin is /dev/null; nothing to type into
+            return "break"
+        if event.char and event.char.isprintable():
+            # Insert at cursor position (which is clamped inside input area)
+            self._shell_clamp_cursor()
+            cur_offset = self._shell_cursor_offset()
+            self._shell_text.insert("insert", event.char, "ok")
+            self._shell_input_buf = self._shell_input_buf[:cur_offset] + event.char + self._shell_input_buf[cur_offset:]
+            self._shell_text.see("end")
+            return "break"
+
+    def _shell_backspace(self, event):
+        """Backspace: remove char before cursor if inside input area."""
+        try:
+            if self._shell_text.compare("insert", ">", self._shell_input_start):
+                cur_offset = self._shell_cursor_offset()
+                self._shell_text.delete("insert-1c", "insert")
+                if cur_offset > 0:
+                    self._shell_input_buf = self._shell_input_buf[:cur_offset-1] + self._shell_input_buf[cur_offset:]
+        except Exception:
+            pass
+        return "break"
+
+    def _shell_paste(self, event):
+        """Ctrl+V / Paste: insert clipboard at cursor."""
+        try:
+            text = self._shell_text.clipboard_get()
+            # Only use first line to avoid multiline paste chaos
+            text = text.split("\n")[0]
+            cur_offset = self._shell_cursor_offset()
+            for ch in text:
+                if ch.isprintable():
+                    self._shell_text.insert("insert", ch, "ok")
+                    self._shell_input_buf = self._shell_input_buf[:cur_offset] + ch + self._shell_input_buf[cur_offset:]
+                    cur_offset += 1
+            self._shell_text.see("end")
+        except Exception:
+            pass
+        return "break"
+
+    # ── History ────────────────────────────────────────────────────────────
+    def _shell_history_up(self, event):
+        if not self._shell_history:
+            return "break"
+        if self._shell_history_idx < len(self._shell_history) - 1:
+            self._shell_history_idx += 1
+        self._shell_set_input(self._shell_history[self._shell_history_idx])
+        return "break"
+
+    def _shell_history_down(self, event):
+        if self._shell_history_idx > 0:
+            self._shell_history_idx -= 1
+            self._shell_set_input(self._shell_history[self._shell_history_idx])
+        else:
+            self._shell_history_idx = -1
+            self._shell_set_input("")
+        return "break"
+
+    def _shell_set_input(self, text):
+        """Replace current input line with text."""
+        try:
+            self._shell_text.delete(self._shell_input_start, "end-1c")
+            self._shell_text.insert("end", text, "ok")
+            self._shell_input_buf = text
+            self._shell_text.mark_set("insert", "end")
+        except Exception:
+            pass
+
+    # ── Command execution ──────────────────────────────────────────────────
+    def _shell_on_enter(self, event=None):
+        if self._shell_busy:
+            return "break"
+        cmd = self._shell_input_buf.strip()
+        self._shell_raw_write("\n")
+        self._shell_input_buf = ""
+
+        if not cmd:
+            self._shell_show_prompt()
+            return "break"
+
+        # Save to history (save raw cmd, before su wrapping)
+        if not self._shell_history or self._shell_history[0] != cmd:
+            self._shell_history.insert(0, cmd)
+            if len(self._shell_history) > 100:
+                self._shell_history.pop()
+
+        # Built-ins handled locally
+        if cmd == "clear":
+            self._shell_text.delete("1.0", "end")
+            self._shell_show_prompt()
+            return "break"
+
+        if cmd == "exit" and not self._shell_su:
+            self._shell_show_prompt()
+            return "break"
+
+        term = self._shell_text
+
+        def _run():
+            if cmd in ("su", "exit"):
+                # Both must read the session's stdin, so they go in unwrapped
+                sess = self._shell_session()
+                out, _ = sess.run(cmd, raw=True, timeout=30)
+                self._shell_cwd = sess.cwd
+                was_su, self._shell_su = self._shell_su, sess.uid == 0
+                if was_su != self._shell_su:
+                    self._shell_index().clear()  # listings differ per uid
+                if out:
+                    UI.post(None, self._shell_raw_write, out, "err")
+                if self._shell_su and not was_su:
+                    UI.post(None, self._shell_raw_write, "[su mode enabled]\n", "warn")
+                elif was_su and not self._shell_su:
+                    UI.post(None, self._shell_raw_write, "[returned to normal shell]\n", "dim")
+                elif cmd == "su":
+                    UI.post(None, self._shell_raw_write, "[su failed]\n", "err")
+            else:
+                # No timeout: long commands stream until they finish or get ^C
+                sess = self._shell_session()
+                cwd = sess.cwd
+                with ACTION_LOG.timed("shell", sess.serial, cmd=cmd, cwd=cwd, root=sess.uid == 0) as rec:
+                    _, code = sess.run(cmd, on_output=self._shell_stream)
+                    rec.update(code=code, result="ok" if code == 0 else "error")
+                self._shell_cwd = sess.cwd
+                self._shell_index().note_command(cmd, cwd)
+            UI.post(None, self._shell_finish, term)
+
+        self._shell_busy = True
+        self.run_bg(_run, lane="shell")
+        return "break"
+
+    # ── Tab completion ─────────────────────────────────────────────────────
+    def _shell_tab(self, event=None):
+        """Complete the word before the cursor from the device's path/command cache."""
+        if self._shell_busy or not self.sel_dev:
+            return "break"
+        idx = self._shell_index()
+        buf = self._shell_input_buf
+        line = buf[:self._shell_cursor_offset()]
+        start, cands = idx.complete(line, self._shell_cwd)
+        if isinstance(cands, str):
+            # Cache miss: one listing round trip, then try again if nothing was typed meanwhile
+            if self._shell_tab_pending:
+                return "break"
+            self._shell_tab_pending = True
+
+            def _fetch(what=cands):
+                if what == "$PATH":
+                    idx.fetch_commands()
+                else:
+                    idx.fetch(what)
+
+                def _retry():
+                    self._shell_tab_pending = False
+                    if self._shell_alive and self._shell_input_buf == buf and not self._shell_busy:
+                        self._shell_tab()
+                UI.post(None, _retry)
+            self.run_bg(_fetch, lane=None)  # the index has its own session; don't queue behind a command
+            return "break"
+
+        word = line[start:]
+        common = os.path.commonprefix(cands) if cands else ""
+        if len(common) > len(word) or len(cands) == 1:
+            new = line[:start] + common
+            self._shell_set_input(new + buf[len(line):])
+            self._shell_text.mark_set("insert", f"input_start+{len(new)}c")
+        elif len(cands) > 1:
+            # Ambiguous: list the choices under the prompt, bash style
+            names = [posixpath.basename(c.rstrip(" /")) + ("/" if c.endswith("/") else "")
+                     for c in cands[:300]]
+            more = f"  ... ({len(cands) - 300} more)" if len(cands) > 300 else ""
+            self._shell_raw_write("\n" + "  ".join(names) + more + "\n", "dim")
+            self._shell_show_prompt()
+            self._shell_set_input(buf)
+            self._shell_text.mark_set("insert", f"input_start+{len(line)}c")
+        else:
+            self.bell()
+        return "break"
+
+    # ── Streaming output ───────────────────────────────────────────────────
+    SHELL_SCROLLBACK = 5000  # lines kept in the terminal
+
+    def _shell_stream(self, text):
+        """Reader-thread callback: queue output for one coalesced insert per UI frame."""
+        with self._shell_pending_lock:
+            self._shell_pending.append(text)
+        UI.post("shell output", self._shell_flush)
+
+    def _shell_flush(self):
+        with self._shell_pending_lock:
+            chunks, self._shell_pending = self._shell_pending, []
+        if not chunks or not self._shell_alive:
+            return
+        text = "".join(chunks)
+        tag = "err" if any(
+            p in text.lower()
+            for p in ("error", "denied", "not found", "exception", "permission")
+        ) else "ok"
+        self._shell_raw_write(text, tag)
+        self._trim_shell_scrollback()
+
+    def _shell_finish(self, term):
+        if term is not getattr(self, "_shell_text", None):
+            return  # finished after the view was left and rebuilt
+        self._shell_flush()
+        self._shell_busy = False
+        self._shell_interrupting = False
+        if self._shell_alive:
+            self._shell_show_prompt()
+
+    def _trim_shell_scrollback(self):
+        try:
+            lines = int(self._shell_text.index("end-1c").split(".")[0])
+            if lines > self.SHELL_SCROLLBACK:
+                self._shell_text.delete("1.0", f"{lines - self.SHELL_SCROLLBACK + 1}.0")
+        except Exception:
+            pass
+
+    def _shell_session(self):
+        """The device's interactive session; a root one when "Use Super User" is on."""
+        return self.bk.shell_session(self.sel_dev.split()[0], root=CONF.get("use_su", False))
+
+    def _shell_index(self):
+        return self.bk.path_index(self.sel_dev.split()[0], root=CONF.get("use_su", False))
+
+    def _shell_run_cmd(self, cmd):
+        """Run a command in the device's persistent shell session; cwd, env and su carry over."""
+        if not self.sel_dev:
+            return "[No device]\n"
+        sess = self._shell_session()
+        out, _ = sess.run(cmd, timeout=15)
+        self._shell_cwd = sess.cwd
+        return out
+
+    def _shell_write(self, text, tag="ok"):
+        self._shell_raw_write(text, tag)
+
+    def _shell_clear(self):
+        try:
+            self._shell_text.delete("1.0", "end")
+            self._shell_show_prompt()
+        except Exception:
+            pass
+
+    # Legacy stubs
+    def _shell_stop(self):
+        self._shell_alive = False
+        if getattr(self, "_shell_busy", False) and self.sel_dev:
+            # Leaving the view: don't leave the command running in the session
+            sess = self._shell_session()
+            self.run_bg(sess.interrupt, lane=None)
+    def _shell_reconnect(self): self.rebuild_view("Shell", self.view_shell)
+    def start_shell_session(self): pass
+    def clear_terminal(self): self._shell_clear()
+    def append_shell_output(self, text): self._shell_raw_write(text)
+    def _run_shell(self): pass
+    def execute_shell_command(self, event): return "break" if event else None
+    
+    # --- PROCESSES ---
+    PROC_COLUMNS = (("pid", "PID", 70), ("user", "User", 110), ("state", "S", 40),
+                    ("cpu", "CPU %", 80), ("rss", "RSS", 100), ("name", "Name", 420))
+
+    def view_processes(self):
+        if not self._enter_view("Processes"):
+            return
+        from tkinter import ttk
+        ctk.CTkLabel(self.main, text="Processes", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(10, 20))
+
+        bar = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=10)
+        bar.pack(fill="x", pady=(0, 10))
+        self.proc_filter = ctk.CTkEntry(bar, placeholder_text="Filter by name, user or PID...", border_width=0,
+                                        fg_color=C["input_bg"], height=36, text_color=C["text_main"])
+        self.proc_filter.pack(side="left", fill="x", expand=True, padx=10, pady=10)
+        self.proc_filter.bind("<KeyRelease>", lambda e: self._proc_refresh())
+        ctk.CTkButton(bar, text="Force Stop", width=100, fg_color=C["warning"],
+                      command=lambda: self._proc_action("force-stop")).pack(side="left", padx=5)
+        ctk.CTkButton(bar, text="Kill", width=80, fg_color=C["danger"],
+                      command=lambda: self._proc_action("kill")).pack(side="left", padx=(5, 10))
+
+        dark = ctk.get_appearance_mode() == "Dark"
+        style = ttk.Style(self)
+        style.theme_use("default")
+        style.configure("Proc.Treeview", background=C["term_bg"][dark], fieldbackground=C["term_bg"][dark],
+                        foreground=C["text_main"][dark], rowheight=24, borderwidth=0, font=(F_MONO, 11))
+        style.configure("Proc.Treeview.Heading", background=C["input_bg"][dark], foreground=C["text_main"][dark],
+                        relief="flat", font=(F_UI, 11, "bold"))
+        style.map("Proc.Treeview", background=[("selected", C["primary"])])
+
+        frame = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=10)
+        frame.pack(fill="both", expand=True)
+        tree = ttk.Treeview(frame, columns=[c for c, _, _ in self.PROC_COLUMNS], show="headings",
+                            style="Proc.Treeview", selectmode="extended")
+        for key, heading, width in self.PROC_COLUMNS:
+            tree.heading(key, text=heading, command=lambda k=key: self._proc_sort_by(k))
+            tree.column(key, width=width, anchor="w" if key in ("user", "name") else "e",
+                        stretch=key == "name")
+        scroll = ctk.CTkScrollbar(frame, command=tree.yview)
+        tree.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y", padx=(0, 4), pady=4)
+        tree.pack(fill="both", expand=True, padx=(6, 0), pady=6)
+        self.proc_tree = tree
+
+        self.proc_status = ctk.CTkLabel(self.main, text="Starting top...", font=(F_UI, 11), text_color=C["text_sub"])
+        self.proc_status.pack(anchor="w", pady=(5, 0))
+        self.proc_console = LogConsole(self.main, height=110)
+        self.proc_console.pack(fill="x", pady=(5, 0))
+
+        self._proc_rows = {}
+        self._proc_values = {}  # iid -> values last written to the tree
+        self._proc_sort = getattr(self, "_proc_sort", ("cpu", True))
+        if not self.sel_dev or "ADB" not in self.sel_dev:
+            self.proc_status.configure(text="No device connected.")
+            self._proc_mon = None  # nothing to start or resume until a device is picked
+            return
+        mon = self._proc_mon = ProcessMonitor(self.sel_dev.split()[0], CONF.get("process_interval", 2))
+        mon.on_frame = lambda rows: UI.post(("processes", id(mon)), self._proc_frame, mon, rows)
+        mon.start()
+
+    def _proc_frame(self, mon, rows):
+        if mon is not self._proc_mon:
+            return  # frame from a monitor that has since been replaced
+        self._proc_rows = rows
+        self._proc_refresh()
+
+    def _proc_sort_by(self, key):
+        cur, desc = self._proc_sort
+        self._proc_sort = (key, not desc if key == cur else key in ("cpu", "rss"))
+        self._proc_refresh()
+
+    def _proc_refresh(self):
+        """Filter and sort the last frame and apply it to the tree in place (no re-query)."""
+        tree = self.proc_tree
+        needle = self.proc_filter.get().strip().lower()
+        rows = [r for r in self._proc_rows.values()
+                if not needle or needle in r["name"].lower() or needle in r["user"].lower()
+                or needle == str(r["pid"])]
+        key, desc = self._proc_sort
+        rows.sort(key=lambda r: r[key], reverse=desc)
+
+        wanted = {str(r["pid"]) for r in rows}
+        gone = [iid for iid in tree.get_children() if iid not in wanted]
+        if gone:
+            tree.delete(*gone)
+            for iid in gone:
+                self._proc_values.pop(iid, None)
+        for i, r in enumerate(rows):
+            iid = str(r["pid"])
+            rss = r["rss"]
+            values = (r["pid"], r["user"], r["state"], f"{r['cpu']:.1f}",
+                      f"{rss / 1024:.1f} MB" if rss >= 1024 else f"{rss:.0f} KB", r["name"])
+            if not tree.exists(iid):
+                tree.insert("", i, iid=iid, values=values)
+                self._proc_values[iid] = values
+                continue
+            if self._proc_values.get(iid) != values:
+                tree.item(iid, values=values)
+                self._proc_values[iid] = values
+            if tree.index(iid) != i:
+                tree.move(iid, "", i)
+
+        for k, heading, _ in self.PROC_COLUMNS:
+            arrow = (" ▼" if desc else " ▲") if k == key else ""
+            tree.heading(k, text=heading + arrow)
+        total_cpu = sum(r["cpu"] for r in self._proc_rows.values())
+        self.proc_status.configure(text=f"{len(rows)} of {len(self._proc_rows)} processes · "
+                                        f"CPU {total_cpu:.0f}% · every {self._proc_mon.interval}s")
+
+    def _proc_action(self, action):
+        """Kill or force-stop every selected process with a single shell command."""
+        sel = [int(iid) for iid in self.proc_tree.selection()]
+        rows = [self._proc_rows[pid] for pid in sel if pid in self._proc_rows]
+        if not rows:
+            self.proc_console.log("No processes selected.")
+            return
+        serial = self._proc_mon.serial
+        if action == "kill":
+            what = ", ".join(f"{r['name']} ({r['pid']})" for r in rows[:5]) + (" ..." if len(rows) > 5 else "")
+            dlg = CustomDialog(self, title="Kill Processes", message=f"Send SIGKILL to {len(rows)} process(es)?\n{what}",
+                               icon="warning", option_1="Kill", option_2="Cancel")
+            if dlg.get() != "Kill":
+                return
+            script = "kill -9 " + " ".join(str(r["pid"]) for r in rows)
+        else:
+            pkgs = sorted({r["name"].split(":")[0] for r in rows if "." in r["name"] and "/" not in r["name"]})
+            if not pkgs:
+                self.proc_console.log("Selection has no app processes to force-stop.")
+                return
+            script = "; ".join(f"am force-stop {shlex.quote(p)}" for p in pkgs)
+        self.proc_console.log(f"{'Root' if CONF.get('use_su', False) else 'Shell'}: {script}")
+
+        def _t():
+            with ACTION_LOG.timed(action, serial, pids=[r["pid"] for r in rows]) as rec:
+                if CONF.get("use_su", False):
+                    out, code = self.bk.run_root(serial, ["sh", "-c", script], timeout=30)
+                else:
+                    out = self.bk.run([xadb_core.ADB_PATH, "-s", serial, "shell", script], timeout=30)
+                    code = 1 if "[ERROR]" in out or "not permitted" in out.lower() else 0
+                if code != 0:
+                    rec["result"] = "error"
+            for line in out.strip().splitlines():
+                self.proc_console.log(line)
+            self.proc_console.log("[DONE]" if code == 0 else "[FAILED] (killing other apps' processes needs root)"
+                                  if action == "kill" else "[FAILED]")
+
+        self.run_bg(_t)
+
+    # --- LOGCAT ---
+    def view_logcat(self):
+        if not self._enter_view("Logcat"):
+            return
+        import tkinter as tk
+        ctk.CTkLabel(self.main, text="Live Logcat", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(
+            anchor="w", pady=(10, 20))
+
+        bar = ctk.CTkFrame(self.main, fg_color="transparent")
+        bar.pack(fill="x", pady=10)
+        self.btn_log_start = ctk.CTkButton(bar, text="Start", fg_color=C["success"], command=self.start_logcat)
+        self.btn_log_start.pack(side="left", padx=5)
+        ctk.CTkButton(bar, text="Stop", fg_color=C["danger"], command=self.stop_logcat).pack(side="left", padx=5)
+        ctk.CTkButton(bar, text="Save Log", fg_color=C["primary"], command=self.save_logcat).pack(side="left", padx=5)
+        self._logcat_pkg_filter = ""
+        self.ent_log_pkg = ctk.CTkEntry(bar, placeholder_text="Filter by package/process...", width=220,
+                                        border_width=0, fg_color=C["input_bg"], text_color=C["text_main"])
+        self.ent_log_pkg.pack(side="left", padx=(15, 5))
+        self.ent_log_pkg.bind("<KeyRelease>", lambda e: setattr(
+            self, '_logcat_pkg_filter', self.ent_log_pkg.get().strip().lower()))
+        self.btn_log_record = ctk.CTkButton(bar, text="Record to Disk", fg_color=C["input_bg"],
+                                            text_color=C["text_main"], command=self.toggle_logcat_recording)
+        self.btn_log_record.pack(side="right", padx=5)
+        ctk.CTkButton(bar, text="Search Archive", fg_color=C["input_bg"], text_color=C["text_main"],
+                      command=self.open_logcat_search).pack(side="right", padx=5)
+        ctk.CTkButton(bar, text="Top Talkers", fg_color=C["input_bg"], text_color=C["text_main"],
+                      command=self.open_log_talkers).pack(side="right", padx=5)
+        ctk.CTkButton(bar, text="Merge Devices", fg_color=C["input_bg"], text_color=C["text_main"],
+                      command=self.open_merged_logcat).pack(side="right", padx=5)
+        self._refresh_record_button()
+
+        # Colored terminal for logcat (same style as shell)
+        term_frame = ctk.CTkFrame(self.main, fg_color="#000000", corner_radius=10)
+        term_frame.pack(fill="both", expand=True)
+
+        self._logcat_text = tk.Text(
+            term_frame,
+            font=(F_MONO, 11),
+            bg="#000000", fg="#CCCCCC",
+            insertbackground="#CCCCCC",
+            selectbackground="#1a3a4a",
+            selectforeground="#FFFFFF",
+            relief="flat", borderwidth=0,
+            wrap="char", undo=False,
+            state="disabled",
+        )
+        vsb = tk.Scrollbar(term_frame, command=self._logcat_text.yview,
+                           bg="#111111", troughcolor="#000000",
+                           activebackground="#333333", relief="flat", width=10)
+        self._logcat_text.configure(yscrollcommand=vsb.set)
+        vsb.pack(side="right", fill="y")
+        self._logcat_text.pack(side="left", fill="both", expand=True, padx=6, pady=6)
+
+        # Right-click to copy selected text in logcat
+        def _logcat_right_click(event):
+            try:
+                sel = self._logcat_text.get("sel.first", "sel.last")
+                if sel:
+                    self.clipboard_clear()
+                    self.clipboard_append(sel)
+            except Exception:
+                pass
+            return "break"
+        self._logcat_text.bind(RIGHT_CLICK, _logcat_right_click)
+
+        # Color tags per logcat level
+        self._logcat_text.tag_configure("V", foreground="#888888")  # Verbose - gray
+        self._logcat_text.tag_configure("D", foreground="#4FC3F7")  # Debug - blue
+        self._logcat_text.tag_configure("I", foreground="#81C784")  # Info - green
+        self._logcat_text.tag_configure("W", foreground="#FFD54F")  # Warning - yellow
+        self._logcat_text.tag_configure("E", foreground="#EF5350")  # Error - red
+        self._logcat_text.tag_configure("F", foreground="#FF1744")  # Fatal - bright red
+        self._logcat_text.tag_configure("default", foreground="#CCCCCC")
+        self._logcat_text.tag_configure("pkg", foreground="#9575CD")
+
+    def _logcat_write(self, line, level="default", pkg=None):
+        """Write a logcat line with color based on log level, prefixed by its process name."""
+        try:
+            self._logcat_text.configure(state="normal")
+            if pkg is not None:
+                self._logcat_text.insert("end", f"{(pkg or '?')[:32]:<32} ", "pkg", line + "\n", level)
+            else:
+                self._logcat_text.insert("end", line + "\n", level)
+            self._logcat_text.see("end")
+            self._logcat_text.configure(state="disabled")
+        except Exception:
+            pass
+
+    def _logcat_parse(self, line, pids):
+        """Split a threadtime line into (line, level, process name, pid, tag) off the Tk thread.
+        Format: "MM-DD HH:MM:SS.mmm PID TID LEVEL TAG: message" """
+        parts = line.split(None, 5)
+        if len(parts) < 6 or not parts[2].isdigit():
+            return line, "default", None, None, None
+        level = parts[4] if parts[4] in LOG_LEVELS else "default"
+        tag = parts[5].split(":", 1)[0].strip()
+        return line, level, pids.lookup(parts[2]), parts[2], tag
+
+    LOGCAT_NAME_WAIT = 2.0  # seconds a filtered line may wait for its process name
+
+    def start_logcat(self):
+        if not self.sel_dev: return
+
+        self.log_proc = True
+        self.btn_log_start.configure(state="disabled")
+        self._logcat_queue = queue.Queue()
+        clean = self.sel_dev.split()[0]
+        pids = self.bk.pid_names(clean)
+        stats = self._logcat_stats = LogRateStats()
+
+        def _loop():
+            kwargs = Backend._no_window_kwargs()
+            kwargs["stdin"] = subprocess.DEVNULL
+
+            self.adb_process = subprocess.Popen(
+                [xadb_core.ADB_PATH, "-s", clean, "logcat", "-v", "threadtime"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                encoding="utf-8",
+                errors="replace",
+                **kwargs
+            )
+
+            for line in self.adb_process.stdout:
+                if not self.log_proc:
+                    break
+                line, level, pkg, pid, tag = self._logcat_parse(line.strip(), pids)
+                if pid:
+                    stats.add(tag, pid, time.monotonic())
+                self._logcat_queue.put((line, level, pkg, pid, time.monotonic()))
+
+            try:
+                self.adb_process.kill()
+            except Exception:
+                pass
+
+        held = deque()  # lines in arrival order; the head may be waiting for its process name
+
+        def _drain_queue():
+            batch_size = 1000 if self._logcat_queue.qsize() > 1000 else 100
+
+            try:
+                for _ in range(batch_size):
+                    held.append(self._logcat_queue.get_nowait())
+            except queue.Empty:
+                pass
+            pkg_filter = self._logcat_pkg_filter
+            now = time.monotonic()
+            while held:
+                line, level, pkg, pid, t = held[0]
+                if pid and pkg is None:
+                    pkg = pids.lookup(pid)
+                    if pkg is None and pkg_filter and now - t < self.LOGCAT_NAME_WAIT:
+                        break  # don't judge (or reorder) a line before its PID is resolved
+                held.popleft()
+                if pkg_filter and (not pkg or pkg_filter not in pkg.lower()):
+                    continue
+                self._logcat_write(line, level, (pkg or "") if pid else None)
+
+            if self.log_proc:
+                self.after(50, _drain_queue)
+
+        self.thread = SCHEDULER.service(_loop, name=f"logcat {clean}")
+        _drain_queue()
+
+    def stop_logcat(self):
+        self.log_proc = False
+
+        if hasattr(self, 'adb_process'):
+            try:
+                self.adb_process.kill()
+            except Exception:
+                pass
+
+        if hasattr(self, '_logcat_queue'):
+            with self._logcat_queue.mutex:
+                self._logcat_queue.queue.clear()
+
+        self.btn_log_start.configure(state="normal")
+
+    def save_logcat(self):
+        f = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")],
+            initialfile="logcat_output.txt"
+        )
+        if f:
+            # Write in blocks of lines rather than copying the whole widget at once
+            last = int(self._logcat_text.index("end-1c").split(".")[0])
+            with open(f, "w", encoding="utf-8") as file:
+                for start in range(1, last + 1, 5000):
+                    file.write(self._logcat_text.get(f"{start}.0", f"{start + 5000}.0"))
+
+    def toggle_logcat_recording(self):
+        """Start/stop the background disk recorder for the selected device."""
+        if not self.sel_dev or "ADB" not in self.sel_dev:
+            return
+        serial = self.sel_dev.split()[0]
+        rec = self._recorders.get(serial)
+        if rec and rec.running:
+            self.run_bg(rec.stop, lane=None)
+        else:
+            rec = self._recorders.setdefault(serial, LogcatRecorder(serial))
+            rec.start()
+            log_action(op="logcat_record", serial=serial, result="started", path=str(rec.dir))
+        self.after(100, self._refresh_record_button)
+
+    def open_merged_logcat(self):
+        """Time-aligned logcat from several devices in one view."""
+        import tkinter as tk
+        serials = [d.split()[0] for d in getattr(self, '_last_device_list', []) if "ADB" in d]
+        win = ctk.CTkToplevel(self)
+        win.title("Merged Logcat")
+        win.geometry("1300x760")
+        win.configure(fg_color=C["bg_root"])
+
+        bar = ctk.CTkFrame(win, fg_color=C["bg_surface"], corner_radius=10)
+        bar.pack(fill="x", padx=10, pady=10)
+        checks = {}
+        for serial in serials:
+            var = ctk.BooleanVar(value=True)
+            ctk.CTkCheckBox(bar, text=serial, variable=var, text_color=C["text_main"]).pack(side="left", padx=8, pady=10)
+            checks[serial] = var
+        if not serials:
+            ctk.CTkLabel(bar, text="No ADB devices connected.", text_color=C["text_sub"]).pack(side="left", padx=10, pady=10)
+        btn = ctk.CTkButton(bar, text="Start", width=80, fg_color=C["success"])
+        btn.pack(side="right", padx=10)
+        offsets_lbl = ctk.CTkLabel(win, text="", text_color=C["text_sub"], font=(F_UI, 11))
+        offsets_lbl.pack(anchor="w", padx=15)
+
+        term = ctk.CTkFrame(win, fg_color="#000000", corner_radius=10)
+        term.pack(fill="both", expand=True, padx=10, pady=10)
+        out = tk.Text(term, font=(F_MONO, 11), bg="#000000", fg="#CCCCCC", relief="flat",
+                      borderwidth=0, wrap="char", undo=False, state="disabled")
+        vsb = tk.Scrollbar(term, command=out.yview, bg="#111111", troughcolor="#000000", relief="flat", width=10)
+        out.configure(yscrollcommand=vsb.set)
+        vsb.pack(side="right", fill="y")
+        out.pack(side="left", fill="both", expand=True, padx=6, pady=6)
+        for lvl, col in (("V", "#888888"), ("D", "#4FC3F7"), ("I", "#81C784"),
+                         ("W", "#FFD54F"), ("E", "#EF5350"), ("F", "#FF1744")):
+            out.tag_configure(lvl, foreground=col)
+        palette = ["#FF8A65", "#BA68C8", "#4DD0E1", "#AED581", "#F06292", "#FFF176"]
+        for i, serial in enumerate(serials):
+            out.tag_configure(f"dev{i}", foreground=palette[i % len(palette)])
+        dev_tag = {serial: f"dev{i}" for i, serial in enumerate(serials)}
+        state = {"merge": None}
+        MAX_LINES = 20000
+
+        def _poll():
+            merge = state["merge"]
+            if merge is None or not win.winfo_exists():
+                return
+            entries = merge.drain()
+            if entries:
+                out.configure(state="normal")
+                for ts, _, serial, text in entries:
+                    parts = text.split(None, 3)
+                    lvl = parts[2] if len(parts) > 2 and parts[2] in LOG_LEVELS else ""
+                    stamp = time.strftime("%H:%M:%S", time.localtime(ts)) + f".{int(ts % 1 * 1000):03d}"
+                    out.insert("end", f"{serial[:18]:<18} ", dev_tag.get(serial, ""), f"{stamp}  {text}\n", lvl)
+                excess = int(out.index("end-1c").split(".")[0]) - MAX_LINES
+                if excess > 0:
+                    out.delete("1.0", f"{excess + 1}.0")
+                out.see("end")
+                out.configure(state="disabled")
+            if merge.offsets:
+                offsets_lbl.configure(text="Clock offsets: " + ",  ".join(
+                    f"{s} {o:+.3f}s" for s, o in merge.offsets.items()))
+            win.after(100, _poll)
+
+        def _toggle():
+            if state["merge"]:
+                state["merge"].stop()
+                state["merge"] = None
+                btn.configure(text="Start", fg_color=C["success"])
+                return
+            chosen = [s for s, v in checks.items() if v.get()]
+            if not chosen:
+                return
+            state["merge"] = MergedLogcat(chosen)
+            state["merge"].start()
+            btn.configure(text="Stop", fg_color=C["danger"])
+            _poll()
+
+        def _close():
+            if state["merge"]:
+                state["merge"].stop()
+            win.destroy()
+
+        btn.configure(command=_toggle)
+        win.protocol("WM_DELETE_WINDOW", _close)
+
+    def open_log_talkers(self):
+        """Live table of the busiest tags/PIDs of the running logcat stream."""
+        win = ctk.CTkToplevel(self)
+        win.title("Logcat Top Talkers")
+        win.geometry("640x720")
+        win.configure(fg_color=C["bg_root"])
+
+        bar = ctk.CTkFrame(win, fg_color="transparent")
+        bar.pack(fill="x", padx=10, pady=10)
+        windows = {"1 s": 1, "1 min": 60, "10 min": 600}
+        win_var = ctk.StringVar(value="1 min")
+        ctk.CTkSegmentedButton(bar, values=list(windows), variable=win_var).pack(side="left", padx=5)
+        by_var = ctk.StringVar(value="Tag")
+        ctk.CTkSegmentedButton(bar, values=["Tag", "PID"], variable=by_var).pack(side="left", padx=10)
+        total_lbl = ctk.CTkLabel(bar, text="", text_color=C["text_sub"], font=(F_UI, 11))
+        total_lbl.pack(side="right", padx=5)
+
+        table = ctk.CTkFrame(win, fg_color=C["bg_surface"], corner_radius=10)
+        table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        table.grid_columnconfigure(0, weight=1)
+        sort = {"key": "rate"}
+
+        def _sort(key):
+            sort["key"] = key
+
+        heads = [("Name", "name"), ("Lines", "rate"), ("Lines/s", "rate")]
+        for col, (text, key) in enumerate(heads):
+            ctk.CTkButton(table, text=text, fg_color="transparent", hover_color=C["bg_hover"],
+                          text_color=C["text_sub"], font=(F_UI, 12, "bold"), anchor="w" if col == 0 else "e",
+                          command=lambda k=key: _sort(k)).grid(row=0, column=col, sticky="ew", padx=8, pady=(8, 4))
+        cells = []
+        for r in range(25):
+            row = [ctk.CTkLabel(table, text="", font=(F_MONO, 11), text_color=C["text_main"],
+                                anchor="w" if c == 0 else "e") for c in range(3)]
+            for c, lbl in enumerate(row):
+                lbl.grid(row=r + 1, column=c, sticky="ew", padx=8)
+            cells.append(row)
+        shown = {}
+
+        def _tick():
+            if not win.winfo_exists():
+                return
+            stats = getattr(self, '_logcat_stats', None)
+            rows = []
+            if stats:
+                by = "tag" if by_var.get() == "Tag" else "pid"
+                rows = stats.top(windows[win_var.get()], by)
+                if by == "pid" and self.sel_dev:
+                    names = self.bk.pid_names(self.sel_dev.split()[0]).names
+                    rows = [(f"{k} {names.get(k) or ''}", c, r) for k, c, r in rows]
+                if sort["key"] == "name":
+                    rows.sort(key=lambda x: x[0].lower())
+                total_lbl.configure(text=f"{stats.total} lines seen")
+            for i, cell in enumerate(cells):
+                vals = (rows[i][0][:48], str(rows[i][1]), f"{rows[i][2]:.1f}") if i < len(rows) else ("", "", "")
+                if shown.get(i) != vals:  # only touch labels whose text changed
+                    shown[i] = vals
+                    for lbl, v in zip(cell, vals):
+                        lbl.configure(text=v)
+            win.after(250, _tick)
+
+        _tick()
+
+    def open_logcat_search(self):
+        """Search panel over recorded logcat segments."""
+        import tkinter as tk
+        archive = LogcatArchive()
+        devices = archive.devices()
+
+        win = ctk.CTkToplevel(self)
+        win.title("Logcat Archive Search")
+        win.geometry("1100x700")
+        win.configure(fg_color=C["bg_root"])
+
+        bar = ctk.CTkFrame(win, fg_color=C["bg_surface"], corner_radius=10)
+        bar.pack(fill="x", padx=10, pady=10)
+        current = self.sel_dev.split()[0] if self.sel_dev else ""
+        dev_var = ctk.StringVar(value=next((d for d in devices if d == re.sub(r"[^\w.-]", "_", current)),
+                                           devices[0] if devices else ""))
+        ctk.CTkOptionMenu(bar, values=devices or [""], variable=dev_var, width=180,
+                          fg_color=C["input_bg"], text_color=C["text_main"]).pack(side="left", padx=5, pady=10)
+        lvl_var = ctk.StringVar(value="V")
+        ctk.CTkLabel(bar, text="Level ≥", text_color=C["text_sub"]).pack(side="left", padx=(10, 2))
+        ctk.CTkOptionMenu(bar, values=list(LOG_LEVELS), variable=lvl_var, width=60,
+                          fg_color=C["input_bg"], text_color=C["text_main"]).pack(side="left", padx=5)
+        ent_tag = ctk.CTkEntry(bar, placeholder_text="Tag (exact)", width=160, border_width=0,
+                               fg_color=C["input_bg"], text_color=C["text_main"])
+        ent_tag.pack(side="left", padx=5)
+        ent_text = ctk.CTkEntry(bar, placeholder_text="Contains text...", border_width=0,
+                                fg_color=C["input_bg"], text_color=C["text_main"])
+        ent_text.pack(side="left", fill="x", expand=True, padx=5)
+        ranges = {"All time": None, "Last hour": 1, "Last 6 hours": 6, "Last 24 hours": 24, "Last 7 days": 168}
+        range_var = ctk.StringVar(value="All time")
+        ctk.CTkOptionMenu(bar, values=list(ranges), variable=range_var, width=130,
+                          fg_color=C["input_bg"], text_color=C["text_main"]).pack(side="left", padx=5)
+        btn = ctk.CTkButton(bar, text="Search", width=80, fg_color=C["primary"])
+        btn.pack(side="left", padx=5)
+
+        status = ctk.CTkLabel(win, text=f"{len(devices)} recorded device(s)", text_color=C["text_sub"],
+                              font=(F_UI, 11))
+        status.pack(anchor="w", padx=15)
+
+        term = ctk.CTkFrame(win, fg_color="#000000", corner_radius=10)
+        term.pack(fill="both", expand=True, padx=10, pady=10)
+        out = tk.Text(term, font=(F_MONO, 11), bg="#000000", fg="#CCCCCC", relief="flat",
+                      borderwidth=0, wrap="char", undo=False, state="disabled")
+        vsb = tk.Scrollbar(term, command=out.yview, bg="#111111", troughcolor="#000000",
+                           relief="flat", width=10)
+        out.configure(yscrollcommand=vsb.set)
+        vsb.pack(side="right", fill="y")
+        out.pack(side="left", fill="both", expand=True, padx=6, pady=6)
+        for lvl, col in (("V", "#888888"), ("D", "#4FC3F7"), ("I", "#81C784"),
+                         ("W", "#FFD54F"), ("E", "#EF5350"), ("F", "#FF1744")):
+            out.tag_configure(lvl, foreground=col)
+
+        def _run():
+            out.configure(state="normal")
+            out.delete("1.0", "end")
+            out.configure(state="disabled")
+            hours = ranges[range_var.get()]
+            since = time.time() - hours * 3600 if hours else None
+            query = dict(min_level=lvl_var.get(), tag=ent_tag.get().strip() or None,
+                         text=ent_text.get().strip() or None, since=since)
+            device = dev_var.get()
+            btn.configure(state="disabled")
+            status.configure(text="Searching...")
+
+            def _search():
+                stats, batch = {}, []
+                t0 = time.time()
+
+                def _flush(lines):
+                    if not win.winfo_exists():
+                        return
+                    out.configure(state="normal")
+                    for ln in lines:
+                        parts = ln.split(None, 5)
+                        out.insert("end", ln + "\n", parts[4] if len(parts) > 4 and parts[4] in LOG_LEVELS else "")
+                    out.configure(state="disabled")
+
+                try:
+                    for line in archive.search(device, stats=stats, **query):
+                        batch.append(line)
+                        if len(batch) >= 500:
+                            UI.post(None, _flush, batch)
+                            batch = []
+                except Exception as e:
+                    stats["error"] = str(e)
+                UI.post(None, _flush, batch)
+                msg = (f"{stats.get('matches', 0)} match(es) · {stats.get('segments', 0)} segment(s), "
+                       f"{stats.get('skipped', 0)} skipped by index · {time.time() - t0:.2f}s")
+                if "error" in stats:
+                    msg += f" · [ERROR] {stats['error']}"
+                UI.post(None, lambda: win.winfo_exists() and (status.configure(text=msg),
+                                                              btn.configure(state="normal")))
+            self.run_bg(_search, lane=None)
+
+        btn.configure(command=_run)
+        ent_text.bind("<Return>", lambda e: _run())
+        ent_tag.bind("<Return>", lambda e: _run())
+
+    def _refresh_record_button(self):
+        if not hasattr(self, 'btn_log_record') or not self.btn_log_record.winfo_exists():
+            return
+        rec = self._recorders.get(self.sel_dev.split()[0]) if self.sel_dev else None
+        if rec and rec.running:
+            self.btn_log_record.configure(text=f"● Recording ({self._fmt(rec.bytes_written)})",
+                                          fg_color=C["danger"], text_color="white")
+            self.after(1000, self._refresh_record_button)
+        else:
+            self.btn_log_record.configure(text="Record to Disk", fg_color=C["input_bg"],
+                                          text_color=C["text_main"])
+
+    # --- FASTBOOT ---
+    def view_fastboot(self):
+        if not self._enter_view("Fastboot"):
+            return
+        ctk.CTkLabel(self.main, text="Fastboot Tools", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(
+            anchor="w", pady=(10, 20))
+
+        warn = ctk.CTkFrame(self.main, fg_color="#4a1010", corner_radius=10, border_width=1, border_color=C["danger"])
+        warn.pack(fill="x", pady=(0, 20))
+        ctk.CTkLabel(warn, text="ADVANCED: Use with caution.", text_color="#FF9999").pack(pady=10)
+
+        self.fb_card("Bootloader",
+                     [("Check Info", C["primary"], ["getvar", "all"]), ("Unlock OEM", C["danger"], ["oem", "unlock"])])
+
+        # --- Custom Flash Card ---
+        flash_card = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=10)
+        flash_card.pack(fill="x", pady=10, ipady=10)
+        ctk.CTkLabel(flash_card, text="Flash Partition", font=(F_UI, 16, "bold"), text_color=C["text_main"]).pack(
+            anchor="w", padx=20, pady=(10, 5))
+
+        # Partition selection mode
+        self._fb_part_mode = ctk.StringVar(value="select")
+        mode_row = ctk.CTkFrame(flash_card, fg_color="transparent")
+        mode_row.pack(fill="x", padx=20, pady=(0, 5))
+        ctk.CTkRadioButton(mode_row, text="Select partition", variable=self._fb_part_mode, value="select",
+                           command=self._fb_toggle_part_mode, text_color=C["text_main"]).pack(side="left", padx=(0, 20))
+        ctk.CTkRadioButton(mode_row, text="Write partition name", variable=self._fb_part_mode, value="write",
+                           command=self._fb_toggle_part_mode, text_color=C["text_main"]).pack(side="left")
+
+        # Preset partition dropdown
+        self._fb_part_select_frame = ctk.CTkFrame(flash_card, fg_color="transparent")
+        self._fb_part_select_frame.pack(fill="x", padx=20, pady=2)
+        self._fb_part_dropdown = ctk.CTkOptionMenu(
+            self._fb_part_select_frame,
+            values=["boot", "recovery", "vbmeta", "system", "vendor", "dtbo", "super", "userdata"],
+            fg_color=C["input_bg"], text_color=C["text_main"], width=200
+        )
+        self._fb_part_dropdown.pack(side="left")
+
+        # Manual partition entry
+        self._fb_part_write_frame = ctk.CTkFrame(flash_card, fg_color="transparent")
+        self._fb_part_entry = ctk.CTkEntry(
+            self._fb_part_write_frame,
+            placeholder_text="Write the partition name WITHOUT A/B",
+            fg_color=C["input_bg"], border_width=0, text_color=C["text_main"], width=280
+        )
+        self._fb_part_entry.pack(side="left")
+        # starts hidden
+        self._fb_part_write_frame.pack_forget()
+
+        # A/B slot selection
+        ab_row = ctk.CTkFrame(flash_card, fg_color="transparent")
+        ab_row.pack(fill="x", padx=20, pady=(8, 5))
+        ctk.CTkLabel(ab_row, text="Slot:", text_color=C["text_sub"], font=(F_UI, 12)).pack(side="left",
+                                                                                                 padx=(0, 10))
+        self._fb_slot = ctk.StringVar(value="none")
+        ctk.CTkRadioButton(ab_row, text="No slot (non-A/B)", variable=self._fb_slot, value="none",
+                           text_color=C["text_main"]).pack(side="left", padx=(0, 15))
+        ctk.CTkRadioButton(ab_row, text="_a", variable=self._fb_slot, value="_a",
+                           text_color=C["text_main"]).pack(side="left", padx=(0, 15))
+        ctk.CTkRadioButton(ab_row, text="_b", variable=self._fb_slot, value="_b",
+                           text_color=C["text_main"]).pack(side="left")
+
+        # Flash button
+        ctk.CTkButton(flash_card, text="Choose .img and Flash", fg_color=C["warning"],
+                      height=40, command=self.fb_flash_custom).pack(padx=20, pady=(10, 15), anchor="w")
+
+        self.fb_console = LogConsole(self.main, height=200)
+        self.fb_console.pack(fill="x", pady=20)
+
+    def fb_card(self, title, actions):
+        f = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=10)
+        f.pack(fill="x", pady=10, ipady=10)
+        ctk.CTkLabel(f, text=title, font=(F_UI, 16, "bold"), text_color=C["text_main"]).pack(side="left", padx=20)
+        for item in actions:
+            label, col = item[0], item[1]
+            func = item[3] if len(item) > 3 and item[3] else lambda c=item[2]: self.fb_run(c)
+            ctk.CTkButton(f, text=label, fg_color=col, width=120, command=func).pack(side="right", padx=10)
+
+    def fb_run(self, cmd):
+        if not self.sel_dev: return
+        clean = self.sel_dev.split()[0]
+        self.fb_console.log(f"Fastboot: {' '.join(cmd)}")
+        pframe, bar, lbl = self._show_progress(f"Running: fastboot {' '.join(cmd)}", self.fb_console)
+
+        def _run():
+            stop = SCHEDULER.current().stop
+            with ACTION_LOG.timed("fastboot", clean, args=cmd) as rec:
+                code = self.bk.run_live(
+                    [FASTBOOT_PATH, "-s", clean] + cmd,
+                    lambda l: (
+                        self.fb_console.log(l),
+                        UI.post(lbl, lbl.configure, text=l[:90])
+                    ),
+                    cancel=stop
+                )
+                if code is None and stop.is_set():
+                    rec["result"] = "cancelled"
+                elif code:
+                    rec.update(result="error", code=code)
+            if stop.is_set():
+                self._progress_cancelled(pframe, bar, lbl, self.fb_console,
+                                         f"✗ Cancelled: fastboot {' '.join(cmd)}")
+                return
+            UI.post(bar, self._update_progress, bar, lbl, 1, 1, "✓ Done")
+            UI.post(pframe, self.after, 3000, pframe.destroy)
+
+        pframe.task = self.run_bg(_run, lane="transfer")  # flashes run for minutes
+        return pframe.task
+
+    def _fb_toggle_part_mode(self):
+        if self._fb_part_mode.get() == "select":
+            self._fb_part_write_frame.pack_forget()
+            self._fb_part_select_frame.pack(fill="x", padx=20, pady=2)
+        else:
+            self._fb_part_select_frame.pack_forget()
+            self._fb_part_write_frame.pack(fill="x", padx=20, pady=2)
+
+    def fb_flash_custom(self):
+        if self._fb_part_mode.get() == "select":
+            base_partition = self._fb_part_dropdown.get()
+        else:
+            base_partition = self._fb_part_entry.get().strip()
+            if not base_partition:
+                CustomDialog(self, title="Error", message="Please enter a partition name.", icon="warning", option_1="Ok")
+                return
+
+        slot = self._fb_slot.get()
+        partition = base_partition + ("" if slot == "none" else slot)
+
+        f = filedialog.askopenfilename(filetypes=[("IMG files", "*.img")])
+        if f:
+            msg = CustomDialog(
+                self,
+                title="Confirm Flash",
+                message=f"Flash '{partition}' with:\n{f}\n\nAre you sure?",
+                icon="warning",
+                option_1="Yes, Flash",
+                option_2="Cancel"
+            )
+            if msg.get() == "Yes, Flash":
+                self.fb_run(["flash", partition, f])
+
+    # --- CONNECTION ---
+    def view_connect(self):
+        if not self._enter_view("Connection"):
+            return
+        ctk.CTkLabel(self.main, text="Connection ADB", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(10, 20))
+
+        # Step 1 - TCP/IP
+        c1 = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        c1.pack(fill="x", pady=10)
+        ctk.CTkLabel(c1, text="1. Enable TCP/IP Mode", font=(F_UI, 14, "bold")).pack(side="left", padx=20, pady=20)
+        ctk.CTkButton(c1, text="Enable (5555)", fg_color=C["primary"], command=lambda: self.adb_cmd_console(["tcpip", "5555"])).pack(side="right", padx=20)
+
+        # Step 2 - Pair (Android 11+)
+        c_pair = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        c_pair.pack(fill="x", pady=10)
+        ctk.CTkLabel(c_pair, text="2. Pair Device (Android 11+)", font=(F_UI, 14, "bold")).pack(anchor="w", padx=20, pady=(20, 5))
+        ctk.CTkLabel(c_pair, text="Go to Developer Options → Connection debugging → Pair with pairing code",
+                     font=(F_UI, 11), text_color=C["text_sub"]).pack(anchor="w", padx=20, pady=(0, 8))
+        r_pair = ctk.CTkFrame(c_pair, fg_color="transparent")
+        r_pair.pack(fill="x", padx=20, pady=(0, 20))
+        self.ent_pair_ip = ctk.CTkEntry(r_pair, placeholder_text="IP:PAIR_PORT", height=40, fg_color=C["input_bg"], border_width=0, text_color=C["text_main"])
+        self.ent_pair_ip.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        self.ent_pair_code = ctk.CTkEntry(r_pair, placeholder_text="6-digit code", height=40, width=130, fg_color=C["input_bg"], border_width=0, text_color=C["text_main"])
+        self.ent_pair_code.pack(side="left", padx=(0, 10))
+        ctk.CTkButton(r_pair, text="Pair", height=40, fg_color=C["warning"], command=self.do_connect_pair).pack(side="right")
+
+        # Step 3 - Connect
+        c2 = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        c2.pack(fill="x", pady=10)
+        ctk.CTkLabel(c2, text="3. Connect", font=(F_UI, 14, "bold")).pack(anchor="w", padx=20, pady=(20, 5))
+        r = ctk.CTkFrame(c2, fg_color="transparent")
+        r.pack(fill="x", padx=20, pady=(0, 20))
+        self.ent_ip = ctk.CTkEntry(r, placeholder_text="IP:PORT", height=40, fg_color=C["input_bg"], border_width=0, text_color=C["text_main"])
+        self.ent_ip.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        _saved_ip = CONF.get("last_ip", "")
+        if _saved_ip: self.ent_ip.insert(0, _saved_ip)
+        ctk.CTkButton(r, text="Connect", height=40, fg_color=C["success"], command=self.do_connect_connect).pack(side="right")
+
+        # Step 4 - Disconnect
+        c3 = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        c3.pack(fill="x", pady=10)
+        ctk.CTkLabel(c3, text="4. Disconnect", font=(F_UI, 14, "bold")).pack(anchor="w", padx=20, pady=(20, 10))
+        ctk.CTkButton(c3, text="Disconnect All", height=40, fg_color=C["danger"], command=self.do_connect_disconnect_all).pack(fill="x", padx=20, pady=(0, 10))
+        r_disc = ctk.CTkFrame(c3, fg_color="transparent")
+        r_disc.pack(fill="x", padx=20, pady=(0, 20))
+        self.ent_disc_ip = ctk.CTkEntry(r_disc, placeholder_text="IP:PORT", height=40, fg_color=C["input_bg"], border_width=0, text_color=C["text_main"])
+        self.ent_disc_ip.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        ctk.CTkButton(r_disc, text="Disconnect", height=40, fg_color=C["danger"], command=self.do_connect_disconnect).pack(side="right")
+
+        self.connect_console = LogConsole(self.main, height=200)
+        self.connect_console.pack(fill="x", pady=20)
+
+    def do_connect_connect(self):
+        ip = self.ent_ip.get().strip()
+        if not ip:
+            self.connect_console.log("[ERROR] Please enter an IP:PORT.")
+            return
+        save_config("last_ip", ip)
+        self.connect_console.log(f"Connecting to {ip}...")
+        self._pause_dev_loop = True
+        def _connect():
+            try:
+                result = self.bk.run([xadb_core.ADB_PATH, "connect", ip], timeout=30)
+                self.connect_console.log(result)
+            finally:
+                self._pause_dev_loop = False
+        self.run_bg(_connect, lane=None)
+
+    def do_connect_pair(self):
+        ip = self.ent_pair_ip.get().strip()
+        code = self.ent_pair_code.get().strip()
+        if not ip or not code:
+            self.connect_console.log("[ERROR] Please enter both IP:PORT and the pairing code.")
+            return
+        self.connect_console.log(f"Pairing with {ip}...")
+        def _pair():
+            self.bk.run_live([xadb_core.ADB_PATH, "pair", ip, code], lambda l: self.connect_console.log(l))
+        self.run_bg(_pair, lane=None)
+
+    def do_connect_disconnect_all(self):
+        self.adb_cmd_console(["disconnect"])
+        self.connect_console.log("All connect connections disconnected!")
+
+    def do_connect_disconnect(self):
+        target = self.ent_disc_ip.get().strip()
+        if not target:
+            self.connect_console.log("[ERROR] Please enter an IP:PORT to disconnect from!")
+            return
+        self.adb_cmd_console(["disconnect", target])
+        self.connect_console.log(f"Disconnecting from {target}...")
+
+    # --- TWEAKS ---
+    def view_tweaks(self):
+        if not self._enter_view("Tweaks"):
+            return
+        ctk.CTkLabel(self.main, text="System Tweaks", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(10, 20))
+
+        scroll = ctk.CTkScrollableFrame(self.main, fg_color="transparent")
+        scroll.pack(fill="both", expand=True)
+
+        # Toggles
+        f = ctk.CTkFrame(scroll, fg_color=C["bg_surface"], corner_radius=15)
+        f.pack(fill="x", pady=10)
+        tweaks = [("Show Taps", "system", "show_touches"), ("Pointer Location", "system", "pointer_location"), ("Stay Awake (USB)", "global", "stay_on_while_plugged_in")]
+        for label, ns, key in tweaks:
+            r = ctk.CTkFrame(f, fg_color="transparent")
+            r.pack(fill="x", pady=8, padx=10)
+            ctk.CTkLabel(r, text=label, text_color=C["text_main"], font=(F_UI, 13)).pack(side="left", padx=20)
+            ctk.CTkButton(r, text="ON", width=60, fg_color=C["success"], command=lambda nn=ns, kk=key: self.adb_cmd_console(["shell", "settings", "put", nn, kk, "1"])).pack(side="right", padx=5)
+            ctk.CTkButton(r, text="OFF", width=60, fg_color="#333", command=lambda nn=ns, kk=key: self.adb_cmd_console(["shell", "settings", "put", nn, kk, "0"])).pack(side="right", padx=5)
+
+        # DPI
+        f2 = ctk.CTkFrame(scroll, fg_color=C["bg_surface"], corner_radius=15)
+        f2.pack(fill="x", pady=10)
+        ctk.CTkLabel(f2, text="DPI Changer", font=(F_UI, 14, "bold")).pack(anchor="w", padx=20, pady=10)
+        r2 = ctk.CTkFrame(f2, fg_color="transparent")
+        r2.pack(fill="x", padx=20, pady=(0, 20))
+        self.ent_dpi = ctk.CTkEntry(r2, placeholder_text="e.g. 400", width=100)
+        self.ent_dpi.pack(side="left", padx=5)
+        ctk.CTkButton(r2, text="Apply", width=80, command=lambda: self.adb_cmd_console(["shell", "wm", "density", self.ent_dpi.get()])).pack(side="left", padx=5)
+        ctk.CTkButton(r2, text="Reset", width=80, fg_color="#333", command=lambda: self.adb_cmd_console(["shell", "wm", "density", "reset"])).pack(side="left", padx=5)
+
+        # Animation
+        f3 = ctk.CTkFrame(scroll, fg_color=C["bg_surface"], corner_radius=15)
+        f3.pack(fill="x", pady=10)
+        ctk.CTkLabel(f3, text="Animation Scale", font=(F_UI, 14, "bold")).pack(anchor="w", padx=20, pady=10)
+        r3 = ctk.CTkFrame(f3, fg_color="transparent")
+        r3.pack(fill="x", padx=20, pady=(0, 20))
+        for scale in ["0.0", "0.5", "1.0", "1.5"]:
+            ctk.CTkButton(r3, text=f"{scale}x", width=60, command=lambda s=scale: self.set_anim(s)).pack(side="left", padx=5)
+
+        self.tweaks_console = LogConsole(scroll, height=150)
+        self.tweaks_console.pack(fill="x", pady=20)
+
+    def set_anim(self, scale):
+        for key in ["window_animation_scale", "transition_animation_scale", "animator_duration_scale"]:
+            self.adb_cmd_console(["shell", "settings", "put", "global", key, scale])
+
+    # --- BACKUP ---
+    def view_backup(self):
+        if not self._enter_view("Backup"):
+            return
+        ctk.CTkLabel(self.main, text="Backup & Restore", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(10, 20))
+
+        grid = ctk.CTkFrame(self.main, fg_color="transparent")
+        grid.pack(fill="x", padx=30)
+        b_card = ctk.CTkFrame(grid, fg_color=C["bg_surface"], corner_radius=15)
+        b_card.pack(side="left", fill="both", expand=True, padx=(0, 10))
+        ctk.CTkLabel(b_card, text="Backup Device", font=(F_UI, 18, "bold")).pack(pady=20)
+        ctk.CTkButton(b_card, text="Start Backup", height=50, fg_color=C["primary"], command=self.do_backup).pack(pady=20, padx=20)
+
+        r_card = ctk.CTkFrame(grid, fg_color=C["bg_surface"], corner_radius=15)
+        r_card.pack(side="left", fill="both", expand=True, padx=(10, 0))
+        ctk.CTkLabel(r_card, text="Restore Device", font=(F_UI, 18, "bold")).pack(pady=20)
+        ctk.CTkButton(r_card, text="Start Restore", height=50, fg_color=C["warning"], command=self.do_restore).pack(pady=20, padx=20)
+
+        self.backup_console = LogConsole(self.main, height=200)
+        self.backup_console.pack(fill="x", pady=20)
+
+    def do_backup(self):
+        if not self.sel_dev:
+            self.backup_console.log("[ERROR] No device selected")
+            return
+        f = filedialog.asksaveasfilename(defaultextension=".ab", filetypes=[("Backup", "*.ab")])
+        if not f:
+            return
+        clean = self.sel_dev.split()[0]
+        args = ["backup", "-all", "-apk", "-shared", "-f", f]
+        self.backup_console.log(f"Command: {' '.join(args)}")
+        self.backup_console.log("Backup Started - Check Device")
+        pframe, bar, lbl = self._show_progress("Backing up - confirm on the device...", self.backup_console)
+
+        def _backup():
+            stop = SCHEDULER.current().stop
+            existed = os.path.exists(f)
+            with ACTION_LOG.timed("adb", clean, args=args) as rec:
+                code = self.bk.run_live([xadb_core.ADB_PATH, "-s", clean] + args, self.backup_console.log, cancel=stop)
+                if stop.is_set():
+                    rec["result"] = "cancelled"
+                elif code:
+                    rec.update(result="error", code=code)
+            if stop.is_set():
+                # The device keeps its confirmation screen up; the backup itself stops with the stream
+                self._discard_partial(f, existed)
+                self._progress_cancelled(pframe, bar, lbl, self.backup_console, "✗ Backup cancelled")
+                return
+            self.backup_console.log("[DONE]")
+            UI.post(bar, self._update_progress, bar, lbl, 1, 1, f"✓ Saved to {os.path.basename(f)}")
+            UI.post(pframe, self.after, 3000, pframe.destroy)
+
+        pframe.task = self.run_bg(_backup, lane="transfer")
+        return pframe.task
+
+    def do_restore(self):
+        f = filedialog.askopenfilename(filetypes=[("Backup", "*.ab")])
+        if f: self.adb_cmd_console(["restore", f], "Restore Started - Check Device")
+
+    # --- DEVICES ---
+    def view_devices(self):
+        if not self._enter_view("Devices"):
+            return
+        ctk.CTkLabel(self.main, text="Device Manager", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(anchor="w", pady=(10, 20))
+
+        info_card = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        info_card.pack(fill="x", pady=(0, 15))
+        ctk.CTkLabel(info_card, text="Active Device", font=(F_UI, 14, "bold"), text_color=C["text_main"]).pack(anchor="w", padx=20, pady=(15, 5))
+        self.dev_active_lbl = ctk.CTkLabel(info_card, text=self.sel_dev or "None",
+                                           font=(F_UI, 13), text_color=C["primary"])
+        self.dev_active_lbl.pack(anchor="w", padx=20, pady=(0, 15))
+
+        list_card = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        list_card.pack(fill="x", pady=(0, 15))
+        top = ctk.CTkFrame(list_card, fg_color="transparent")
+        top.pack(fill="x", padx=20, pady=(15, 10))
+        ctk.CTkLabel(top, text="Connected Devices", font=(F_UI, 14, "bold"), text_color=C["text_main"]).pack(side="left")
+        ctk.CTkButton(top, text="↻", width=32, height=32, font=(F_UI, 18),
+                      fg_color="transparent", hover_color=C["bg_hover"],
+                      text_color=C["text_sub"], command=self._refresh_device_list).pack(side="right", padx=(0, 5))
+
+        self.dev_list_frame = ctk.CTkScrollableFrame(list_card, fg_color="transparent", height=200)
+        self.dev_list_frame.pack(fill="x", padx=20, pady=(0, 15))
+        self._refresh_device_list()
+
+        self.dev_console = LogConsole(self.main, height=150)
+        self.dev_console.pack(fill="x", pady=10)
+
+    def _refresh_device_list(self):
+        for w in self.dev_list_frame.winfo_children():
+            w.destroy()
+
+        devices = self.bk.get_devices()
+        if not devices:
+            ctk.CTkLabel(self.dev_list_frame, text="No devices found.",
+                         text_color=C["text_sub"], font=(F_UI, 12)).pack(pady=10)
+            return
+
+        for dev in devices:
+            is_selected = dev == self.sel_dev
+            serial = dev.split()[0]
+            mode = dev.split("(")[1].replace(")", "") if "(" in dev else ""
+            if "ADB" in mode:
+                model = self.bk.run([xadb_core.ADB_PATH, "-s", serial, "shell", "getprop", "ro.product.model"]).strip()
+                label_text = f"  ●  {model or serial}  [{serial}]  ({mode})"
+            else:
+                label_text = f"  ●  {serial}  ({mode})"
+
+            row = ctk.CTkButton(
+                self.dev_list_frame,
+                text=label_text,
+                anchor="w",
+                font=(F_UI, 12),
+                fg_color=C["bg_hover"] if is_selected else "transparent",
+                hover_color=C["bg_hover"],
+                text_color=C["success"] if is_selected else C["text_main"],
+                command=lambda d=dev: self._select_device(d)
+            )
+            row.pack(fill="x", pady=2)
+
+    def _select_device(self, dev):
+        self.sel_dev = dev
+        save_config("last_device", dev.split()[0])  # save serial for next launch
+        if hasattr(self, 'dev_active_lbl') and self.dev_active_lbl.winfo_exists():
+            self.dev_active_lbl.configure(text=dev)
+        name = self.bk.run([xadb_core.ADB_PATH, "-s", dev.split()[0], "shell", "settings", "get", "global", "device_name"]).strip()
+        self.status_lbl.configure(text=name)
+        self.status_dot.configure(text_color=C["success"])
+        if hasattr(self, 'dev_list_frame') and self.dev_list_frame.winfo_exists():
+            self._refresh_device_list()
+        if hasattr(self, 'dev_console'):
+            self.dev_console.log(f"Switched to {dev}")
+
+    # --- SETTINGS ---
+    def view_settings(self):
+        if not self._enter_view("Settings"):
+            return
+        ctk.CTkLabel(self.main, text="Settings", font=(F_UI, 36, "bold"), text_color=C["text_main"]).pack(
+            anchor="w", pady=(10, 20))
+
+        c = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        c.pack(fill="x", padx=30, pady=10)
+        ctk.CTkLabel(c, text="Appearance", font=(F_UI, 16, "bold")).pack(anchor="w", padx=20, pady=(20, 10))
+        row = ctk.CTkFrame(c, fg_color="transparent")
+        row.pack(fill="x", padx=20, pady=(0, 20))
+        ctk.CTkButton(row, text="Light Mode", height=50, fg_color="#E0E0E0", text_color="black",
+                      command=lambda: [ctk.set_appearance_mode("Light"), save_config("theme", "Light")]).pack(
+            side="left", fill="x", expand=True, padx=5)
+        ctk.CTkButton(row, text="Dark Mode", height=50, fg_color="#222222", text_color="white",
+                      command=lambda: [ctk.set_appearance_mode("Dark"), save_config("theme", "Dark")]).pack(side="left",
+                                                                                                            fill="x",
+                                                                                                            expand=True,
+                                                                                                            padx=5)
+
+        c2 = ctk.CTkFrame(self.main, fg_color=C["bg_surface"], corner_radius=15)
+        c2.pack(fill="x", padx=30, pady=10)
+        ctk.CTkLabel(c2, text="Advanced", font=(F_UI, 16, "bold")).pack(anchor="w", padx=20, pady=(20, 10))
+
+        # ADB Path picker
+        adb_row = ctk.CTkFrame(c2, fg_color="transparent")
+        adb_row.pack(fill="x", padx=20, pady=(0, 10))
+        ctk.CTkLabel(adb_row, text="ADB Executable Path", text_color=C["text_main"], font=(F_UI, 13)).pack(
+            side="left", padx=20)
+        self.ent_adb_path = ctk.CTkEntry(adb_row,
+                                         placeholder_text="e.g. location_to\\adb leave blank for system PATH",
+                                         fg_color=C["input_bg"], border_width=0, text_color=C["text_main"], width=320)
+        self.ent_adb_path.pack(side="left", padx=(0, 10))
+        if CONF.get("adb_path", ""):
+            self.ent_adb_path.insert(0, CONF["adb_path"])
+        ctk.CTkButton(adb_row, text="Browse", width=80, fg_color=C["primary"],
+                      command=self._browse_adb_path).pack(side="left", padx=(0, 10))
+        ctk.CTkButton(adb_row, text="Save", width=70, fg_color=C["success"],
+                      command=self._save_adb_path).pack(side="left")
+
+        su_row = ctk.CTkFrame(c2, fg_color="transparent")
+        su_row.pack(fill="x", padx=20, pady=(0, 10))
+        ctk.CTkLabel(su_row, text="Use Super User (Root)", text_color=C["text_main"], font=(F_UI, 13)).pack(
+            side="left", padx=20)
+
+        self.su_switch = ctk.CTkSwitch(
+            su_row,
+            text="",
+            command=self.toggle_su,
+            fg_color="#555555",
+            progress_color=C["success"],
+            button_color=C["text_main"],
+            button_hover_color=C["bg_hover"]
+        )
+        self.su_switch.pack(side="right", padx=20)
+
+        if CONF.get("use_su", False):
+            self.su_switch.select()
+
+        rec_row = ctk.CTkFrame(c2, fg_color="transparent")
+        rec_row.pack(fill="x", padx=20, pady=(0, 10))
+        ctk.CTkLabel(rec_row, text="Always Record Logcat (all devices)", text_color=C["text_main"],
+                     font=(F_UI, 13)).pack(side="left", padx=20)
+        self.rec_switch = ctk.CTkSwitch(
+            rec_row, text="", command=self.toggle_logcat_record_all,
+            fg_color="#555555", progress_color=C["success"],
+            button_color=C["text_main"], button_hover_color=C["bg_hover"]
+        )
+        self.rec_switch.pack(side="right", padx=20)
+        if CONF.get("logcat_record", False):
+            self.rec_switch.select()
+
+        crash_row = ctk.CTkFrame(c2, fg_color="transparent")
+        crash_row.pack(fill="x", padx=20, pady=(0, 10))
+        ctk.CTkLabel(crash_row, text="Watch for Crashes & ANRs", text_color=C["text_main"],
+                     font=(F_UI, 13)).pack(side="left", padx=20)
+        self.crash_switch = ctk.CTkSwitch(
+            crash_row, text="", command=self.toggle_crash_watch,
+            fg_color="#555555", progress_color=C["success"],
+            button_color=C["text_main"], button_hover_color=C["bg_hover"]
+        )
+        self.crash_switch.pack(side="right", padx=20)
+        if CONF.get("crash_watch", True):
+            self.crash_switch.select()
+
+        tele_row = ctk.CTkFrame(c2, fg_color="transparent")
+        tele_row.pack(fill="x", padx=20, pady=(0, 10))
+        ctk.CTkLabel(tele_row, text="Record Telemetry (All Devices)", text_color=C["text_main"],
+                     font=(F_UI, 13)).pack(side="left", padx=20)
+        self.tele_switch = ctk.CTkSwitch(
+            tele_row, text="", command=lambda: save_config("telemetry", self.tele_switch.get() == 1),
+            fg_color="#555555", progress_color=C["success"],
+            button_color=C["text_main"], button_hover_color=C["bg_hover"]
+        )
+        self.tele_switch.pack(side="right", padx=20)
+        if CONF.get("telemetry", False):
+            self.tele_switch.select()
+
+        refresh_row = ctk.CTkFrame(c2, fg_color="transparent")
+        refresh_row.pack(fill="x", padx=20, pady=(10, 20))
+        ctk.CTkLabel(refresh_row, text="Dashboard & Telemetry Interval", text_color=C["text_main"],
+                     font=(F_UI, 13)).pack(side="left", padx=20)
+
+        self.refresh_label = ctk.CTkLabel(refresh_row, text=f"{CONF.get('refresh_interval', 3)}s",
+                                          text_color=C["primary"], font=(F_UI, 13, "bold"))
+        self.refresh_label.pack(side="right", padx=(0, 10))
+
+        self.refresh_slider = ctk.CTkSlider(
+            refresh_row,
+            from_=1,
+            to=10,
+            number_of_steps=9,
+            command=self.update_refresh_interval,
+            fg_color="#555555",
+            progress_color=C["primary"],
+            button_color=C["primary"],
+            button_hover_color=C["success"]
+        )
+        self.refresh_slider.set(CONF.get("refresh_interval", 3))
+        self.refresh_slider.pack(side="right", padx=20, fill="x", expand=True)
+
+        poll_row = ctk.CTkFrame(c2, fg_color="transparent")
+        poll_row.pack(fill="x", padx=20, pady=(0, 20))
+        ctk.CTkLabel(poll_row, text="Device Poll Interval", text_color=C["text_main"],
+                     font=(F_UI, 13)).pack(side="left", padx=20)
+
+        self.poll_label = ctk.CTkLabel(poll_row, text=f"{CONF.get('device_poll_interval', 2)}s",
+                                       text_color=C["primary"], font=(F_UI, 13, "bold"))
+        self.poll_label.pack(side="right", padx=(0, 10))
+
+        self.poll_slider = ctk.CTkSlider(
+            poll_row, from_=1, to=10, number_of_steps=9,
+            command=self._update_poll_interval,
+            fg_color="#555555", progress_color=C["primary"],
+            button_color=C["primary"], button_hover_color=C["success"]
+        )
+        self.poll_slider.set(CONF.get("device_poll_interval", 2))
+        self.poll_slider.pack(side="right", padx=20, fill="x", expand=True)
+
+    def update_refresh_interval(self, value):
+        interval = int(value)
+        self.refresh_label.configure(text=f"{interval}s")
+        save_config("refresh_interval", interval)
+
+    def _update_poll_interval(self, value):
+        interval = int(value)
+        self.poll_label.configure(text=f"{interval}s")
+        save_config("device_poll_interval", interval)
+
+    def toggle_su(self):
+        enabled = self.su_switch.get() == 1
+        save_config("use_su", enabled)
+
+    def toggle_logcat_record_all(self):
+        enabled = self.rec_switch.get() == 1
+        save_config("logcat_record", enabled)
+        if not enabled:
+            for rec in self._recorders.values():
+                self.run_bg(rec.stop, lane=None)
+
+    def toggle_crash_watch(self):
+        enabled = self.crash_switch.get() == 1
+        save_config("crash_watch", enabled)
+        if not enabled:
+            self.crash_watch.stop()
+
+    def _browse_adb_path(self):
+        if os.name == "nt":
+            f = filedialog.askopenfilename(filetypes=[("ADB Executable", "adb.exe"), ("All files", "*.*")])
+        else:
+            f = filedialog.askopenfilename(title="Select ADB executable")
+        if f:
+            self.ent_adb_path.delete(0, "end")
+            self.ent_adb_path.insert(0, f)
+
+    def _save_adb_path(self):
+        path = self.ent_adb_path.get().strip()
+        xadb_core.ADB_PATH = path if path else "adb"
+        save_config("adb_path", path)
+        CustomDialog(self, title="Saved", message=f"ADB path updated!\nNow using: {xadb_core.ADB_PATH}", icon="check", option_1="Ok")
+
+def main():
+    if "--bake-atlas" in sys.argv:
+        print(f"Wrote {ASSETS.bake_atlas()}")
+        sys.exit(0)
+    app = XtremeADB()
+    app.mainloop()
+
+
+if __name__ == "__main__":
+    main()